@@ -17,6 +17,7 @@
 # You should have received a copy of the GNU Affero General Public License
 # along with weboob. If not, see <http://www.gnu.org/licenses/>.
 
+from weboob.capabilities.file import Payload
 from weboob.capabilities.torrent import CapTorrent, Torrent
 from weboob.tools.backend import Module
 
@@ -44,8 +45,8 @@ class CpasbienModule(Module, CapTorrent):
         if not torrent:
             return None
 
-        resp = self.browser.open(torrent.url)
-        return resp.content
+        resp = self.browser.open(torrent.url, stream=True)
+        return Payload.from_response(resp)
 
     def iter_torrents(self, pattern):
         return self.browser.iter_torrents(quote_plus(pattern.encode('utf-8')))
@@ -60,7 +60,7 @@ class NewspaperLibeModule(GenericNewspaperModule, CapMessages):
         self.RSS_FEED = "http://www.liberation.fr/rss/%s" % self.config['feed'].get()
 
     def iter_threads(self):
-        for article in Newsfeed(self.RSS_FEED, self.RSSID).iter_entries():
+        for article in Newsfeed(self.RSS_FEED, self.RSSID, ttl=self.RSS_TTL).iter_entries():
             thread = Thread(article.id)
             thread.title = article.title
             thread.date = article.datetime
@@ -21,6 +21,7 @@
 from weboob.tools.backend import Module, BackendConfig
 from weboob.capabilities.messages import CapMessages, Message, Thread
 from weboob.tools.newsfeed import Newsfeed
+from weboob.tools.capabilities.messages.seen import SeenIndex
 from weboob.tools.value import Value
 
 
@@ -35,7 +36,20 @@ class NewsfeedModule(Module, CapMessages):
     DESCRIPTION = "Loads RSS and Atom feeds from any website"
     LICENSE = "AGPLv3+"
     CONFIG = BackendConfig(Value('url', label="Atom/RSS feed's url", regexp='https?://.*'))
-    STORAGE = {'seen': []}
+    STORAGE = {'seen': {}}
+
+    _seen = None
+
+    @property
+    def seen(self):
+        if self._seen is None:
+            self._seen = SeenIndex(self.storage, 'seen')
+        return self._seen
+
+    def deinit(self):
+        if self._seen is not None:
+            self._seen.flush()
+        super(NewsfeedModule, self).deinit()
 
     def iter_threads(self):
         for article in Newsfeed(self.config['url'].get()).iter_entries():
@@ -54,7 +68,7 @@ class NewsfeedModule(Module, CapMessages):
             return None
 
         flags = Message.IS_HTML
-        if thread.id not in self.storage.get('seen', default=[]):
+        if thread.id not in self.seen:
             flags |= Message.IS_UNREAD
         if len(entry.content) > 0:
             content = u"<p>Link %s</p> %s" % (entry.link, entry.content[0])
@@ -82,8 +96,7 @@ class NewsfeedModule(Module, CapMessages):
                     yield m
 
     def set_message_read(self, message):
-        self.storage.get('seen', default=[]).append(message.thread.id)
-        self.storage.save()
+        self.seen.add(message.thread.id)
 
     def fill_thread(self, thread, fields):
         return self.get_thread(thread)
@@ -21,6 +21,7 @@ from weboob.capabilities.torrent import CapTorrent, MagnetOnly, Torrent
 from weboob.tools.backend import Module, BackendConfig
 from weboob.tools.value import Value
 from weboob.capabilities.base import NotAvailable
+from weboob.capabilities.file import Payload
 
 from .browser import PiratebayBrowser
 
@@ -51,7 +52,7 @@ class PiratebayModule(Module, CapTorrent):
 
         if torrent.url is NotAvailable and torrent.magnet:
             raise MagnetOnly(torrent.magnet)
-        return self.browser.open(torrent.url).content
+        return Payload.from_response(self.browser.open(torrent.url, stream=True))
 
     def iter_torrents(self, pattern):
         return self.browser.iter_torrents(pattern.replace(' ', '+'))
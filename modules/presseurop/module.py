@@ -51,7 +51,7 @@ class NewspaperPresseuropModule(GenericNewspaperModule, CapMessages):
 
     def iter_threads(self):
         daily = []
-        for article in Newsfeed(self.RSS_FEED, self.RSSID).iter_entries():
+        for article in Newsfeed(self.RSS_FEED, self.RSSID, ttl=self.RSS_TTL).iter_entries():
             if "/news-brief/" in article.link:
                 day = self.browser.get_daily_date(article.link)
                 if day and (day not in daily):
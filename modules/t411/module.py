@@ -19,6 +19,7 @@
 
 from urllib import quote_plus
 
+from weboob.capabilities.file import Payload
 from weboob.capabilities.torrent import CapTorrent, Torrent
 from weboob.tools.backend import Module, BackendConfig
 from weboob.tools.value import ValueBackendPassword, Value
@@ -52,8 +53,8 @@ class T411Module(Module, CapTorrent):
         if not torrent:
             return None
 
-        resp = self.browser.open(torrent.url)
-        return resp.content
+        resp = self.browser.open(torrent.url, stream=True)
+        return Payload.from_response(resp)
 
     def iter_torrents(self, pattern):
         return self.browser.iter_torrents(quote_plus(pattern.encode('utf-8')))
@@ -0,0 +1,48 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Measure the construction throughput of BaseObject instances.
+
+Usage: bench_baseobject.py [-n OBJECTS]
+"""
+
+from __future__ import print_function
+
+import datetime
+import os
+import sys
+import time
+from argparse import ArgumentParser
+from decimal import Decimal
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), os.path.pardir)))
+
+from weboob.capabilities.bank import Transaction
+
+
+def build(count):
+    today = datetime.date.today()
+    for i in xrange(count):
+        tr = Transaction(u'%d' % i)
+        tr.date = today
+        tr.rdate = today
+        tr.type = Transaction.TYPE_CARD
+        tr.raw = u'CARTE 01/02 SHOP %d' % i
+        tr.label = u'SHOP %d' % i
+        tr.amount = Decimal('-12.34')
+
+
+def main():
+    parser = ArgumentParser(description='Benchmark BaseObject construction.')
+    parser.add_argument('-n', '--objects', type=int, default=100000, help='number of objects')
+    args = parser.parse_args()
+
+    start = time.time()
+    build(args.objects)
+    elapsed = time.time() - start
+    print('%d Transaction objects built in %.3fs (%d objects/s)' % (args.objects, elapsed, args.objects / elapsed))
+
+
+if __name__ == '__main__':
+    main()
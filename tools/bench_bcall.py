@@ -0,0 +1,65 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Measure the overhead of a BackendsCall over N no-op backends.
+
+Usage: bench_bcall.py [-n BACKENDS] [-c CALLS] [-w WORKERS]
+"""
+
+from __future__ import print_function
+
+import os
+import sys
+import time
+from argparse import ArgumentParser
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), os.path.pardir)))
+
+from weboob.core.bcall import BackendsCall, WorkerPool
+
+
+class NoopBackend(object):
+    NAME = 'noop'
+
+    def __init__(self, name):
+        self.name = name
+
+    def __enter__(self):
+        pass
+
+    def __exit__(self, t, v, tb):
+        pass
+
+    def noop(self):
+        return None
+
+    def one(self):
+        return self.name
+
+
+def bench(backends, pool, function, calls):
+    start = time.time()
+    for _ in xrange(calls):
+        for _ in BackendsCall(backends, function, pool=pool):
+            pass
+    return (time.time() - start) / calls
+
+
+def main():
+    parser = ArgumentParser(description='Benchmark BackendsCall overhead.')
+    parser.add_argument('-n', '--backends', type=int, default=50, help='number of backends')
+    parser.add_argument('-c', '--calls', type=int, default=200, help='number of calls')
+    parser.add_argument('-w', '--workers', type=int, default=None, help='maximum number of workers')
+    args = parser.parse_args()
+
+    backends = [NoopBackend('noop%d' % i) for i in xrange(args.backends)]
+    pool = WorkerPool(max_workers=args.workers)
+
+    for function in ('noop', 'one'):
+        elapsed = bench(backends, pool, function, args.calls)
+        print('%-5s %4d backends, %3d workers: %8.3f ms/call' % (function, args.backends, pool.max_workers, elapsed * 1000))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,84 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Measure the time spent to parse a large account history table with
+ItemElement filters, with and without compiled filters.
+
+Usage: bench_filters.py [-n ROWS]
+"""
+
+from __future__ import print_function
+
+import os
+import sys
+import time
+from argparse import ArgumentParser
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), os.path.pardir)))
+
+import lxml.html
+
+from weboob.browser.elements import ItemElement, TableElement
+from weboob.browser.filters.standard import CleanDecimal, CleanText, Date, TableCell, Format
+from weboob.capabilities.bank import Transaction
+
+
+class FakePage(object):
+    def __init__(self, doc):
+        self.doc = doc
+        self.params = {}
+        self.browser = None
+
+
+class HistoryTable(TableElement):
+    head_xpath = '//table/thead/tr/th'
+    item_xpath = '//table/tbody/tr'
+
+    col_date = u'Date'
+    col_label = u'Libellé'
+    col_amount = u'Montant'
+
+    class item(ItemElement):
+        klass = Transaction
+
+        obj_id = Format('%s-%s', CleanText(TableCell('date')), CleanText('./td[4]'))
+        obj_date = Date(CleanText(TableCell('date')), dayfirst=True)
+        obj_raw = CleanText(TableCell('label'))
+        obj_label = CleanText('./td[2]/span')
+        obj_amount = CleanDecimal(TableCell('amount'), replace_dots=True)
+
+
+class CompiledHistoryTable(HistoryTable):
+    class item(HistoryTable.item):
+        compile_filters = True
+
+
+def build_doc(rows):
+    html = [u'<html><body><table><thead><tr><th>Date</th><th>Libellé</th><th>Montant</th><th>Ref</th></tr></thead><tbody>']
+    for i in xrange(rows):
+        html.append(u'<tr><td>%02d/%02d/2016</td><td>  CARTE \n <span>SHOP   %d</span></td><td>-1 %03d,%02d</td><td>%d</td></tr>'
+                    % (i % 28 + 1, i % 12 + 1, i, i % 1000, i % 100, i))
+    html.append(u'</tbody></table></body></html>')
+    return lxml.html.fromstring(u''.join(html))
+
+
+def bench(klass, page):
+    start = time.time()
+    count = len(list(klass(page)()))
+    return count, time.time() - start
+
+
+def main():
+    parser = ArgumentParser(description='Benchmark ItemElement filters.')
+    parser.add_argument('-n', '--rows', type=int, default=10000, help='number of rows')
+    args = parser.parse_args()
+
+    page = FakePage(build_doc(args.rows))
+    for name, klass in (('interpreted', HistoryTable), ('compiled', CompiledHistoryTable)):
+        count, elapsed = bench(klass, page)
+        print('%-12s %d items in %.3fs (%.1f us/item)' % (name, count, elapsed, elapsed * 1e6 / count))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,89 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Measure the time spent to walk a large JSON API response with paths, with the
+previous mini_jsonpath algorithm and with compiled paths, and to read fields
+of each item with the Dict filter.
+
+Usage: bench_jsonpath.py [-n ITEMS]
+"""
+
+from __future__ import print_function
+
+import os
+import sys
+import time
+from argparse import ArgumentParser
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), os.path.pardir)))
+
+from weboob.browser.filters.json import Dict
+from weboob.tools.json import compile_path, json
+
+
+def legacy_jsonpath(node, path):
+    # Algorithm of mini_jsonpath before paths were compiled.
+    def iterkeys(i):
+        return range(len(i)) if type(i) is list else i.iterkeys()
+
+    def cut(s):
+        p = s.split('.', 1) if s else [None]
+        return p + [None] if len(p) == 1 else p
+
+    queue = [(node, cut(path))]
+    while queue:
+        node, (name, rest) = queue.pop(0)
+        if name is None:
+            yield node
+            continue
+        elif name == '*':
+            keys = iterkeys(node)
+        elif type(node) not in (dict, list) or name not in node:
+            continue
+        else:
+            keys = [int(name) if type(node) is list else name]
+        for k in keys:
+            queue.append((node[k], cut(rest)))
+
+
+def make_doc(n):
+    data = [{'id': i,
+             'label': u'CB CARREFOUR %d' % i,
+             'amount': {'value': -i / 100.0, 'currency': 'EUR'},
+             'tags': ['card', 'food'],
+            } for i in xrange(n)]
+    return json.loads(json.dumps({'data': {'operations': data}}))
+
+
+def timeit(function):
+    start = time.time()
+    result = function()
+    return time.time() - start, result
+
+
+def main():
+    parser = ArgumentParser(description='Benchmark JSON paths.')
+    parser.add_argument('-n', '--items', type=int, default=50000, help='number of items')
+    args = parser.parse_args()
+
+    doc = make_doc(args.items)
+    path = 'data.operations.*.amount.value'
+
+    elapsed, legacy = timeit(lambda: list(legacy_jsonpath(doc, path)))
+    print('legacy mini_jsonpath:  %8.3f s' % elapsed)
+    elapsed, compiled = timeit(lambda: list(compile_path(path).iter(doc)))
+    print('compiled path:         %8.3f s' % elapsed)
+    assert legacy == compiled
+
+    items = compile_path('data.operations').get(doc)
+    label = Dict('amount/currency')
+    elapsed, _ = timeit(lambda: [label(item) for item in items])
+    print('Dict filter:           %8.3f s' % elapsed)
+    compiled_label = label.compile()
+    elapsed, _ = timeit(lambda: [compiled_label(item) for item in items])
+    print('compiled Dict filter:  %8.3f s' % elapsed)
+
+
+if __name__ == '__main__':
+    main()
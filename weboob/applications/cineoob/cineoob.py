@@ -27,6 +27,7 @@ from weboob.capabilities.torrent import CapTorrent, MagnetOnly
 from weboob.capabilities.cinema import CapCinema
 from weboob.capabilities.subtitle import CapSubtitle
 from weboob.capabilities.base import empty, NotAvailable
+from weboob.capabilities.file import Payload
 from weboob.tools.application.repl import ReplApplication, defaultcount
 from weboob.tools.application.formatters.iformatter import IFormatter, PrettyFormatter
 from weboob.core import CallErrors
@@ -500,11 +501,11 @@ class Cineoob(ReplApplication):
             for buf in self.do('get_torrent_file', _id, backends=backend_name, caps=CapTorrent):
                 if buf:
                     if dest == '-':
-                        print(buf)
+                        Payload.wrap(buf).save(self.stdout)
                     else:
                         try:
                             with open(dest, 'wb') as f:
-                                f.write(buf)
+                                Payload.wrap(buf).save(f)
                         except IOError as e:
                             print('Unable to write .torrent in "%s": %s' % (dest, e), file=self.stderr)
                             return 1
@@ -606,11 +607,11 @@ class Cineoob(ReplApplication):
         for buf in self.do('get_subtitle_file', _id, backends=backend_name, caps=CapSubtitle):
             if buf:
                 if dest == '-':
-                    print(buf)
+                    Payload.wrap(buf).save(self.stdout)
                 else:
                     try:
-                        with open(dest, 'w') as f:
-                            f.write(buf)
+                        with open(dest, 'wb') as f:
+                            Payload.wrap(buf).save(f)
                     except IOError as e:
                         print('Unable to write file in "%s": %s' % (dest, e), file=self.stderr)
                         return 1
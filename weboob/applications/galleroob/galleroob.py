@@ -22,8 +22,10 @@ from __future__ import print_function
 import os
 from re import search, sub
 
+from weboob.browser.download import Downloader
 from weboob.tools.application.repl import ReplApplication, defaultcount
 from weboob.capabilities.base import empty
+from weboob.capabilities.file import Payload
 from weboob.capabilities.gallery import CapGallery, BaseGallery, BaseImage
 from weboob.tools.application.formatters.iformatter import PrettyFormatter
 
@@ -31,6 +33,13 @@ from weboob.tools.application.formatters.iformatter import PrettyFormatter
 __all__ = ['Galleroob']
 
 
+def sizeof_fmt(num):
+    for x in ['bytes', 'KB', 'MB', 'GB', 'TB']:
+        if num < 1024.0:
+            return "%-4.1f%s" % (num, x)
+        num /= 1024.0
+
+
 class GalleryListFormatter(PrettyFormatter):
     MANDATORY_FIELDS = ('id', 'title')
 
@@ -59,6 +68,10 @@ class Galleroob(ReplApplication):
     def __init__(self, *args, **kwargs):
         ReplApplication.__init__(self, *args, **kwargs)
 
+    def add_application_options(self, group):
+        group.add_option('-j', '--jobs', type='int', default=Downloader.MAX_CONCURRENT,
+                         help='Number of images downloaded at the same time (default: %default).')
+
     @defaultcount(10)
     def do_search(self, pattern):
         """
@@ -105,38 +118,61 @@ class Galleroob(ReplApplication):
 
         print("Downloading to %s" % dest)
 
-        try:
-            os.mkdir(dest)
-        except OSError:
-            pass  # ignore error on existing directory
-        os.chdir(dest)  # fail here if dest couldn't be created
-
-        i = 0
-        for img in self.weboob[backend].iter_gallery_images(gallery):
-            i += 1
-            if i < first:
-                continue
-
-            self.weboob[backend].fillobj(img, ('url', 'data'))
-            if img.data is None:
-                self.weboob[backend].fillobj(img, ('url', 'data'))
-                if img.data is None:
+        if not os.path.isdir(dest):
+            os.mkdir(dest)  # fail here if dest couldn't be created
+
+        backend = self.weboob[backend]
+
+        def iter_images(fields):
+            i = 0
+            for img in backend.iter_gallery_images(gallery):
+                i += 1
+                if i < first:
+                    continue
+
+                # Try twice, some sites fail to give the image at first.
+                for _ in range(2):
+                    if any(empty(getattr(img, field)) for field in fields):
+                        backend.fillobj(img, fields)
+                if any(empty(getattr(img, field)) for field in fields):
                     print("Couldn't get page %d, exiting" % i, file=self.stderr)
                     break
 
-            ext = search(r"\.([^\.]{1,5})$", img.url)
-            if ext:
-                ext = ext.group(1)
+                ext = search(r"\.([^\.]{1,5})$", img.url)
+                if ext:
+                    ext = ext.group(1)
+                else:
+                    ext = "jpg"
+
+                yield img, os.path.join(dest, '%03d.%s' % (i, ext))
+
+        if not hasattr(backend, 'create_downloader'):
+            # The module fetches images itself (with its own session, rate
+            # limiting, etc.), so download them one after the other.
+            for img, path in iter_images(('url', 'data')):
+                print('Writing file %s' % os.path.basename(path))
+                Payload.wrap(img.data).save(path)
+            return
+
+        downloader = backend.create_downloader(self.options.jobs)
+        jobs = ((img.url, path) for img, path in iter_images(('url',)))
+        referrer = gallery.url if not empty(gallery.url) else None
+        errors = 0
+        for result in downloader.download(jobs, referrer=referrer):
+            name = os.path.basename(result.path)
+            if result.error is not None:
+                print("Couldn't get file %s: %s" % (name, result.error), file=self.stderr)
+                errors += 1
+            elif result.skipped:
+                print('Skipping file %s (already downloaded)' % name)
             else:
-                ext = "jpg"
-
-            name = '%03d.%s' % (i, ext)
-            print('Writing file %s' % name)
-
-            with open(name, 'wb') as f:
-                f.write(img.data)
+                print('Writing file %s (%s)' % (name, sizeof_fmt(result.size)))
 
-        os.chdir(os.path.pardir)
+        print('Downloaded %d files (%s) in %.1fs, %s/s, %d already present' % (
+              downloader.files, sizeof_fmt(downloader.bytes), downloader.elapsed,
+              sizeof_fmt(downloader.throughput), downloader.skipped))
+        if errors:
+            return 1
 
     def do_info(self, line):
         """
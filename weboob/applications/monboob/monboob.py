@@ -33,10 +33,11 @@ import subprocess
 import socket
 
 from weboob.core import Weboob, CallErrors
-from weboob.core.scheduler import Scheduler
+from weboob.core.scheduler import HeapScheduler
 from weboob.capabilities.messages import CapMessages, CapMessagesPost, Thread, Message
 from weboob.tools.application.repl import ReplApplication
 from weboob.tools.date import utc2local
+from weboob.tools.capabilities.messages.seen import flush_seen_indexes
 from weboob.tools.html import html2text
 from weboob.tools.misc import get_backtrace, to_unicode
 
@@ -54,9 +55,9 @@ class FakeSMTPD(SMTPServer):
         self.app.process_incoming_mail(msg)
 
 
-class MonboobScheduler(Scheduler):
+class MonboobScheduler(HeapScheduler):
     def __init__(self, app):
-        Scheduler.__init__(self)
+        HeapScheduler.__init__(self, jitter=0.1)
         self.app = app
 
     def run(self):
@@ -273,6 +274,9 @@ class Monboob(ReplApplication):
                     self.weboob[message.backend].set_message_read(message)
         except CallErrors as e:
             self.bcall_errors_handler(e)
+        finally:
+            # Save seen messages once for the whole pass.
+            flush_seen_indexes()
 
     def send_email(self, backend_name, mail):
         domain = self.config.get('domain')
@@ -24,6 +24,7 @@ from PyQt5.QtWidgets import QFrame, QFileDialog
 
 from weboob.applications.qcineoob.ui.subtitle_ui import Ui_Subtitle
 from weboob.capabilities.base import empty
+from weboob.capabilities.file import Payload
 
 
 class Subtitle(QFrame):
@@ -81,8 +82,8 @@ class Subtitle(QFrame):
             dest = result[0]
             data = self.backend.get_subtitle_file(self.subtitle.id)
             try:
-                with open(dest, 'w') as f:
-                    f.write(data)
+                with open(dest, 'wb') as f:
+                    Payload.wrap(data).save(f)
             except IOError as e:
                 print('Unable to write subtitle file in "%s": %s' % (dest, e), file=self.stderr)
                 return 1
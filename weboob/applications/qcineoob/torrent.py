@@ -25,6 +25,7 @@ from PyQt5.QtWidgets import QFrame, QFileDialog
 from weboob.applications.qcineoob.ui.torrent_ui import Ui_Torrent
 from weboob.applications.weboorrents.weboorrents import sizeof_fmt
 from weboob.capabilities.base import empty
+from weboob.capabilities.file import Payload
 
 
 class Torrent(QFrame):
@@ -85,8 +86,8 @@ class Torrent(QFrame):
             dest = result[0]
             data = self.backend.get_torrent_file(self.torrent.id)
             try:
-                with open(unicode(dest), 'w') as f:
-                    f.write(data)
+                with open(unicode(dest), 'wb') as f:
+                    Payload.wrap(data).save(f)
             except IOError as e:
                 print('Unable to write .torrent in "%s": %s' % (dest, e), file=self.stderr)
                 return 1
@@ -21,6 +21,7 @@
 from PyQt5.QtGui import QImage, QPixmap
 from PyQt5.QtWidgets import QFrame
 
+from weboob.capabilities.file import Payload
 from weboob.tools.application.qt5 import QtDo
 from weboob.applications.qvideoob.ui.minivideo_ui import Ui_MiniVideo
 from .video import Video
@@ -50,7 +51,7 @@ class MiniVideo(QFrame):
 
     def gotThumbnail(self, video):
         if video.thumbnail and video.thumbnail.data:
-            img = QImage.fromData(video.thumbnail.data)
+            img = QImage.fromData(Payload.wrap(video.thumbnail.data).getvalue())
             self.ui.imageLabel.setPixmap(QPixmap.fromImage(img))
 
     def enterEvent(self, event):
@@ -21,6 +21,7 @@ from __future__ import print_function
 
 from weboob.capabilities.subtitle import CapSubtitle
 from weboob.capabilities.base import empty
+from weboob.capabilities.file import Payload
 from weboob.tools.application.repl import ReplApplication, defaultcount
 from weboob.tools.application.formatters.iformatter import IFormatter, PrettyFormatter
 
@@ -149,11 +150,11 @@ class Suboob(ReplApplication):
         for buf in self.do('get_subtitle_file', subtitle.id, backends=subtitle.backend):
             if buf:
                 if dest == '-':
-                    self.stdout.write(buf)
+                    Payload.wrap(buf).save(self.stdout)
                 else:
                     try:
-                        with open(dest, 'w') as f:
-                            f.write(buf)
+                        with open(dest, 'wb') as f:
+                            Payload.wrap(buf).save(f)
                     except IOError as e:
                         print('Unable to write file in "%s": %s' % (dest, e), file=self.stderr)
                         return 1
@@ -18,12 +18,12 @@
 # along with weboob. If not, see <http://www.gnu.org/licenses/>.
 
 from __future__ import print_function
-from urlparse import urlparse
+from urlparse import urljoin
 
-import requests
 import subprocess
 import os
 
+from weboob.browser.download import Downloader
 from weboob.capabilities.video import CapVideo, BaseVideo
 from weboob.capabilities.base import empty
 from weboob.tools.application.repl import ReplApplication, defaultcount
@@ -33,6 +33,13 @@ from weboob.tools.application.formatters.iformatter import PrettyFormatter
 __all__ = ['Videoob']
 
 
+def sizeof_fmt(num):
+    for x in ['bytes', 'KB', 'MB', 'GB', 'TB']:
+        if num < 1024.0:
+            return "%-4.1f%s" % (num, x)
+        num /= 1024.0
+
+
 class VideoListFormatter(PrettyFormatter):
     MANDATORY_FIELDS = ('id', 'title', 'duration', 'date')
     DISPLAYED_FIELDS = ('author', 'rating')
@@ -71,6 +78,12 @@ class Videoob(ReplApplication):
     def __init__(self, *args, **kwargs):
         ReplApplication.__init__(self, *args, **kwargs)
         self.player = MediaPlayer(self.logger)
+        self._downloader = None
+
+    def add_application_options(self, group):
+        group.add_option('-j', '--jobs', type='int', default=Downloader.MAX_CONCURRENT,
+                         help='Number of segments or parts of a video downloaded at the same time '
+                              '(default: %default).')
 
     def main(self, argv):
         self.load_config()
@@ -102,16 +115,9 @@ class Videoob(ReplApplication):
         elif u'm3u8' == video.ext:
             _dest, _ = os.path.splitext(dest)
             dest = u'%s.%s' % (_dest, 'mp4')
-            content = tuple()
-            parsed_uri = urlparse(video.url)
-            baseurl = '{uri.scheme}://{uri.netloc}'.format(uri=parsed_uri)
-            for line in self.read_url(video.url):
-                if not line.startswith('#'):
-                    if not line.startswith('http'):
-                        line = u'%s%s' % (baseurl, line)
-                    content += (line,)
-
-            args = ('wget', '-nv',) + content + ('-O', dest)
+            return self.download_hls(video.url, dest)
+        elif video.url.startswith('http'):
+            return self.download_http(video.url, dest)
         else:
             if check_exec('wget'):
                 args = ('wget', '-c', video.url, '-O', dest)
@@ -123,9 +129,37 @@ class Videoob(ReplApplication):
         self.logger.debug(' '.join(args))
         os.spawnlp(os.P_WAIT, args[0], *args)
 
-    def read_url(self, url):
-        r = requests.get(url, stream=True)
-        return r.iter_lines()
+    @property
+    def downloader(self):
+        if self._downloader is None:
+            self._downloader = Downloader(max_concurrent=self.options.jobs, logger=self.logger)
+        return self._downloader
+
+    def download_hls(self, url, dest):
+        segments = []
+        for line in self.downloader.browser.open(url).iter_lines():
+            line = line.strip()
+            if line and not line.startswith('#'):
+                segments.append(urljoin(url, line))
+
+        self.downloader.reset_stats()
+        return self.print_download_result(self.downloader.download_segments(segments, dest, url=url))
+
+    def download_http(self, url, dest):
+        self.downloader.reset_stats()
+        return self.print_download_result(self.downloader.download_ranges(url, dest))
+
+    def print_download_result(self, result):
+        if result.error is not None:
+            print('Unable to download %s: %s' % (result.path, result.error), file=self.stderr)
+            print('Run the same command again to resume the download.', file=self.stderr)
+            return 1
+
+        if result.skipped:
+            print('%s is already downloaded' % result.path)
+        else:
+            print('Downloaded %s (%s) in %.1fs, %s/s' % (result.path, sizeof_fmt(result.size), self.downloader.elapsed,
+                                                       sizeof_fmt(self.downloader.throughput)))
 
     def complete_download(self, text, line, *ignored):
         args = line.split(' ')
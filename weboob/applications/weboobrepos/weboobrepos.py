@@ -100,7 +100,7 @@ class WeboobRepos(ReplApplication):
             print('Use the "create" command before.', file=self.stderr)
             return 1
 
-        r.build_index(source_path, index_file)
+        r.build_index(source_path, index_file, incremental=True)
 
         if r.signed:
             sigfiles = [r.KEYRING, Repository.INDEX]
@@ -24,6 +24,7 @@ from weboob.tools.application.repl import ReplApplication, defaultcount
 from weboob.tools.application.formatters.iformatter import IFormatter, PrettyFormatter
 from weboob.core import CallErrors
 from weboob.capabilities.base import NotAvailable, NotLoaded, empty
+from weboob.capabilities.file import Payload
 
 
 __all__ = ['Weboorrents']
@@ -150,11 +151,11 @@ class Weboorrents(ReplApplication):
             for buf in self.do('get_torrent_file', torrent.id, backends=torrent.backend):
                 if buf:
                     if dest == '-':
-                        print(buf)
+                        Payload.wrap(buf).save(self.stdout)
                     else:
                         try:
-                            with open(dest, 'w') as f:
-                                f.write(buf)
+                            with open(dest, 'wb') as f:
+                                Payload.wrap(buf).save(f)
                         except IOError as e:
                             print('Unable to write .torrent in "%s": %s' % (dest, e), file=self.stderr)
                             return 1
@@ -49,12 +49,13 @@ from weboob.tools.log import getLogger
 from weboob.tools.ordereddict import OrderedDict
 from weboob.tools.json import json
 
+from .cache import HTTPCache
 from .cookies import WeboobCookieJar
 from .exceptions import HTTPNotFound, ClientError, ServerError
-from .sessions import FuturesSession
+from .sessions import FuturesSession, SharedTransport
 from .profiles import Firefox
 from .pages import NextPage
-from .url import URL
+from .url import URL, ABSOLUTE_URL_RE
 
 
 class Browser(object):
@@ -98,6 +99,13 @@ class Browser(object):
     Controls the behavior of get_referrer.
     """
 
+    SHARED_TRANSPORT = False
+    """
+    Use the process-wide :class:`weboob.browser.sessions.SharedTransport`, to
+    share kept-alive connections and threads with other browsers. Cookies are
+    still specific to each browser.
+    """
+
     @classmethod
     def asset(cls, localfile):
         """
@@ -117,6 +125,11 @@ class Browser(object):
         self.responses_dirname = responses_dirname
         self.responses_count = 1
 
+        # HTTP cache used by requests opened with cache=True; the default one
+        # is used if None.
+        self.http_cache = None
+        self.cache_namespace = '%s.%s' % (self.__class__.__module__, self.__class__.__name__)
+
         if isinstance(self.VERIFY, basestring):
             self.VERIFY = self.asset(self.VERIFY)
 
@@ -178,6 +191,8 @@ class Browser(object):
             self.logger.info(msg)
 
     def _create_session(self):
+        if self.SHARED_TRANSPORT:
+            return FuturesSession(executor=SharedTransport.get_default().executor)
         return FuturesSession(max_workers=self.MAX_WORKERS, max_retries=self.MAX_RETRIES)
 
     def _setup_session(self, profile):
@@ -198,13 +213,16 @@ class Browser(object):
 
         # defines a max_retries. It's mandatory in case a server is not
         # handling keep alive correctly, like the proxy burp
-        adapter_kwargs = dict(max_retries=self.MAX_RETRIES)
-        # set connection pool size equal to MAX_WORKERS if needed
-        if self.MAX_WORKERS > requests.adapters.DEFAULT_POOLSIZE:
-            adapter_kwargs.update(pool_connections=self.MAX_WORKERS,
-                                  pool_maxsize=self.MAX_WORKERS)
-        session.mount('https://', requests.adapters.HTTPAdapter(**adapter_kwargs))
-        session.mount('http://', requests.adapters.HTTPAdapter(**adapter_kwargs))
+        if self.SHARED_TRANSPORT:
+            SharedTransport.get_default().mount(session, max_retries=self.MAX_RETRIES)
+        else:
+            adapter_kwargs = dict(max_retries=self.MAX_RETRIES)
+            # set connection pool size equal to MAX_WORKERS if needed
+            if self.MAX_WORKERS > requests.adapters.DEFAULT_POOLSIZE:
+                adapter_kwargs.update(pool_connections=self.MAX_WORKERS,
+                                      pool_maxsize=self.MAX_WORKERS)
+            session.mount('https://', requests.adapters.HTTPAdapter(**adapter_kwargs))
+            session.mount('http://', requests.adapters.HTTPAdapter(**adapter_kwargs))
 
         if self.TIMEOUT:
             session.timeout = self.TIMEOUT
@@ -246,6 +264,7 @@ class Browser(object):
                    data_encoding=None,
                    is_async=False,
                    callback=lambda response: response,
+                   cache=False,
                    **kwargs):
         """
         Make an HTTP request like a browser does:
@@ -290,6 +309,12 @@ class Browser(object):
                          with response as its first and only argument
         :type callback: function
 
+        :param cache: Use the HTTP cache (see :class:`weboob.browser.cache.HTTPCache`)
+                      for this GET request: a fresh stored response is returned
+                      without request, and a stale one is revalidated with
+                      If-None-Match/If-Modified-Since headers
+        :type cache: bool
+
         :rtype: :class:`requests.Response`
         """
         if 'async' in kwargs:
@@ -316,15 +341,44 @@ class Browser(object):
         if timeout is None:
             timeout = self.TIMEOUT
 
+        use_cache = cache and preq.method == 'GET' and not stream
+        cache_entry = None
+        if use_cache:
+            if self.http_cache is None:
+                self.http_cache = HTTPCache.get_default()
+            cache_entry = self.http_cache.get(self.cache_namespace, preq.url)
+            if cache_entry is not None and not cache_entry.is_fresh():
+                preq.headers.update(cache_entry.get_validators())
+
         # We define an inner_callback here in order to execute the same code
         # regardless of is_async param.
         def inner_callback(future, response):
+            if use_cache and not getattr(response, 'from_cache', False):
+                if cache_entry is not None and response.status_code == 304:
+                    response = self.http_cache.revalidated(self.cache_namespace, preq.url, cache_entry, response)
+                else:
+                    self.http_cache.store(self.cache_namespace, preq.url, response)
+
             if allow_redirects:
                 response = self.handle_refresh(response)
 
             self.raise_for_status(response)
             return callback(response)
 
+        if cache_entry is not None and cache_entry.is_fresh():
+            self.logger.debug('Use cached response of %s', preq.url)
+            response = cache_entry.build_response(preq)
+            if not is_async:
+                return inner_callback(None, response)
+
+            from concurrent.futures import Future
+            future = Future()
+            try:
+                future.set_result(inner_callback(None, response))
+            except Exception as e:
+                future.set_exception(e)
+            return future
+
         # call python-requests
         response = self.session.send(preq,
                                      allow_redirects=allow_redirects,
@@ -588,6 +642,12 @@ class _PagesBrowserMeta(type):
         else:
             new_class._urls = deepcopy(new_class._urls)
         new_class._urls.update(urls)
+
+        # Compile regexps now rather than on first request.
+        for url in new_class._urls.itervalues():
+            if new_class.BASEURL is not None or all(ABSOLUTE_URL_RE.match(regex) for regex in url.urls):
+                url.get_prefixes(new_class.BASEURL)
+            url.get_patterns()
         return new_class
 
 
@@ -636,6 +696,44 @@ class PagesBrowser(DomainBrowser):
         self._urls = deepcopy(self._urls)
         for url in self._urls.itervalues():
             url.browser = self
+        self._urls_index = None
+        self._cached_urls = [url for url in self._urls.itervalues() if url.cache]
+
+    def _build_urls_index(self):
+        """
+        Build a trie of literal prefixes of URL objects, to only try the ones
+        which can match a given url.
+        """
+        root = ({}, [])
+        for order, url in enumerate(self._urls.itervalues()):
+            if url.klass is None:
+                continue
+            for prefix in url.get_prefixes(self.BASEURL):
+                node = root
+                for c in prefix:
+                    node = node[0].setdefault(c, ({}, []))
+                node[1].append((order, url))
+        return self.BASEURL, root
+
+    def get_url_candidates(self, url):
+        """
+        Get URL objects which may handle an url, in declaration order.
+
+        :rtype: list[:class:`URL`]
+        """
+        if self._urls_index is None or self._urls_index[0] != self.BASEURL:
+            # (Re)build the index, as BASEURL may be changed after init.
+            self._urls_index = self._build_urls_index()
+
+        node = self._urls_index[1]
+        candidates = dict(node[1])
+        for c in url:
+            node = node[0].get(c)
+            if node is None:
+                break
+            candidates.update(node[1])
+
+        return [candidates[order] for order in sorted(candidates)]
 
     def open(self, *args, **kwargs):
         """
@@ -647,13 +745,17 @@ class PagesBrowser(DomainBrowser):
 
         callback = kwargs.pop('callback', lambda response: response)
 
+        if self._cached_urls and 'cache' not in kwargs and args and isinstance(args[0], basestring):
+            url = self.absurl(args[0])
+            kwargs['cache'] = any(u.match(url) for u in self._cached_urls)
+
         # Have to define a callback to seamlessly process synchronous and
         # asynchronous requests, see :meth:`Browser.open` and its `is_async`
         # and `callback` params.
         def internal_callback(response):
             # Try to handle the response page with an URL instance.
             response.page = None
-            for url in self._urls.itervalues():
+            for url in self.get_url_candidates(response.url):
                 page = url.handle(response)
                 if page is not None:
                     self.logger.debug('Handle %s with %s' % (response.url, page.__class__.__name__))
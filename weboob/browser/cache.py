@@ -0,0 +1,294 @@
+# -*- coding: utf-8 -*-
+
+# Copyright(C) 2016 weboob project
+#
+# This file is part of weboob.
+#
+# weboob is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# weboob is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with weboob. If not, see <http://www.gnu.org/licenses/>.
+
+import os
+import sqlite3
+import time
+from datetime import timedelta
+from email.utils import mktime_tz, parsedate_tz
+from threading import RLock
+
+from requests import Response
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+
+from weboob.tools.json import json
+from weboob.tools.log import getLogger
+
+
+__all__ = ['HTTPCache']
+
+
+class CacheEntry(object):
+    """
+    Response stored in the cache.
+    """
+
+    def __init__(self, url, status, reason, headers, content, expires):
+        self.url = url
+        self.status = status
+        self.reason = reason
+        self.headers = CaseInsensitiveDict(headers)
+        self.content = content
+        self.expires = expires
+
+    def is_fresh(self):
+        return self.expires > time.time()
+
+    def get_validators(self):
+        """
+        Get headers to send to revalidate this entry.
+        """
+        headers = {}
+        if 'ETag' in self.headers:
+            headers['If-None-Match'] = self.headers['ETag']
+        if 'Last-Modified' in self.headers:
+            headers['If-Modified-Since'] = self.headers['Last-Modified']
+        return headers
+
+    def build_response(self, request):
+        """
+        Build a response from this entry.
+
+        :param request: request which is answered by this response
+        :type request: :class:`requests.PreparedRequest`
+        :rtype: :class:`requests.Response`
+        """
+        response = Response()
+        response.status_code = self.status
+        response.reason = self.reason
+        response.url = self.url
+        response.headers = CaseInsensitiveDict(self.headers)
+        response.encoding = get_encoding_from_headers(response.headers)
+        response._content = self.content
+        response._content_consumed = True
+        response.request = request
+        response.elapsed = timedelta(0)
+        response.from_cache = True
+        return response
+
+
+class HTTPCache(object):
+    """
+    On-disk cache of HTTP responses, in a sqlite database.
+
+    Responses are kept only if they can be revalidated (with an ETag or a
+    Last-Modified header) or if they are fresh for some time according to
+    Cache-Control or Expires headers. Entries are separated by namespace,
+    usually the name of the backend, and the least recently used ones are
+    removed when the total size exceeds *max_size*.
+
+    :param path: path of the database
+    :type path: str
+    :param max_size: maximum size of stored contents, in bytes
+    :type max_size: int
+    """
+
+    MAX_SIZE = 50 * 1024 * 1024
+
+    # Headers which do not apply to the decoded content which is stored.
+    SKIPPED_HEADERS = ('content-encoding', 'content-length', 'transfer-encoding')
+
+    _default = None
+    _default_lock = RLock()
+
+    @classmethod
+    def get_default(cls):
+        """
+        Get the process-wide cache, in the "weboob" directory of
+        ``$XDG_CACHE_HOME`` (or ``$WEBOOB_CACHEDIR`` if set).
+        """
+        with cls._default_lock:
+            if cls._default is None:
+                if 'WEBOOB_CACHEDIR' in os.environ:
+                    cachedir = os.environ['WEBOOB_CACHEDIR']
+                else:
+                    cachedir = os.path.join(os.environ.get('XDG_CACHE_HOME', os.path.join(os.path.expanduser('~'), '.cache')), 'weboob')
+                if not os.path.isdir(cachedir):
+                    os.makedirs(cachedir)
+                cls._default = cls(os.path.join(cachedir, 'http.sqlite'))
+            return cls._default
+
+    def __init__(self, path, max_size=None):
+        self.logger = getLogger('browser.cache')
+        self.path = path
+        self.max_size = max_size or self.MAX_SIZE
+        self.lock = RLock()
+        self.stats = {}
+
+        self.db = sqlite3.connect(path, timeout=30, check_same_thread=False, isolation_level=None)
+        self.db.execute('CREATE TABLE IF NOT EXISTS entries (namespace TEXT, key TEXT, url TEXT, status INTEGER, '
+                        'reason TEXT, headers TEXT, content BLOB, expires REAL, accessed REAL, size INTEGER, '
+                        'PRIMARY KEY (namespace, key))')
+        self.db.execute('CREATE INDEX IF NOT EXISTS entries_accessed ON entries (accessed)')
+
+    def _count(self, namespace, name, value=1):
+        stats = self.stats.setdefault(namespace, {'hits': 0, 'misses': 0, 'revalidated': 0, 'bytes_saved': 0})
+        stats[name] += value
+
+    def get_stats(self, namespace=None):
+        """
+        Get the number of hits (fresh entries and revalidated ones), misses,
+        revalidated entries and bytes not downloaded thanks to the cache.
+
+        :param namespace: if given, only get stats of this namespace
+        :rtype: dict
+        """
+        with self.lock:
+            if namespace is not None:
+                return dict(self.stats.get(namespace, {'hits': 0, 'misses': 0, 'revalidated': 0, 'bytes_saved': 0}))
+
+            total = {'hits': 0, 'misses': 0, 'revalidated': 0, 'bytes_saved': 0}
+            for stats in self.stats.itervalues():
+                for key, value in stats.iteritems():
+                    total[key] += value
+            return total
+
+    def get(self, namespace, key):
+        """
+        Get an entry.
+
+        :rtype: :class:`CacheEntry` or None
+        """
+        with self.lock:
+            row = self.db.execute('SELECT url, status, reason, headers, content, expires FROM entries '
+                                  'WHERE namespace = ? AND key = ?', (namespace, key)).fetchone()
+            if row is None:
+                return None
+
+            self.db.execute('UPDATE entries SET accessed = ? WHERE namespace = ? AND key = ?',
+                            (time.time(), namespace, key))
+
+        url, status, reason, headers, content, expires = row
+        entry = CacheEntry(url, status, reason, json.loads(headers), bytes(content), expires)
+        if entry.is_fresh():
+            with self.lock:
+                self._count(namespace, 'hits')
+                self._count(namespace, 'bytes_saved', len(entry.content))
+        return entry
+
+    def get_expires(self, headers):
+        """
+        Get the timestamp until which a response is fresh, or None if it must
+        not be stored.
+        """
+        directives = {}
+        for directive in headers.get('Cache-Control', '').split(','):
+            name, _, value = directive.strip().partition('=')
+            directives[name.lower()] = value.strip('"')
+
+        if 'no-store' in directives:
+            return None
+        if 'no-cache' in directives:
+            return 0
+        if 'max-age' in directives:
+            try:
+                return time.time() + int(directives['max-age'])
+            except ValueError:
+                return 0
+        if 'Expires' in headers:
+            date = parsedate_tz(headers['Expires'])
+            if date is not None:
+                return mktime_tz(date)
+        return 0
+
+    def store(self, namespace, key, response):
+        """
+        Store a response downloaded after a cache miss, if it is cacheable.
+
+        :returns: the stored entry, or None
+        """
+        with self.lock:
+            self._count(namespace, 'misses')
+
+        if response.status_code != 200 or response.history:
+            return None
+
+        expires = self.get_expires(response.headers)
+        if expires is None:
+            return None
+        headers = dict((name, value) for name, value in response.headers.iteritems()
+                       if name.lower() not in self.SKIPPED_HEADERS)
+        entry = CacheEntry(response.url, response.status_code, response.reason, headers, response.content, expires)
+        if not entry.is_fresh() and not entry.get_validators():
+            return None
+        if len(entry.content) > self.max_size:
+            return None
+
+        self._write(namespace, key, entry)
+        return entry
+
+    def revalidated(self, namespace, key, entry, response):
+        """
+        Update an entry after a "304 Not Modified" response.
+
+        :returns: the response built from the entry
+        """
+        entry.headers.update((name, value) for name, value in response.headers.iteritems()
+                             if name.lower() not in self.SKIPPED_HEADERS)
+        entry.expires = self.get_expires(entry.headers) or 0
+        self._write(namespace, key, entry)
+
+        with self.lock:
+            self._count(namespace, 'hits')
+            self._count(namespace, 'revalidated')
+            self._count(namespace, 'bytes_saved', len(entry.content))
+
+        new_response = entry.build_response(response.request)
+        new_response.elapsed = response.elapsed
+        return new_response
+
+    def _write(self, namespace, key, entry):
+        with self.lock:
+            self.db.execute('BEGIN IMMEDIATE')
+            try:
+                self.db.execute('INSERT OR REPLACE INTO entries (namespace, key, url, status, reason, headers, content, '
+                                'expires, accessed, size) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)',
+                                (namespace, key, entry.url, entry.status, entry.reason, json.dumps(dict(entry.headers)),
+                                 sqlite3.Binary(entry.content), entry.expires, time.time(), len(entry.content)))
+                self._evict()
+            except:
+                self.db.execute('ROLLBACK')
+                raise
+            else:
+                self.db.execute('COMMIT')
+
+    def _evict(self):
+        # Called in a transaction. Remove the least recently used entries.
+        total = self.db.execute('SELECT SUM(size) FROM entries').fetchone()[0] or 0
+        if total <= self.max_size:
+            return
+
+        for namespace, key, size in self.db.execute('SELECT namespace, key, size FROM entries '
+                                                    'ORDER BY accessed').fetchall():
+            self.db.execute('DELETE FROM entries WHERE namespace = ? AND key = ?', (namespace, key))
+            self.logger.debug('removed %s from cache' % key)
+            total -= size
+            if total <= self.max_size:
+                break
+
+    def clear(self, namespace=None):
+        """
+        Remove every entry, or only entries of a namespace.
+        """
+        with self.lock:
+            if namespace is None:
+                self.db.execute('DELETE FROM entries')
+            else:
+                self.db.execute('DELETE FROM entries WHERE namespace = ?', (namespace,))
@@ -0,0 +1,474 @@
+# -*- coding: utf-8 -*-
+
+# Copyright(C) 2016 weboob project
+#
+# This file is part of weboob.
+#
+# weboob is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# weboob is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with weboob. If not, see <http://www.gnu.org/licenses/>.
+
+import os
+import re
+import time
+from collections import deque
+from threading import RLock
+
+from weboob.tools.json import json
+from weboob.tools.log import getLogger
+
+from .browsers import Browser
+
+
+__all__ = ['Downloader', 'DownloadProgress', 'DownloadResult']
+
+
+class DownloadResult(object):
+    """
+    Result of the download of a file.
+
+    :param url: URL of the file
+    :param path: path where the file is written
+    """
+
+    def __init__(self, url, path):
+        self.url = url
+        self.path = path
+        self.size = 0
+        self.skipped = False
+        self.resumed = False
+        self.error = None
+
+    def __repr__(self):
+        return '<DownloadResult url=%r path=%r size=%d skipped=%r resumed=%r error=%r>' % (
+            self.url, self.path, self.size, self.skipped, self.resumed, self.error)
+
+
+class DownloadProgress(object):
+    """
+    Progress of a download, kept in a ``.progress`` file next to the
+    downloaded one so that an interrupted download can be resumed.
+
+    :param path: path of the downloaded file
+    :type path: str
+    """
+
+    INTERVAL = 1
+    """
+    Minimum time between two writes of the progress file, in seconds.
+    """
+
+    def __init__(self, path):
+        self.path = path + '.progress'
+        self.data = None
+        self.lock = RLock()
+        self.saved = 0
+
+    def load(self):
+        """
+        Read the progress file.
+
+        :returns: the saved data, or None if there is no valid progress file
+        """
+        try:
+            with open(self.path, 'rb') as f:
+                self.data = json.load(f)
+        except (IOError, ValueError):
+            self.data = None
+        return self.data
+
+    def save(self, force=False):
+        """
+        Write the progress file, unless it has been written less than
+        :attr:`INTERVAL` seconds ago and *force* is False.
+        """
+        with self.lock:
+            if not force and time.time() - self.saved < self.INTERVAL:
+                return
+            tmppath = self.path + '.tmp'
+            with open(tmppath, 'wb') as f:
+                json.dump(self.data, f)
+            os.rename(tmppath, self.path)
+            self.saved = time.time()
+
+    def remove(self):
+        with self.lock:
+            if os.path.exists(self.path):
+                os.remove(self.path)
+
+
+class Downloader(object):
+    """
+    Download files with a bounded number of concurrent requests, made with the
+    asynchronous session of a browser.
+
+    Response bodies are written to disk while they are received, in a
+    ``.part`` file renamed when it is complete, so they are never held in
+    memory. A file which already exists with the size announced by the
+    server is not downloaded again.
+
+    It can also download a file made of segments (like a HLS playlist) with
+    :meth:`download_segments`, or a large file in several parts requested
+    in parallel with Range headers with :meth:`download_ranges`. Both can be
+    resumed after an interruption, with a :class:`DownloadProgress`.
+
+    :param browser: browser used to make requests (a new one if None)
+    :type browser: :class:`weboob.browser.browsers.Browser`
+    :param max_concurrent: maximum number of concurrent downloads (None for
+                           :attr:`MAX_CONCURRENT`)
+    :type max_concurrent: int
+    """
+
+    MAX_CONCURRENT = 4
+    CHUNK_SIZE = 64 * 1024
+
+    RETRIES = 3
+    """
+    Number of times a failed segment or part is requested again.
+    """
+
+    RANGE_MIN_SIZE = 4 * 1024 * 1024
+    """
+    Files smaller than this are not split in parts by :meth:`download_ranges`.
+    """
+
+    def __init__(self, browser=None, max_concurrent=None, logger=None):
+        self.logger = getLogger('download', logger)
+        if browser is None:
+            browser = Browser(logger=self.logger)
+        self.browser = browser
+        self.max_concurrent = min(max_concurrent or self.MAX_CONCURRENT, browser.MAX_WORKERS)
+        self.lock = RLock()
+        self.reset_stats()
+
+    def reset_stats(self):
+        with self.lock:
+            self.files = 0
+            self.skipped = 0
+            self.errors = 0
+            self.bytes = 0
+            self.start = time.time()
+
+    @property
+    def elapsed(self):
+        return time.time() - self.start
+
+    @property
+    def throughput(self):
+        """
+        Downloaded bytes per second since the last :meth:`reset_stats`.
+        """
+        elapsed = self.elapsed
+        if elapsed <= 0:
+            return 0.
+        return self.bytes / elapsed
+
+    def download(self, jobs, referrer=None):
+        """
+        Download files.
+
+        *jobs* is consumed lazily, so it can be a generator which finds URLs
+        while previous files are downloaded.
+
+        :param jobs: (url, path) tuples
+        :type jobs: iter
+        :param referrer: referrer sent with every request
+        :returns: :class:`DownloadResult` objects, in the order of *jobs*
+        :rtype: iter
+        """
+        pending = deque()
+        for url, path in jobs:
+            pending.append(self._submit(url, path, referrer))
+            if len(pending) >= self.max_concurrent:
+                yield self._wait(*pending.popleft())
+
+        while pending:
+            yield self._wait(*pending.popleft())
+
+    def download_file(self, url, path, referrer=None):
+        """
+        Download a single file.
+
+        :rtype: :class:`DownloadResult`
+        """
+        return self._wait(*self._submit(url, path, referrer))
+
+    def _submit(self, url, path, referrer):
+        result = DownloadResult(url, path)
+        future = self.browser.open(url, referrer=referrer, stream=True, is_async=True,
+                                   callback=lambda response: self._write(response, result))
+        return result, future
+
+    def _wait(self, result, future):
+        try:
+            future.result()
+        except Exception as e:
+            self.logger.warning('unable to download %s: %s', result.url, e)
+            result.error = e
+            with self.lock:
+                self.errors += 1
+        return result
+
+    def _write(self, response, result):
+        # Called in a thread of the browser session.
+        try:
+            length = int(response.headers.get('Content-Length', ''))
+        except ValueError:
+            length = None
+        if length is not None and response.headers.get('Content-Encoding', 'identity') == 'identity' \
+           and os.path.isfile(result.path) and os.path.getsize(result.path) == length:
+            response.close()
+            result.size = length
+            result.skipped = True
+            with self.lock:
+                self.skipped += 1
+            return result
+
+        tmppath = result.path + '.part'
+        try:
+            with open(tmppath, 'wb') as f:
+                for chunk in response.iter_content(self.CHUNK_SIZE):
+                    f.write(chunk)
+                    result.size += len(chunk)
+                    with self.lock:
+                        self.bytes += len(chunk)
+            os.rename(tmppath, result.path)
+        except:
+            if os.path.exists(tmppath):
+                os.remove(tmppath)
+            raise
+        finally:
+            response.close()
+
+        with self.lock:
+            self.files += 1
+        return result
+
+    def _count(self, size):
+        with self.lock:
+            self.bytes += size
+
+    def _retry(self, future, submit, url):
+        # Wait for a future, and submit the request again while it fails.
+        for attempt in xrange(self.RETRIES + 1):
+            try:
+                return future.result()
+            except Exception as e:
+                if attempt == self.RETRIES:
+                    raise
+                self.logger.info('unable to download %s (%s), retrying', url, e)
+                future = submit()
+
+    def download_segments(self, urls, path, url=None, referrer=None):
+        """
+        Download segments concurrently and write them in order to a file.
+
+        The progress is regularly saved, so the download is resumed
+        from the first missing segment when it is started again with the
+        same *url* and the same number of segments.
+
+        :param urls: URLs of segments
+        :type urls: list
+        :param path: path of the file
+        :type path: str
+        :param url: URL of the playlist of segments
+        :type url: str
+        :rtype: :class:`DownloadResult`
+        """
+        urls = list(urls)
+        result = DownloadResult(url, path)
+        progress = DownloadProgress(path)
+        data = progress.load()
+        if data is None or data.get('url') != url or data.get('segments') != len(urls) \
+           or not os.path.isfile(path) or os.path.getsize(path) < data['size']:
+            data = progress.data = {'url': url, 'segments': len(urls), 'done': 0, 'size': 0}
+        elif data['done'] > 0:
+            self.logger.info('resuming download of %s at segment %d/%d', path, data['done'] + 1, len(urls))
+            result.resumed = True
+
+        def submit(i):
+            return self.browser.open(urls[i], referrer=referrer, is_async=True,
+                                     callback=lambda response: response.content)
+
+        pending = deque()
+
+        def write_next(f):
+            i, future = pending.popleft()
+            content = self._retry(future, lambda: submit(i), urls[i])
+            f.write(content)
+            # Only count written bytes in the progress file.
+            f.flush()
+            self._count(len(content))
+            data['done'] = i + 1
+            data['size'] += len(content)
+            progress.save()
+
+        with open(path, 'r+b' if data['done'] > 0 else 'wb') as f:
+            f.truncate(data['size'])
+            f.seek(data['size'])
+            try:
+                for i in xrange(data['done'], len(urls)):
+                    pending.append((i, submit(i)))
+                    if len(pending) >= self.max_concurrent:
+                        write_next(f)
+                while pending:
+                    write_next(f)
+            except Exception as e:
+                self.logger.warning('unable to download %s: %s', path, e)
+                result.error = e
+                with self.lock:
+                    self.errors += 1
+            finally:
+                # Do not leave requests running after the end of the download.
+                for _, future in pending:
+                    if not future.cancel():
+                        future.exception()
+                f.flush()
+                if result.error is None and data['done'] == len(urls):
+                    progress.remove()
+                else:
+                    progress.save(force=True)
+
+        result.size = data['size']
+        if result.error is None:
+            with self.lock:
+                self.files += 1
+        return result
+
+    def get_range_size(self, url, referrer=None):
+        """
+        Check if a server supports Range requests for a file.
+
+        :returns: the size of the file, or None if ranges are not supported
+        :rtype: int
+        """
+        response = self.browser.open(url, referrer=referrer, stream=True, headers={'Range': 'bytes=0-0'})
+        response.close()
+        m = re.match(r'bytes\s+0-0/(\d+)$', response.headers.get('Content-Range', ''))
+        if response.status_code != 206 or not m:
+            return None
+        return int(m.group(1))
+
+    def download_ranges(self, url, path, referrer=None, parts=None):
+        """
+        Download a file in several parts requested concurrently with Range
+        headers, each one being written at its place in the file.
+
+        The progress of every part is saved, so the download is resumed
+        where it stopped when it is started again. If the server does not
+        support Range requests or if the file is smaller than
+        :attr:`RANGE_MIN_SIZE`, it is downloaded at once with
+        :meth:`download_file`.
+
+        :param url: URL of the file
+        :type url: str
+        :param path: path of the file
+        :type path: str
+        :param parts: number of parts (None for the maximum number of
+                      concurrent downloads)
+        :type parts: int
+        :rtype: :class:`DownloadResult`
+        """
+        result = DownloadResult(url, path)
+        progress = DownloadProgress(path)
+        data = progress.load()
+        if data is not None and data.get('url') == url and os.path.isfile(path) \
+           and os.path.getsize(path) == data['size']:
+            self.logger.info('resuming download of %s', path)
+            result.resumed = True
+        else:
+            try:
+                size = self.get_range_size(url, referrer)
+            except Exception as e:
+                self.logger.warning('unable to download %s: %s', url, e)
+                result.error = e
+                with self.lock:
+                    self.errors += 1
+                return result
+
+            if size is None or size < self.RANGE_MIN_SIZE:
+                return self.download_file(url, path, referrer)
+            if os.path.isfile(path) and os.path.getsize(path) == size:
+                result.size = size
+                result.skipped = True
+                with self.lock:
+                    self.skipped += 1
+                return result
+
+            parts = parts or self.max_concurrent
+            step = (size + parts - 1) // parts
+            # [first byte, last byte, number of downloaded bytes]
+            ranges = [[start, min(start + step, size) - 1, 0] for start in xrange(0, size, step)]
+            data = progress.data = {'url': url, 'size': size, 'ranges': ranges}
+            with open(path, 'wb') as f:
+                f.truncate(size)
+            progress.save(force=True)
+
+        def submit(rng):
+            return self.browser.open(url, referrer=referrer, stream=True, is_async=True,
+                                     headers={'Range': 'bytes=%d-%d' % (rng[0] + rng[2], rng[1])},
+                                     callback=lambda response: self._write_range(response, path, rng, progress))
+
+        futures = [(rng, submit(rng)) for rng in data['ranges'] if rng[0] + rng[2] <= rng[1]]
+        try:
+            for rng, future in futures:
+                try:
+                    self._retry(future, lambda: submit(rng), url)
+                except Exception as e:
+                    if result.error is None:
+                        self.logger.warning('unable to download %s: %s', url, e)
+                        result.error = e
+                        with self.lock:
+                            self.errors += 1
+        finally:
+            for _, future in futures:
+                future.cancel()
+            with progress.lock:
+                result.size = sum(rng[2] for rng in data['ranges'])
+            if result.error is None and result.size == data['size']:
+                progress.remove()
+            else:
+                progress.save(force=True)
+
+        if result.error is None:
+            with self.lock:
+                self.files += 1
+        return result
+
+    def _write_range(self, response, path, rng, progress):
+        # Called in a thread of the browser session.
+        try:
+            if response.status_code != 206:
+                raise IOError('unexpected status %d for a Range request' % response.status_code)
+
+            with open(path, 'r+b') as f:
+                done = rng[2]
+                f.seek(rng[0] + done)
+                for chunk in response.iter_content(self.CHUNK_SIZE):
+                    chunk = chunk[:rng[1] + 1 - rng[0] - done]
+                    f.write(chunk)
+                    # The progress file, saved by any thread, must only count
+                    # bytes written to the file: the file has its full size
+                    # from the start, so unwritten ones would be zeros.
+                    f.flush()
+                    done += len(chunk)
+                    self._count(len(chunk))
+                    with progress.lock:
+                        rng[2] = done
+                    if rng[0] + done > rng[1]:
+                        break
+                    progress.save()
+        finally:
+            response.close()
+
+        if rng[0] + rng[2] <= rng[1]:
+            raise IOError('connection closed before the end of bytes %d-%d' % (rng[0], rng[1]))
@@ -25,7 +25,7 @@ from weboob.tools.log import getLogger, DEBUG_FILTERS
 from weboob.tools.ordereddict import OrderedDict
 from weboob.browser.pages import NextPage
 
-from .filters.standard import _Filter, CleanText
+from .filters.standard import _Filter, CleanText, filters_logger
 from .filters.html import AttributeNotFound, XPathNotFound
 
 
@@ -95,12 +95,19 @@ class AbstractElement(object):
     def xpath(self, *args, **kwargs):
         return self.el.xpath(*args, **kwargs)
 
+    @classmethod
+    def get_loaders_names(cls):
+        """
+        Get names of load_* attributes, computed once per class.
+        """
+        names = cls.__dict__.get('_loaders_names')
+        if names is None:
+            names = cls._loaders_names = [attrname for attrname in dir(cls) if attrname.startswith('load_')]
+        return names
+
     def handle_loaders(self):
-        for attrname in dir(self):
-            m = re.match('load_(.*)', attrname)
-            if not m:
-                continue
-            name = m.group(1)
+        for attrname in self.get_loaders_names():
+            name = attrname[len('load_'):]
             if name in self.loaders:
                 continue
             loader = getattr(self, attrname)
@@ -111,6 +118,10 @@ class ListElement(AbstractElement):
     item_xpath = None
     flush_at_end = False
     ignore_duplicate = False
+    # If True, items are built and yielded one after the other. Otherwise,
+    # every item is built (and its loaders are started) before the first
+    # object is yielded.
+    lazy = False
 
     def __init__(self, *args, **kwargs):
         super(ListElement, self).__init__(*args, **kwargs)
@@ -135,17 +146,39 @@ class ListElement(AbstractElement):
         else:
             yield self.el
 
+    @classmethod
+    def get_item_classes(cls):
+        """
+        Get the nested element classes used to handle each node, computed
+        once per class.
+        """
+        classes = cls.__dict__.get('_item_classes')
+        if classes is None:
+            classes = []
+            for attrname in dir(cls):
+                attr = getattr(cls, attrname)
+                if isinstance(attr, type) and issubclass(attr, AbstractElement) and attr != cls:
+                    classes.append(attr)
+            cls._item_classes = classes
+        return classes
+
+    def iter_items(self):
+        """
+        Build the elements for each node returned by :meth:`find_elements`.
+        """
+        classes = self.get_item_classes()
+        for el in self.find_elements():
+            for klass in classes:
+                item = klass(self.page, self, el)
+                item.handle_loaders()
+                yield item
+
     def __iter__(self):
         self.parse(self.el)
 
-        items = []
-        for el in self.find_elements():
-            for attrname in dir(self):
-                attr = getattr(self, attrname)
-                if isinstance(attr, type) and issubclass(attr, AbstractElement) and attr != type(self):
-                    item = attr(self.page, self, el)
-                    item.handle_loaders()
-                    items.append(item)
+        items = self.iter_items()
+        if not self.lazy:
+            items = list(items)
 
         for item in items:
             for obj in item:
@@ -224,6 +257,9 @@ class ItemElement(AbstractElement):
     klass = None
     condition = None
     validate = None
+    # If True, obj_* filters are compiled once per class into flat functions,
+    # used when the DEBUG_FILTERS log level is disabled.
+    compile_filters = False
 
     class Index(object):
         pass
@@ -254,8 +290,15 @@ class ItemElement(AbstractElement):
                 self.obj = self.build_object()
             self.parse(self.el)
             self.handle_loaders()
-            for attr in self._attrs:
-                self.handle_attr(attr, getattr(self, 'obj_%s' % attr))
+            if self.compile_filters and not filters_logger.isEnabledFor(DEBUG_FILTERS):
+                for attr, compiled in self.get_compiled_attrs():
+                    if compiled is None:
+                        self.handle_attr(attr, getattr(self, 'obj_%s' % attr))
+                    else:
+                        self.handle_compiled_attr(attr, compiled)
+            else:
+                for attr in self._attrs:
+                    self.handle_attr(attr, getattr(self, 'obj_%s' % attr))
         except SkipItem:
             return
 
@@ -264,6 +307,21 @@ class ItemElement(AbstractElement):
 
         yield self.obj
 
+    @classmethod
+    def get_compiled_attrs(cls):
+        """
+        Get the list of (name, function) of obj_* attributes, where function
+        is the compiled filter, or None if the attribute is not a filter.
+        """
+        compiled_attrs = cls.__dict__.get('_compiled_attrs')
+        if compiled_attrs is None:
+            compiled_attrs = []
+            for attr in cls._attrs:
+                func = getattr(cls, 'obj_%s' % attr)
+                compiled_attrs.append((attr, func.compile() if isinstance(func, _Filter) else None))
+            cls._compiled_attrs = compiled_attrs
+        return compiled_attrs
+
     def handle_attr(self, key, func):
         try:
             value = self.use_selector(func, key=key)
@@ -271,8 +329,17 @@ class ItemElement(AbstractElement):
             # Help debugging as tracebacks do not give us the key
             self.logger.warning('Attribute %s raises %s' % (key, repr(e)))
             raise
-        logger = getLogger('b2filters')
-        logger.log(DEBUG_FILTERS, "%s.%s = %r" % (self._random_id, key, value))
+        if filters_logger.isEnabledFor(DEBUG_FILTERS):
+            filters_logger.log(DEBUG_FILTERS, "%s.%s = %r" % (self._random_id, key, value))
+        setattr(self.obj, key, value)
+
+    def handle_compiled_attr(self, key, compiled):
+        try:
+            value = compiled(self)
+        except Exception as e:
+            # Help debugging as tracebacks do not give us the key
+            self.logger.warning('Attribute %s raises %s' % (key, repr(e)))
+            raise
         setattr(self.obj, key, value)
 
 
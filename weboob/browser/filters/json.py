@@ -18,6 +18,9 @@
 # along with weboob. If not, see <http://www.gnu.org/licenses/>.
 
 
+from weboob.tools.compat import basestring
+from weboob.tools.json import compile_path
+
 from .standard import _Filter, _NO_DEFAULT, Filter, ParseError
 
 __all__ = ['Dict']
@@ -51,8 +54,29 @@ class Dict(Filter):
 
     def __getitem__(self, name):
         self.selector.append(name)
+        self._path = None
         return self
 
+    def get_path(self):
+        """
+        Get the compiled path of the selector, or None if it contains
+        filters or callables.
+        """
+        if getattr(self, '_path', None) is None:
+            if all(isinstance(el, basestring) for el in self.selector):
+                self._path = compile_path(self.selector, wildcards=False)
+            else:
+                self._path = False
+        return self._path
+
+    def __call__(self, item):
+        path = self.get_path()
+        if not path:
+            return super(Dict, self).__call__(item)
+
+        content = item if isinstance(item, (dict, list)) else item.el
+        return self.filter(self.select_path(path, content))
+
     def filter(self, elements):
         if elements is not _NOT_FOUND:
             return elements
@@ -66,6 +90,9 @@ class Dict(Filter):
         else:
             content = item.el
 
+        if all(isinstance(el, basestring) for el in selector):
+            return cls.select_path(compile_path(selector, wildcards=False), content)
+
         for el in selector:
             if isinstance(content, list):
                 el = int(el)
@@ -82,3 +109,23 @@ class Dict(Filter):
                 return _NOT_FOUND
 
         return content
+
+    @staticmethod
+    def select_path(path, content):
+        """
+        Evaluate a compiled path made of keys and indexes.
+        """
+        return path.get(content, _NOT_FOUND)
+
+    def compile(self):
+        path = self.get_path()
+        if not path:
+            return self
+
+        function = self.get_filter_function()
+        select_path = self.select_path
+
+        def compiled(item):
+            content = item if isinstance(item, (dict, list)) else item.el
+            return function(self, select_path(path, content))
+        return compiled
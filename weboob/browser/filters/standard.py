@@ -27,6 +27,7 @@ from itertools import islice
 from collections import Iterator
 
 from dateutil.parser import parse as parse_date
+from lxml import etree
 
 from weboob.capabilities.base import empty
 from weboob.tools.compat import basestring
@@ -35,6 +36,9 @@ from weboob.browser.url import URL
 from weboob.tools.log import getLogger, DEBUG_FILTERS
 
 
+filters_logger = getLogger('b2filters')
+
+
 class NoDefault(object):
     def __repr__(self):
         return 'NO_DEFAULT'
@@ -95,20 +99,46 @@ class _Filter(object):
     def __str__(self):
         return self.__class__.__name__
 
+    def compile(self):
+        """
+        Get a function which takes an item and returns the same value than
+        calling this filter on it.
+
+        Children classes may return a flattened chain of functions, which
+        does not go through :meth:`Filter.select` and debug instrumentation
+        at each level. Values of :attr:`_obj` and :attr:`_key` are not set
+        by compiled functions, so they must only be used when debugging
+        filters is disabled.
+        """
+        return self
+
+
+def defined_in(obj, name):
+    """
+    Get the class which defines the attribute *name* of *obj*.
+    """
+    for klass in type(obj).__mro__:
+        if name in klass.__dict__:
+            return klass
+
 
 def debug(*args):
     """
     A decorator function to provide some debug information
     in Filters.
     It prints by default the name of the Filter and the input value.
+
+    Nothing is done when the DEBUG_FILTERS level is not enabled.
     """
     def wraper(function):
         def print_debug(self, value):
-            logger = getLogger('b2filters')
+            logger = filters_logger
+            if not logger.isEnabledFor(DEBUG_FILTERS):
+                return function(self, value)
+
             result = ''
             outputvalue = value
             if isinstance(value, list):
-                from lxml import etree
                 outputvalue = ''
                 first = True
                 for element in value:
@@ -136,6 +166,7 @@ def debug(*args):
             logger.log(DEBUG_FILTERS, result)
             res = function(self, value)
             return res
+        print_debug.undecorated = function
         return print_debug
     return wraper
 
@@ -174,6 +205,49 @@ class Filter(_Filter):
     def __call__(self, item):
         return self.filter(self.select(self.selector, item, key=self._key, obj=self._obj))
 
+    @classmethod
+    def compile_selector(cls, selector):
+        """
+        Get a function which takes an item and returns the same value than
+        :meth:`select`.
+        """
+        if isinstance(selector, basestring):
+            try:
+                xpath = etree.XPath(selector)
+            except etree.XPathSyntaxError:
+                return lambda item: item.xpath(selector)
+
+            def select_xpath(item):
+                if not etree.iselement(item):
+                    # It is an element of weboob.browser.elements
+                    item = item.el
+                return xpath(item)
+            return select_xpath
+        elif isinstance(selector, _Filter):
+            return selector.compile()
+        elif callable(selector):
+            return selector
+        else:
+            return lambda item: selector
+
+    def get_filter_function(self):
+        """
+        Get the :meth:`filter` function, without debug instrumentation.
+        """
+        function = defined_in(self, 'filter').__dict__['filter']
+        return getattr(function, 'undecorated', function)
+
+    def compile(self):
+        if defined_in(self, '__call__') is not Filter or defined_in(self, 'select') is not Filter:
+            return self
+
+        select = self.compile_selector(self.selector)
+        function = self.get_filter_function()
+
+        def compiled(item):
+            return function(self, select(item))
+        return compiled
+
     @debug()
     def filter(self, value):
         """
@@ -354,6 +428,8 @@ class CleanText(Filter):
     u'coucou\\ncoucou'
     """
 
+    SPACES_RE = re.compile(u'\s+', flags=re.UNICODE)
+
     def __init__(self, selector=None, symbols='', replace=[], children=True, newlines=True, normalize='NFC', **kwargs):
         super(CleanText, self).__init__(selector, **kwargs)
         self.symbols = symbols
@@ -382,7 +458,7 @@ class CleanText(Filter):
                 txt = [txt.text.strip()]
             txt = u' '.join(txt)  # 'foo   bar'
         if newlines:
-            txt = re.compile(u'\s+', flags=re.UNICODE).sub(u' ', txt)  # 'foo bar'
+            txt = cls.SPACES_RE.sub(u' ', txt)  # 'foo bar'
         else:
             # normalize newlines and clean what is inside
             txt = '\n'.join([cls.clean(l) for l in txt.splitlines()])
@@ -433,6 +509,8 @@ class CleanDecimal(CleanText):
     >>> CleanDecimal('./td[1]', replace_dots=(',', '.'))  # doctest: +SKIP
     """
 
+    NOT_DECIMAL_RE = re.compile(r'[^\d\-\.]')
+
     def __init__(self, selector=None, replace_dots=False, sign=None, default=_NO_DEFAULT):
         super(CleanDecimal, self).__init__(selector, default=default)
         self.replace_dots = replace_dots
@@ -454,7 +532,7 @@ class CleanDecimal(CleanText):
                 thousands_sep, decimal_sep = '.', ','
             text = text.replace(thousands_sep, '').replace(decimal_sep, '.')
         try:
-            v = Decimal(re.sub(r'[^\d\-\.]', '', text))
+            v = Decimal(self.NOT_DECIMAL_RE.sub('', text))
             if self.sign:
                 v *= self.sign(original_text)
             return v
@@ -694,6 +772,17 @@ class MultiFilter(Filter):
         values = [self.select(selector, item, obj=self._obj, key=self._key) for selector in self.selector]
         return self.filter(tuple(values))
 
+    def compile(self):
+        if defined_in(self, '__call__') is not MultiFilter or defined_in(self, 'select') is not Filter:
+            return self
+
+        selects = [self.compile_selector(selector) for selector in self.selector]
+        function = self.get_filter_function()
+
+        def compiled(item):
+            return function(self, tuple([select(item) for select in selects]))
+        return compiled
+
     def filter(self, values):
         raise NotImplementedError()
 
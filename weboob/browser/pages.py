@@ -22,6 +22,7 @@ from __future__ import absolute_import
 import warnings
 from io import BytesIO
 import codecs
+import re
 from cgi import parse_header
 import urlparse
 
@@ -33,6 +34,18 @@ from weboob.tools.compat import basestring
 from weboob.tools.log import getLogger
 
 
+# Encodings used by each page class, by encoding given by the HTTP headers.
+_ENCODINGS_CACHE = {}
+
+ENCODING_STATS = {'cached': 0, 'sniffed': 0, 'detected': 0, 'reparsed': 0}
+"""
+Number of pages which encoding has been taken from the cache, found by
+:meth:`Page.sniff_encoding`, checked by :meth:`Page.detect_encoding`, and
+which document has been built twice because :meth:`Page.detect_encoding`
+found an other encoding.
+"""
+
+
 def pagination(func):
     r"""
     This helper decorator can be used to handle pagination pages easily.
@@ -117,6 +130,13 @@ class Page(object):
     It is recommended to use None for autodetection.
     """
 
+    CACHE_ENCODING = True
+    """
+    Remember the encoding found for this class of page, and use it without
+    detection for the next pages with the same HTTP encoding. Set it to False
+    if pages of this class can declare different encodings.
+    """
+
     logged = False
     """
     If True, the page is in a restricted area of the website. Useful with
@@ -132,18 +152,34 @@ class Page(object):
 
         # Setup encoding and build document
         self.forced_encoding = encoding or self.ENCODING
+        cache_key = (self.__class__, self.response.encoding)
+        cached = None
         if self.forced_encoding:
             self.response.encoding = self.forced_encoding
+        elif self.CACHE_ENCODING and _ENCODINGS_CACHE.get(cache_key):
+            cached = self.response.encoding = _ENCODINGS_CACHE[cache_key]
+            ENCODING_STATS['cached'] += 1
+        else:
+            encoding = self.sniff_encoding()
+            if encoding:
+                self.response.encoding = encoding
+                ENCODING_STATS['sniffed'] += 1
         self.doc = self.build_doc(self.data)
 
         # Last chance to change encoding, according to :meth:`detect_encoding`,
         # which can be used to detect a document-level encoding declaration
-        if not self.forced_encoding:
+        if not self.forced_encoding and not cached:
+            ENCODING_STATS['detected'] += 1
             encoding = self.detect_encoding()
-            if encoding and encoding != self.encoding:
+            if encoding and encoding.lower() != (self.encoding or '').lower():
+                ENCODING_STATS['reparsed'] += 1
+                self.logger.debug('encoding %s detected after build of document, instead of %s', encoding, self.encoding)
                 self.response.encoding = encoding
                 self.doc = self.build_doc(self.data)
 
+            if self.CACHE_ENCODING and self.encoding:
+                _ENCODINGS_CACHE[cache_key] = self.encoding
+
     # Encoding issues are delegated to Response instance, implemented by
     # requests module.
 
@@ -196,6 +232,13 @@ class Page(object):
         """
         raise NotImplementedError()
 
+    def sniff_encoding(self):
+        """
+        Override this method to detect the encoding from the raw
+        :attr:`content`, before the document is built.
+        """
+        return None
+
     def detect_encoding(self):
         """
         Override this method to implement detection of document-level encoding
@@ -352,7 +395,30 @@ class CsvPage(Page):
     This means the rows will be also available as dictionaries.
     """
 
+    STREAM = False
+    """
+    If True, :attr:`doc` is an iterator which reads, decodes and parses rows
+    only when they are needed. Open the page with ``stream=True`` to also
+    avoid the download of the whole file before parsing.
+    """
+
+    STREAM_CHUNK_SIZE = 8192
+    """
+    Size of chunks read from the response in stream mode.
+    """
+
+    NEWLINES_RE = re.compile(u'\r\n|\r|\n')
+
+    @property
+    def data(self):
+        if self.STREAM:
+            return self.response.iter_content(self.STREAM_CHUNK_SIZE)
+        return self.content
+
     def build_doc(self, content):
+        if self.STREAM:
+            return self.iter_rows(self.iter_lines(content, self.encoding), 'utf-8')
+
         # We may need to temporarily convert content to utf-8 because csv
         # does not support Unicode.
         encoding = self.encoding
@@ -364,6 +430,40 @@ class CsvPage(Page):
             content = content.replace('\r\n', '\n').replace('\r', '\n')
         return self.parse(BytesIO(content), encoding)
 
+    def iter_lines(self, chunks, encoding):
+        """
+        Decode chunks of the file, and yield lines encoded in utf-8 because
+        csv does not support Unicode.
+
+        :param chunks: chunks of the file
+        :type chunks: iter
+        :param encoding: encoding of the file
+        :type encoding: :class:`str`
+        """
+        if encoding == 'utf-16le':
+            # If there is a BOM, the utf-16 decoder will get rid of it
+            encoding = 'utf-16'
+        decoder = codecs.getincrementaldecoder(encoding)()
+        newlines = self.NEWLINES_RE if self.NEWLINES_HACK else re.compile(u'\n')
+
+        buf = u''
+        for chunk in chunks:
+            buf += decoder.decode(chunk)
+            # A trailing \r may be the beginning of a \r\n.
+            end = len(buf) - 1 if buf.endswith(u'\r') else len(buf)
+            start = 0
+            for m in newlines.finditer(buf, 0, end):
+                yield (buf[start:m.start()] + u'\n').encode('utf-8')
+                start = m.end()
+            buf = buf[start:]
+
+        buf += decoder.decode(b'', True)
+        lines = newlines.split(buf)
+        if not lines[-1]:
+            lines.pop()
+        for line in lines:
+            yield (line + u'\n').encode('utf-8')
+
     def parse(self, data, encoding=None):
         """
         Method called by the constructor of :class:`CsvPage` to parse the document.
@@ -373,25 +473,34 @@ class CsvPage(Page):
         :param encoding: if given, use it to decode cell strings
         :type encoding: :class:`str`
         """
+        return list(self.iter_rows(data, encoding))
+
+    def iter_rows(self, data, encoding=None):
+        """
+        Parse rows of the document.
+
+        :param data: file stream or iterator on lines
+        :type data: :class:`BytesIO`
+        :param encoding: if given, use it to decode cell strings
+        :type encoding: :class:`str`
+        :returns: rows as lists, or as dictionaries if :attr:`HEADER` is set
+        """
         import csv
         reader = csv.reader(data, dialect=self.DIALECT, **self.FMTPARAMS)
         header = None
-        drows = []
-        rows = []
         for i, row in enumerate(reader):
             if self.HEADER and i+1 < self.HEADER:
                 continue
             row = map(unicode.strip, self.decode_row(row, encoding))
             if header is None and self.HEADER:
                 header = row
-            else:
-                rows.append(row)
-                if header:
-                    drow = {}
-                    for i, cell in enumerate(row):
-                        drow[header[i]] = cell
-                    drows.append(drow)
-        return drows if header is not None else rows
+            elif header is None:
+                yield row
+            elif header:
+                drow = {}
+                for i, cell in enumerate(row):
+                    drow[header[i]] = cell
+                yield drow
 
     def decode_row(self, row, encoding):
         """
@@ -412,17 +521,23 @@ class JsonPage(Page):
     def data(self):
         return self.response.text
 
-    def get(self, path):
-        node = self.doc
-        for name in filter(None, path.strip('.').split('.')):
-            node = node.get(name)
-            if node is None:
-                break
-        return node
+    def get(self, path, default=None):
+        """
+        Get the value at a dot separated path of keys and indexes.
+
+        See :class:`weboob.tools.json.JsonPath` for the path syntax.
+        """
+        from weboob.tools.json import compile_path
+        return compile_path(path.strip('.'), wildcards=False).get(self.doc, default)
 
     def path(self, path, context=None):
-        from weboob.tools.json import mini_jsonpath
-        return mini_jsonpath(context or self.doc, path)
+        """
+        Iterate on values matching a dot separated path.
+
+        See :class:`weboob.tools.json.JsonPath` for the path syntax.
+        """
+        from weboob.tools.json import compile_path
+        return compile_path(path).iter(context or self.doc)
 
     def build_doc(self, text):
         from weboob.tools.json import json
@@ -483,6 +598,16 @@ class HTMLPage(Page):
     Default value is None, means refreshes aren't handled.
     """
 
+    SNIFF_SIZE = 4096
+    """
+    Number of bytes read by :meth:`sniff_encoding` to find the encoding.
+    """
+
+    BOMS = ((codecs.BOM_UTF8, 'utf-8'),
+            (codecs.BOM_UTF16_LE, 'utf-16'),
+            (codecs.BOM_UTF16_BE, 'utf-16'))
+    META_CHARSET_RE = re.compile(br'<meta\s[^>]*?charset\s*=\s*["\']?\s*([-\w.:]+)', re.IGNORECASE)
+
     def __init__(self, *args, **kwargs):
         import lxml.html as html
         ns = html.etree.FunctionNamespace(None)
@@ -560,6 +685,24 @@ class HTMLPage(Page):
         parser = html.HTMLParser(encoding=self.encoding)
         return html.parse(BytesIO(content), parser)
 
+    def sniff_encoding(self):
+        """
+        Look for a BOM or a meta node declaring the encoding in the first
+        :attr:`SNIFF_SIZE` bytes of the content.
+        """
+        head = self.data[:self.SNIFF_SIZE]
+        if not isinstance(head, bytes):
+            return None
+
+        for bom, encoding in self.BOMS:
+            if head.startswith(bom):
+                return encoding
+
+        matches = self.META_CHARSET_RE.findall(head)
+        if not matches:
+            return None
+        return self.normalize_encoding(matches[-1].decode('ascii').lower())
+
     def detect_encoding(self):
         """
         Look for encoding in the document "http-equiv" and "charset" meta nodes.
@@ -569,12 +712,18 @@ class HTMLPage(Page):
             # meta http-equiv=content-type content=...
             _, params = parse_header(content)
             if 'charset' in params:
-                encoding = params['charset'].strip("'\"")
+                encoding = params['charset'].strip("'\"").lower()
 
         for charset in self.doc.xpath('//head/meta[@charset]/@charset'):
             # meta charset=...
             encoding = charset.lower()
 
+        return self.normalize_encoding(encoding)
+
+    def normalize_encoding(self, encoding):
+        """
+        Replace latin-1 and unknown encodings by windows-1252, as browsers do.
+        """
         if encoding == 'iso-8859-1' or not encoding:
             encoding = 'windows-1252'
         try:
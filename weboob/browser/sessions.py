@@ -20,11 +20,17 @@
 # Inspired by: https://github.com/ross/requests-futures/blob/master/requests_futures/sessions.py
 # XXX Licence issues?
 
+from threading import Lock
+
 try:
     from concurrent.futures import ThreadPoolExecutor
 except ImportError:
     ThreadPoolExecutor = None
 
+try:
+    from requests.packages.urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+except ImportError:
+    from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
 from requests import Session
 from requests.adapters import DEFAULT_POOLSIZE, HTTPAdapter
 from requests.compat import cookielib, OrderedDict
@@ -114,6 +120,8 @@ class FuturesSession(WeboobSession):
           ignored and provided executor is used as is.
         """
         super(FuturesSession, self).__init__(*args, **kwargs)
+        # only shutdown the executor on close() if we created it
+        self.own_executor = executor is None
         if executor is None and ThreadPoolExecutor is not None:
             executor = ThreadPoolExecutor(max_workers=max_workers)
             # set connection pool size equal to max_workers if needed
@@ -160,5 +168,131 @@ class FuturesSession(WeboobSession):
 
     def close(self):
         super(FuturesSession, self).close()
+        if self.executor and self.own_executor:
+            self.executor.shutdown()
+
+
+class CountingPoolMixin(object):
+    """
+    Connection pool which reports to a :class:`SharedTransport` if a request
+    reused a kept-alive connection (hit) or had to open a new one (miss).
+    """
+
+    transport = None
+
+    def _make_request(self, conn, *args, **kwargs):
+        self.transport.record(self.host, getattr(conn, 'sock', None) is not None)
+        return super(CountingPoolMixin, self)._make_request(conn, *args, **kwargs)
+
+
+class SharedHTTPAdapter(HTTPAdapter):
+    """
+    HTTP adapter mounted on several sessions.
+
+    Closing a session does not close it, as other sessions may still use its
+    connections: see :meth:`SharedTransport.close`.
+    """
+
+    def __init__(self, transport, *args, **kwargs):
+        self.transport = transport
+        super(SharedHTTPAdapter, self).__init__(*args, **kwargs)
+
+    def init_poolmanager(self, *args, **kwargs):
+        super(SharedHTTPAdapter, self).init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = self.transport.pool_classes
+
+    def close(self):
+        pass
+
+    def shutdown(self):
+        super(SharedHTTPAdapter, self).close()
+
+
+class SharedTransport(object):
+    """
+    Process-wide HTTP transport shared by browsers.
+
+    Kept-alive connections pools (one per host) and the executor used for
+    asynchronous requests are shared by every session mounted on this
+    transport, while each browser keeps its own cookie jar.
+
+    :param max_workers: number of threads for asynchronous requests
+    :type max_workers: int
+    :param pool_maxsize: maximum number of kept-alive connections per host
+    :type pool_maxsize: int
+    """
+
+    _default = None
+    _default_lock = Lock()
+
+    def __init__(self, max_workers=10, pool_maxsize=10):
+        self.pool_maxsize = max(pool_maxsize, DEFAULT_POOLSIZE)
+        self.executor = ThreadPoolExecutor(max_workers=max_workers) if ThreadPoolExecutor is not None else None
+        self.pool_classes = {
+            'http': type('HTTPConnectionPool', (CountingPoolMixin, HTTPConnectionPool), {'transport': self}),
+            'https': type('HTTPSConnectionPool', (CountingPoolMixin, HTTPSConnectionPool), {'transport': self}),
+        }
+        self.adapters = {}
+        self.stats = {}
+        self.lock = Lock()
+
+    @classmethod
+    def get_default(cls):
+        """
+        Get the process-wide transport, created on first call.
+        """
+        with cls._default_lock:
+            if cls._default is None:
+                cls._default = cls()
+            return cls._default
+
+    def get_adapter(self, max_retries):
+        """
+        Get the adapter to mount on sessions.
+
+        Adapters (and so their connections pools) are shared between sessions
+        with the same retries policy.
+        """
+        with self.lock:
+            if max_retries not in self.adapters:
+                self.adapters[max_retries] = SharedHTTPAdapter(self,
+                                                               pool_connections=self.pool_maxsize,
+                                                               pool_maxsize=self.pool_maxsize,
+                                                               max_retries=max_retries)
+            return self.adapters[max_retries]
+
+    def mount(self, session, max_retries=2):
+        """
+        Make a session use shared connections pools.
+        """
+        adapter = self.get_adapter(max_retries)
+        session.mount('https://', adapter)
+        session.mount('http://', adapter)
+
+    def record(self, host, hit):
+        with self.lock:
+            stats = self.stats.setdefault(host, [0, 0])
+            stats[0 if hit else 1] += 1
+
+    def get_stats(self):
+        """
+        Get statistics on connections reuse.
+
+        :returns: for each host, number of requests which reused a kept-alive
+                  connection (hits) and which opened a new one (misses)
+        :rtype: dict[:class:`str`, dict]
+        """
+        with self.lock:
+            return dict((host, {'hits': hits, 'misses': misses})
+                        for host, (hits, misses) in self.stats.items())
+
+    def close(self):
+        """
+        Close every connection and stop the executor.
+        """
+        with self.lock:
+            for adapter in self.adapters.values():
+                adapter.shutdown()
+            self.adapters.clear()
         if self.executor:
             self.executor.shutdown()
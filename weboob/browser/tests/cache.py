@@ -0,0 +1,117 @@
+# -*- coding: utf-8 -*-
+
+# Copyright(C) 2016 weboob project
+#
+# This file is part of weboob.
+#
+# weboob is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# weboob is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with weboob. If not, see <http://www.gnu.org/licenses/>.
+
+import os
+import shutil
+import tempfile
+from BaseHTTPServer import BaseHTTPRequestHandler, HTTPServer
+from threading import Thread
+from unittest import TestCase
+
+from weboob.browser import PagesBrowser, URL
+from weboob.browser.cache import HTTPCache
+from weboob.browser.pages import RawPage
+
+
+class Handler(BaseHTTPRequestHandler):
+    requests = []
+
+    def do_GET(self):
+        self.requests.append((self.path, self.headers.get('If-None-Match')))
+        if self.path == '/etag':
+            if self.headers.get('If-None-Match') == '"v1"':
+                self.send_response(304)
+                self.end_headers()
+                return
+            headers = {'ETag': '"v1"'}
+        elif self.path == '/fresh':
+            headers = {'Cache-Control': 'max-age=3600'}
+        else:
+            headers = {'Cache-Control': 'no-store', 'ETag': '"v1"'}
+
+        body = 'content of %s' % self.path
+        self.send_response(200)
+        for name, value in headers.iteritems():
+            self.send_header(name, value)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class CacheTest(TestCase):
+    def setUp(self):
+        self.server = HTTPServer(('127.0.0.1', 0), Handler)
+        Thread(target=self.server.serve_forever).start()
+        Handler.requests = []
+
+        self.tmpdir = tempfile.mkdtemp()
+        self.cache = HTTPCache(os.path.join(self.tmpdir, 'http.sqlite'))
+
+        class Browser(PagesBrowser):
+            BASEURL = 'http://127.0.0.1:%d' % self.server.server_port
+
+            etag = URL('/etag', RawPage, cache=True)
+            fresh = URL('/fresh', cache=True)
+            nostore = URL('/nostore', RawPage, cache=True)
+            other = URL('/other', RawPage)
+
+        self.browser = Browser()
+        self.browser.http_cache = self.cache
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+        shutil.rmtree(self.tmpdir)
+
+    def test_revalidate(self):
+        self.assertEqual(self.browser.etag.go().doc, 'content of /etag')
+        self.assertEqual(self.browser.etag.go().doc, 'content of /etag')
+        self.assertEqual(Handler.requests, [('/etag', None), ('/etag', '"v1"')])
+        self.assertEqual(self.browser.response.status_code, 200)
+        self.assertEqual(self.cache.get_stats(), {'hits': 1, 'misses': 1, 'revalidated': 1,
+                                                  'bytes_saved': len('content of /etag')})
+
+    def test_fresh(self):
+        self.assertEqual(self.browser.fresh.open().content, 'content of /fresh')
+        self.assertEqual(self.browser.open('/fresh').content, 'content of /fresh')
+        self.assertEqual(self.browser.async_open('/fresh').result().content, 'content of /fresh')
+        self.assertEqual(len(Handler.requests), 1)
+
+    def test_not_cached(self):
+        self.browser.nostore.go()
+        self.browser.nostore.go()
+        self.browser.other.go()
+        self.browser.other.go()
+        self.assertEqual(Handler.requests, [('/nostore', None)] * 2 + [('/other', None)] * 2)
+
+    def test_namespace(self):
+        self.browser.fresh.open()
+        self.browser.cache_namespace = 'other'
+        self.browser.fresh.open()
+        self.assertEqual(len(Handler.requests), 2)
+
+    def test_eviction(self):
+        self.cache.max_size = len('content of /fresh') + 1
+        self.browser.fresh.open()
+        self.browser.etag.go()
+        self.browser.fresh.open()
+        self.assertEqual(len(Handler.requests), 3)
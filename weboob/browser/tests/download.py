@@ -0,0 +1,195 @@
+# -*- coding: utf-8 -*-
+
+# Copyright(C) 2016 weboob project
+#
+# This file is part of weboob.
+#
+# weboob is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# weboob is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with weboob. If not, see <http://www.gnu.org/licenses/>.
+
+import os
+import re
+import shutil
+import tempfile
+from BaseHTTPServer import BaseHTTPRequestHandler, HTTPServer
+from SocketServer import ThreadingMixIn
+from threading import Thread
+from unittest import TestCase
+
+from weboob.browser.download import Downloader
+from weboob.tools.json import json
+
+
+class Handler(BaseHTTPRequestHandler):
+    requests = []
+    failures = set()
+
+    BIG = ''.join('%06d\n' % i for i in range(10000))
+
+    def do_GET(self):
+        self.requests.append((self.path, self.headers.get('Range')))
+        if self.path == '/missing':
+            self.send_error(404)
+            return
+        if self.path in self.failures:
+            self.failures.remove(self.path)
+            self.send_error(500)
+            return
+
+        if self.path == '/big':
+            m = re.match(r'bytes=(\d+)-(\d+)$', self.headers.get('Range', ''))
+            if m:
+                start, end = int(m.group(1)), int(m.group(2))
+                body = self.BIG[start:end + 1]
+                self.send_response(206)
+                self.send_header('Content-Range', 'bytes %d-%d/%d' % (start, end, len(self.BIG)))
+            else:
+                body = self.BIG
+                self.send_response(200)
+        else:
+            body = 'content of %s\n' % self.path * 1000
+            self.send_response(200)
+
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class Server(ThreadingMixIn, HTTPServer):
+    daemon_threads = True
+
+
+class DownloaderTest(TestCase):
+    def setUp(self):
+        self.server = Server(('127.0.0.1', 0), Handler)
+        thread = Thread(target=self.server.serve_forever)
+        thread.daemon = True
+        thread.start()
+        Handler.requests = []
+        Handler.failures = set()
+
+        self.baseurl = 'http://127.0.0.1:%d' % self.server.server_port
+        self.tmpdir = tempfile.mkdtemp()
+        self.downloader = Downloader(max_concurrent=3)
+        self.downloader.CHUNK_SIZE = 1000
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+        shutil.rmtree(self.tmpdir)
+
+    def jobs(self, names):
+        for name in names:
+            yield self.baseurl + '/' + name, os.path.join(self.tmpdir, name)
+
+    def test_download(self):
+        names = ['%03d.jpg' % i for i in range(10)]
+        results = list(self.downloader.download(self.jobs(names)))
+        self.assertEqual([os.path.basename(result.path) for result in results], names)
+        for result in results:
+            with open(result.path, 'rb') as f:
+                self.assertEqual(f.read(), 'content of /%s\n' % os.path.basename(result.path) * 1000)
+        self.assertEqual(self.downloader.files, 10)
+        self.assertEqual(self.downloader.bytes, sum(result.size for result in results))
+        self.assertEqual(sorted(os.listdir(self.tmpdir)), names)
+
+    def test_resume(self):
+        list(self.downloader.download(self.jobs(['a', 'b'])))
+        with open(os.path.join(self.tmpdir, 'b'), 'wb') as f:
+            f.write('truncated')
+
+        self.downloader.reset_stats()
+        results = list(self.downloader.download(self.jobs(['a', 'b'])))
+        self.assertEqual([result.skipped for result in results], [True, False])
+        self.assertEqual(self.downloader.skipped, 1)
+        self.assertEqual(self.downloader.bytes, results[1].size)
+        with open(os.path.join(self.tmpdir, 'b'), 'rb') as f:
+            self.assertEqual(f.read(), 'content of /b\n' * 1000)
+
+    def test_error(self):
+        results = list(self.downloader.download(self.jobs(['missing', 'a'])))
+        self.assertIsNotNone(results[0].error)
+        self.assertIsNone(results[1].error)
+        self.assertEqual(self.downloader.errors, 1)
+        self.assertEqual(sorted(os.listdir(self.tmpdir)), ['a'])
+
+    def test_segments(self):
+        urls = ['%s/seg/%d' % (self.baseurl, i) for i in range(10)]
+        path = os.path.join(self.tmpdir, 'video.mp4')
+        Handler.failures.add('/seg/3')
+
+        result = self.downloader.download_segments(urls, path, url='playlist')
+        self.assertIsNone(result.error)
+        with open(path, 'rb') as f:
+            self.assertEqual(f.read(), ''.join('content of /seg/%d\n' % i * 1000 for i in range(10)))
+        self.assertEqual(len(Handler.requests), 11)
+        self.assertEqual(os.listdir(self.tmpdir), ['video.mp4'])
+
+    def test_segments_resume(self):
+        urls = ['%s/seg/%d' % (self.baseurl, i) for i in range(10)]
+        path = os.path.join(self.tmpdir, 'video.mp4')
+        Handler.failures.add('/seg/6')
+        self.downloader.RETRIES = 0
+
+        result = self.downloader.download_segments(urls, path, url='playlist')
+        self.assertIsNotNone(result.error)
+        self.assertTrue(os.path.exists(path + '.progress'))
+
+        Handler.requests = []
+        result = self.downloader.download_segments(urls, path, url='playlist')
+        self.assertIsNone(result.error)
+        self.assertTrue(result.resumed)
+        self.assertEqual(sorted(Handler.requests), [('/seg/%d' % i, None) for i in range(6, 10)])
+        with open(path, 'rb') as f:
+            self.assertEqual(f.read(), ''.join('content of /seg/%d\n' % i * 1000 for i in range(10)))
+        self.assertFalse(os.path.exists(path + '.progress'))
+
+    def test_ranges(self):
+        self.downloader.RANGE_MIN_SIZE = 1000
+        path = os.path.join(self.tmpdir, 'big')
+
+        result = self.downloader.download_ranges(self.baseurl + '/big', path)
+        self.assertIsNone(result.error)
+        with open(path, 'rb') as f:
+            self.assertEqual(f.read(), Handler.BIG)
+        self.assertEqual(sorted(Handler.requests)[1:], [('/big', 'bytes=0-23333'), ('/big', 'bytes=23334-46667'),
+                                                        ('/big', 'bytes=46668-69999')])
+        self.assertEqual(os.listdir(self.tmpdir), ['big'])
+
+        # complete files are not downloaded again
+        Handler.requests = []
+        self.assertTrue(self.downloader.download_ranges(self.baseurl + '/big', path).skipped)
+        self.assertEqual(len(Handler.requests), 1)
+
+    def test_ranges_resume(self):
+        path = os.path.join(self.tmpdir, 'big')
+        with open(path, 'wb') as f:
+            f.write(Handler.BIG[:100] + '\0' * (len(Handler.BIG) - 100))
+        with open(path + '.progress', 'wb') as f:
+            json.dump({'url': self.baseurl + '/big', 'size': len(Handler.BIG),
+                       'ranges': [[0, 34999, 100], [35000, 69999, 0]]}, f)
+
+        result = self.downloader.download_ranges(self.baseurl + '/big', path)
+        self.assertTrue(result.resumed)
+        self.assertEqual(sorted(Handler.requests), [('/big', 'bytes=100-34999'), ('/big', 'bytes=35000-69999')])
+        with open(path, 'rb') as f:
+            self.assertEqual(f.read(), Handler.BIG)
+
+    def test_no_ranges(self):
+        path = os.path.join(self.tmpdir, 'file')
+        result = self.downloader.download_ranges(self.baseurl + '/file', path)
+        self.assertIsNone(result.error)
+        self.assertEqual(result.size, len('content of /file\n' * 1000))
@@ -18,7 +18,7 @@
 from unittest import TestCase
 from lxml.html import fromstring
 
-from weboob.browser.filters.standard import RawText
+from weboob.browser.filters.standard import RawText, CleanText, CleanDecimal, Format, Env
 
 
 class RawTextTest(TestCase):
@@ -48,3 +48,18 @@ class RawTextTest(TestCase):
     def test_first_node_is_element_recursive(self):
         e = fromstring('<html><body><p><span>229,90</span> EUR</p></body></html>')
         self.assertEqual("229,90 EUR", RawText('//p', default="foo", children=True)(e))
+
+
+class CompileTest(TestCase):
+    # A compiled filter returns the same value than the filter
+    def test_compiled_chain(self):
+        e = fromstring('<html><body><p>blah: <span>229,90</span></p><div> a  b </div></body></html>')
+        for f in (CleanDecimal(CleanText('//p/span'), replace_dots=True),
+                  Format('%s-%s', CleanText('//div'), CleanText('//p')),
+                  CleanText('//p', default='foo', symbols=':')):
+            self.assertEqual(f(e), f.compile()(e))
+
+    # Filters with a specific __call__ are not flattened
+    def test_not_compiled(self):
+        f = Env('foo')
+        self.assertIs(f.compile(), f)
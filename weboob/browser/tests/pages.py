@@ -0,0 +1,134 @@
+# -*- coding: utf-8 -*-
+
+# Copyright(C) 2016 weboob project
+#
+# This file is part of weboob.
+#
+# weboob is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# weboob is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with weboob. If not, see <http://www.gnu.org/licenses/>.
+
+from io import BytesIO
+from unittest import TestCase
+
+from requests import Response
+
+from weboob.browser import pages
+from weboob.browser.pages import CsvPage, HTMLPage
+from weboob.tools.log import getLogger
+
+
+class MockBrowser(object):
+    logger = getLogger('browser')
+
+
+def make_response(content, encoding='ISO-8859-1', stream=False):
+    response = Response()
+    if stream:
+        response.raw = BytesIO(content)
+    else:
+        response._content = content
+        response._content_consumed = True
+    response.encoding = encoding
+    response.url = 'http://example.org/'
+    return response
+
+
+class EncodingTest(TestCase):
+    def setUp(self):
+        class Page(HTMLPage):
+            pass
+
+        class UncachedPage(HTMLPage):
+            CACHE_ENCODING = False
+
+        self.Page = Page
+        self.UncachedPage = UncachedPage
+        self.stats = dict(pages.ENCODING_STATS)
+
+    def count(self, key):
+        return pages.ENCODING_STATS[key] - self.stats[key]
+
+    def test_meta_charset(self):
+        page = self.Page(MockBrowser(), make_response(b'<html><head><meta charset="UTF-8"></head>'
+                                                      b'<body>\xc3\xa9t\xc3\xa9</body></html>'))
+        self.assertEqual(page.encoding, 'utf-8')
+        self.assertEqual(page.doc.xpath('//body')[0].text, u'été')
+        self.assertEqual(self.count('sniffed'), 1)
+        self.assertEqual(self.count('reparsed'), 0)
+
+    def test_http_equiv(self):
+        page = self.UncachedPage(MockBrowser(), make_response(
+            b'<html><head><meta http-equiv="Content-Type" content="text/html; charset=ISO-8859-1"></head>'
+            b'<body>\x80</body></html>'))
+        self.assertEqual(page.encoding, 'windows-1252')
+        self.assertEqual(page.doc.xpath('//body')[0].text, u'€')
+        self.assertEqual(self.count('reparsed'), 0)
+
+    def test_bom(self):
+        page = self.UncachedPage(MockBrowser(), make_response(b'\xef\xbb\xbf<html><body>\xc3\xa9</body></html>'))
+        self.assertEqual(page.encoding, 'utf-8')
+        self.assertEqual(page.doc.xpath('//body')[0].text, u'é')
+
+    def test_reparse(self):
+        # declaration after SNIFF_SIZE bytes
+        content = b'<html><head><script>' + b'x' * HTMLPage.SNIFF_SIZE + b'</script><meta charset="utf-8"></head>' \
+                  b'<body>\xc3\xa9</body></html>'
+        page = self.UncachedPage(MockBrowser(), make_response(content))
+        self.assertEqual(page.encoding, 'utf-8')
+        self.assertEqual(page.doc.xpath('//body')[0].text, u'é')
+        self.assertEqual(self.count('reparsed'), 1)
+
+    def test_cache(self):
+        content = b'<html><head><meta charset="utf-8"></head><body>\xc3\xa9</body></html>'
+        self.Page(MockBrowser(), make_response(content))
+        page = self.Page(MockBrowser(), make_response(content))
+        self.assertEqual(page.encoding, 'utf-8')
+        self.assertEqual(self.count('sniffed'), 1)
+        self.assertEqual(self.count('cached'), 1)
+
+        # an other HTTP encoding is not in cache
+        page = self.Page(MockBrowser(), make_response(content, 'utf-16'))
+        self.assertEqual(self.count('sniffed'), 2)
+
+
+class CsvTest(TestCase):
+    CONTENT = b'date;label;amount\r\n01/02/2016;"CB \xc3\xa9t\xc3\xa9\r\nLINE";-10\r02/02/2016; VIR ;20\n'
+
+    def setUp(self):
+        class Page(CsvPage):
+            FMTPARAMS = {'delimiter': ';'}
+            HEADER = 1
+
+        class StreamPage(Page):
+            STREAM = True
+            STREAM_CHUNK_SIZE = 3
+
+        self.Page = Page
+        self.StreamPage = StreamPage
+
+    def test_stream(self):
+        expected = self.Page(MockBrowser(), make_response(self.CONTENT)).doc
+        page = self.StreamPage(MockBrowser(), make_response(self.CONTENT, stream=True))
+        self.assertFalse(isinstance(page.doc, list))
+        self.assertEqual(list(page.doc), expected)
+        self.assertEqual(expected[0]['label'], u'CB été\nLINE')
+        self.assertEqual(expected[1]['label'], u'VIR')
+
+    def test_stream_utf16(self):
+        content = u'\ufeffa,b\r\n1,2\r\n'.encode('utf-16le')
+        class Utf16Page(self.StreamPage):
+            FMTPARAMS = {}
+            ENCODING = 'utf-16le'
+
+        page = Utf16Page(MockBrowser(), make_response(content, stream=True))
+        self.assertEqual(list(page.doc), [{u'a': u'1', u'b': u'2'}])
@@ -127,3 +127,23 @@ class URLTest(TestCase):
         self.assertRaisesRegexp(AssertionError, "You can use this method" +
                                 " only if there is a Page class handler.",
                                 self.myBrowser.urlRegex.is_here, id=2)
+
+    # Check that only URLs which can match are candidates to handle a page
+    def test_url_candidates(self):
+        self.assertEquals(self.myBrowser.get_url_candidates("http://weboob.org/news"),
+                          [self.myBrowser.urlIsHere])
+        self.assertEquals(self.myBrowser.get_url_candidates("http://free.fr/"),
+                          [self.myBrowser.urlIsHereDifKlass])
+        self.assertEquals(self.myBrowser.get_url_candidates("http://test.org"), [])
+
+    # Check that the index follows changes of BASEURL
+    def test_url_candidates_baseurl(self):
+        class MyBrowser(PagesBrowser):
+            BASEURL = "http://weboob.org"
+            news = URL("news", MyMockPage)
+
+        browser = MyBrowser()
+        self.assertEquals(browser.get_url_candidates("http://weboob.org/news"), [browser.news])
+        browser.BASEURL = "http://weboob2.org"
+        self.assertEquals(browser.get_url_candidates("http://weboob.org/news"), [])
+        self.assertEquals(browser.get_url_candidates("http://weboob2.org/news"), [browser.news])
@@ -27,6 +27,97 @@ import requests
 from weboob.tools.regex_helper import normalize
 
 
+# Compiled regexps and normalized patterns are cached here rather than on URL
+# instances, as those are copied for every browser.
+_REGEX_CACHE = {}
+_PATTERNS_CACHE = {}
+
+ABSOLUTE_URL_RE = re.compile(r'^\w+://.*')
+
+
+def compile_url_regex(regex, base):
+    """
+    Get the compiled regexp of an URL pattern, relative to *base* if it is
+    not an absolute URL.
+    """
+    if ABSOLUTE_URL_RE.match(regex):
+        base = None
+    key = (regex, base)
+    try:
+        return _REGEX_CACHE[key]
+    except KeyError:
+        pass
+
+    full_regex = regex
+    if base is not None:
+        full_regex = re.escape(base).rstrip('/') + '/' + regex.lstrip('/')
+    compiled = _REGEX_CACHE[key] = re.compile(full_regex)
+    return compiled
+
+
+def literal_prefix(regex):
+    """
+    Get the literal string which starts every string matched by a regexp.
+
+    >>> literal_prefix(r'https?://example\.org/(?P<id>\d+)')
+    'http'
+    >>> literal_prefix(r'http://example\.org/list\.html')
+    'http://example.org/list.html'
+    >>> literal_prefix(r'http://example\.org/(index|home)')
+    'http://example.org/'
+    >>> literal_prefix(r'http://example\.org/a|http://example\.org/b')
+    ''
+    """
+    # Look for constructions which break the prefix assumption: top-level
+    # alternatives and inline flags.
+    depth = 0
+    i = 0
+    in_class = False
+    while i < len(regex):
+        c = regex[i]
+        if c == '\\':
+            i += 1
+        elif in_class:
+            in_class = c != ']'
+        elif c == '[':
+            in_class = True
+        elif c == '(':
+            if regex[i+1:i+2] == '?' and regex[i+2:i+3] in tuple('iLmsux'):
+                return ''
+            depth += 1
+        elif c == ')':
+            depth -= 1
+        elif c == '|' and depth == 0:
+            return ''
+        i += 1
+
+    if regex.startswith('^'):
+        regex = regex[1:]
+
+    prefix = []
+    i = 0
+    while i < len(regex):
+        c = regex[i]
+        if c == '\\':
+            if i + 1 >= len(regex) or regex[i+1].isalnum():
+                break
+            literal = regex[i+1]
+            i += 2
+        elif c in '.^$*+?{}[]()|':
+            break
+        else:
+            literal = c
+            i += 1
+
+        if regex[i:i+1] and regex[i] in '*?{':
+            # The character may be absent.
+            break
+        prefix.append(literal)
+        if regex[i:i+1] == '+':
+            break
+    return ''.join(prefix)
+
+
 class UrlNotResolvable(Exception):
     """
     Raised when trying to locate on an URL instance which url pattern is not resolvable as a real url.
@@ -39,13 +130,19 @@ class URL(object):
 
     It takes one or several regexps to match urls, and an optional Page
     class which is instancied by PagesBrowser.open if the page matches a regex.
+
+    With the ``cache=True`` keyword argument, GET requests opened by
+    PagesBrowser on matching urls use the HTTP cache (see
+    :class:`weboob.browser.cache.HTTPCache`).
     """
     _creation_counter = 0
 
-    def __init__(self, *args):
+    def __init__(self, *args, **kwargs):
         self.urls = []
         self.klass = None
         self.browser = None
+        self.cache = kwargs.pop('cache', False)
+        assert not kwargs, 'Unexpected arguments: %s' % ', '.join(kwargs)
         for arg in args:
             if isinstance(arg, basestring):
                 self.urls.append(arg)
@@ -125,9 +222,7 @@ class URL(object):
         """
         browser = kwargs.pop('browser', self.browser)
         params = kwargs.pop('params', None)
-        patterns = []
-        for url in self.urls:
-            patterns += normalize(url)
+        patterns = self.get_patterns()
 
         for pattern, _ in patterns:
             url = pattern
@@ -152,6 +247,31 @@ class URL(object):
 
         raise UrlNotResolvable('Unable to resolve URL with %r. Available are %s' % (kwargs, ', '.join([pattern for pattern, _ in patterns])))
 
+    def get_patterns(self):
+        """
+        Get the normalized patterns used to build urls.
+
+        :rtype: list[(:class:`str`, list)]
+        """
+        patterns = []
+        for url in self.urls:
+            try:
+                patterns += _PATTERNS_CACHE[url]
+            except KeyError:
+                _PATTERNS_CACHE[url] = normalize(url)
+                patterns += _PATTERNS_CACHE[url]
+        return patterns
+
+    def get_prefixes(self, base):
+        """
+        Get the literal prefixes of urls matched by this object.
+
+        An url can only be matched if it starts with one of them.
+
+        :rtype: set[:class:`str`]
+        """
+        return set(literal_prefix(compile_url_regex(regex, base).pattern) for regex in self.urls)
+
     def match(self, url, base=None):
         """
         Check if the given url match this object.
@@ -161,9 +281,7 @@ class URL(object):
             base = self.browser.BASEURL
 
         for regex in self.urls:
-            if not re.match(r'^\w+://.*', regex):
-                regex = re.escape(base).rstrip('/') + '/' + regex.lstrip('/')
-            m = re.match(regex, url)
+            m = compile_url_regex(regex, base).match(url)
             if m:
                 return m
 
@@ -20,6 +20,8 @@
 
 import warnings
 import re
+import datetime
+from collections import deque
 from decimal import Decimal
 from copy import deepcopy, copy
 
@@ -206,6 +208,7 @@ class Field(object):
 
         self._creation_counter = Field._creation_counter
         Field._creation_counter += 1
+        self._actual_types = None
 
     def convert(self, value):
         """
@@ -213,6 +216,54 @@ class Field(object):
         """
         return value
 
+    def get_types(self, refresh=False):
+        """
+        Get the tuple of accepted types, where types given by name are
+        resolved to classes.
+
+        The result is cached, as resolving names walks the whole classes tree.
+
+        :param refresh: resolve names again, as classes may have been
+                        created since the last call
+        :type refresh: bool
+        :rtype: tuple
+        """
+        if self._actual_types is not None and not refresh:
+            return self._actual_types
+
+        actual_types = ()
+        for v in self.types:
+            if isinstance(v, str):
+                # the following is a (almost) copy/paste from
+                # https://stackoverflow.com/questions/11775460/lexical-cast-from-string-to-type
+                q = deque([object])
+                while q:
+                    t = q.popleft()
+                    if t.__name__ == v:
+                        actual_types += (t,)
+                    else:
+                        try:
+                            # keep looking!
+                            q.extend(t.__subclasses__())
+                        except TypeError:
+                            # type.__subclasses__ needs an argument for
+                            # whatever reason.
+                            if t is type:
+                                continue
+                            else:
+                                raise
+            else:
+                actual_types += (v,)
+
+        self._actual_types = actual_types
+        return actual_types
+
+    def has_names(self):
+        """
+        Return True if some accepted types are given by their name.
+        """
+        return any(isinstance(v, str) for v in self.types)
+
 
 class IntField(Field):
     """
@@ -278,6 +329,11 @@ class BytesField(Field):
         return str(value)
 
 
+# Types of default values which can be shared by all instances.
+IMMUTABLE_TYPES = (type(None), bool, int, long, float, str, unicode, tuple, frozenset, Decimal,
+                   datetime.date, datetime.time, datetime.timedelta, NotAvailableType, NotLoadedType)
+
+
 class _BaseObjectMeta(type):
     def __new__(cls, name, bases, attrs):
         fields = [(field_name, attrs.pop(field_name)) for field_name, obj in attrs.items() if isinstance(obj, Field)]
@@ -290,6 +346,12 @@ class _BaseObjectMeta(type):
             new_class._fields = deepcopy(new_class._fields)
         new_class._fields.update(fields)
 
+        # Fields values are stored in the instance's __dict__, initialized
+        # from these defaults. Mutable defaults are copied for each instance.
+        new_class._defaults = dict((field_name, field.value) for field_name, field in new_class._fields.iteritems())
+        new_class._mutable_defaults = tuple(field_name for field_name, value in new_class._defaults.iteritems()
+                                            if not isinstance(value, IMMUTABLE_TYPES))
+
         if new_class.__doc__ is None:
             new_class.__doc__ = ''
         for name, field in fields:
@@ -330,11 +392,16 @@ class BaseObject(object):
     backend = None
     url = StringField('url')
     _fields = None
+    _defaults = None
+    _mutable_defaults = ()
 
     def __init__(self, id=u'', url=NotLoaded, backend=None):
-        self.id = to_unicode(id)
-        self.backend = backend
-        self._fields = deepcopy(self._fields)
+        d = self.__dict__
+        d.update(self._defaults)
+        for name in self._mutable_defaults:
+            d[name] = deepcopy(d[name])
+        d['id'] = to_unicode(id)
+        d['backend'] = backend
         self.__setattr__('url', url)
 
     @property
@@ -361,7 +428,8 @@ class BaseObject(object):
 
     def copy(self):
         obj = copy(self)
-        obj._fields = copy(self._fields)
+        if '_fields' in self.__dict__:
+            obj._fields = copy(self._fields)
         return obj
 
     def __deepcopy__(self, memo):
@@ -389,8 +457,9 @@ class BaseObject(object):
 
         if hasattr(self, 'id') and self.id is not None:
             yield 'id', self.id
-        for name, field in self._fields.iteritems():
-            yield name, field.value
+        d = self.__dict__
+        for name in self._fields:
+            yield name, d[name] if name in d else getattr(self, name)
 
     def __eq__(self, obj):
         if isinstance(obj, BaseObject):
@@ -399,22 +468,26 @@ class BaseObject(object):
             return False
 
     def __getattr__(self, name):
+        # Fields values are in __dict__, so this is only called for unknown
+        # attributes, or when a subclass did not call BaseObject.__init__.
         if self._fields is not None and name in self._fields:
-            return self._fields[name].value
-        else:
-            raise AttributeError("'%s' object has no attribute '%s'" % (
-                self.__class__.__name__, name))
+            value = self.__dict__[name] = deepcopy(self._defaults[name])
+            return value
+
+        raise AttributeError("'%s' object has no attribute '%s'" % (
+            self.__class__.__name__, name))
 
     def __setattr__(self, name, value):
         try:
             attr = (self._fields or {})[name]
         except KeyError:
-            if name not in dir(self) and not name.startswith('_'):
+            if not name.startswith('_') and name not in self.__dict__ and not hasattr(type(self), name):
                 warnings.warn('Creating a non-field attribute %s. Please prefix it with _' % name,
                               AttributeCreationWarning, stacklevel=2)
             object.__setattr__(self, name, value)
         else:
-            if not empty(value):
+            is_empty = value is None or value is NotLoaded or value is NotAvailable
+            if not is_empty:
                 try:
                     # Try to convert value to the wanted one.
                     nvalue = attr.convert(value)
@@ -429,41 +502,25 @@ class BaseObject(object):
                     # match the wanted following types, so we'll
                     # raise ValueError.
                     pass
-            from collections import deque
-            actual_types = ()
-            for v in attr.types:
-                if isinstance(v, str):
-                    # the following is a (almost) copy/paste from
-                    # https://stackoverflow.com/questions/11775460/lexical-cast-from-string-to-type
-                    q = deque([object])
-                    while q:
-                        t = q.popleft()
-                        if t.__name__ == v:
-                            actual_types += (t,)
-                        else:
-                            try:
-                                # keep looking!
-                                q.extend(t.__subclasses__())
-                            except TypeError:
-                                # type.__subclasses__ needs an argument for
-                                # whatever reason.
-                                if t is type:
-                                    continue
-                                else:
-                                    raise
-                else:
-                    actual_types += (v,)
-
-            if not isinstance(value, actual_types) and not empty(value):
-                raise ValueError(
-                    'Value for "%s" needs to be of type %r, not %r' % (
-                        name, actual_types, type(value)))
-            attr.value = value
+
+                actual_types = attr.get_types()
+                if not isinstance(value, actual_types) and attr.has_names():
+                    # Classes matching names may have been created since
+                    # types were resolved.
+                    actual_types = attr.get_types(refresh=True)
+                if not isinstance(value, actual_types):
+                    raise ValueError(
+                        'Value for "%s" needs to be of type %r, not %r' % (
+                            name, actual_types, type(value)))
+            self.__dict__[name] = value
 
     def __delattr__(self, name):
-        try:
+        if name in self._fields:
+            # Only this instance loses the field.
+            self._fields = copy(self._fields)
             self._fields.pop(name)
-        except KeyError:
+            self.__dict__.pop(name, None)
+        else:
             object.__delattr__(self, name)
 
     def to_dict(self):
@@ -18,11 +18,15 @@
 # along with weboob. If not, see <http://www.gnu.org/licenses/>.
 
 
+import shutil
+from io import BytesIO
+from tempfile import SpooledTemporaryFile
+
 from .base import Capability, BaseObject, NotAvailable, Field, StringField, enum
 from .date import DateField
 
 
-__all__ = ['BaseFile', 'CapFile']
+__all__ = ['BaseFile', 'CapFile', 'Payload', 'PayloadField']
 
 
 LICENSES = enum(
@@ -38,6 +42,197 @@ LICENSES = enum(
     GFDL=u'GNU Free Documentation License')
 
 
+class Payload(object):
+    """
+    Lazy file-like content of a file.
+
+    The underlying stream, usually the body of a browser response, is only
+    opened and read when needed, so applications can copy it to disk or to
+    stdout by chunks with :meth:`save` without holding it in memory.
+
+    A stream can be read only once. :meth:`buffer` keeps the content to read
+    it again, in memory or in a temporary file if it is larger than
+    :attr:`SPILL_SIZE`.
+
+    >>> payload = Payload.from_string('content')
+    >>> payload.read(3)
+    'con'
+    >>> payload.read()
+    'tent'
+    >>> payload.getvalue()
+    'content'
+
+    :param opener: callable which returns the file-like object to read,
+                   called at the first read
+    :param size: size in bytes, if known
+    :type size: int
+    """
+
+    CHUNK_SIZE = 64 * 1024
+    SPILL_SIZE = 1024 * 1024
+
+    def __init__(self, opener, size=None):
+        self.opener = opener
+        self.size = size
+        self.fileobj = None
+        self.buffered = False
+
+    @classmethod
+    def from_string(cls, data):
+        """
+        Build a payload from a string already in memory.
+        """
+        if isinstance(data, unicode):
+            data = data.encode('utf-8')
+        payload = cls(None, len(data))
+        payload.fileobj = BytesIO(data)
+        payload.buffered = True
+        return payload
+
+    @classmethod
+    def from_response(cls, response):
+        """
+        Build a payload reading the body of a :class:`requests.Response`
+        opened with ``stream=True``.
+        """
+        payload = cls(None)
+        payload.fileobj = payload._open_response(response)
+        return payload
+
+    @classmethod
+    def from_url(cls, browser, url, **kwargs):
+        """
+        Build a payload which requests *url* with the browser only when it
+        is read.
+
+        :type browser: :class:`weboob.browser.browsers.Browser`
+        :param kwargs: other arguments of :meth:`weboob.browser.browsers.Browser.open`
+        """
+        payload = cls(None)
+        payload.opener = lambda: payload._open_response(browser.open(url, stream=True, **kwargs))
+        return payload
+
+    @classmethod
+    def wrap(cls, value):
+        """
+        Get a payload for the value of a :class:`PayloadField`, which can
+        also be a string.
+        """
+        if value is None or isinstance(value, Payload):
+            return value
+        return cls.from_string(value)
+
+    def _open_response(self, response):
+        if response._content_consumed:
+            self.size = len(response.content)
+            self.buffered = True
+            return BytesIO(response.content)
+
+        if response.headers.get('Content-Encoding', 'identity') == 'identity':
+            try:
+                self.size = int(response.headers['Content-Length'])
+            except (KeyError, ValueError):
+                pass
+        response.raw.decode_content = True
+        return response.raw
+
+    def open(self):
+        """
+        Open the underlying stream if it is not yet.
+        """
+        if self.fileobj is None:
+            self.fileobj = self.opener()
+        return self.fileobj
+
+    def read(self, size=-1):
+        return self.open().read(size)
+
+    def iter_chunks(self, chunk_size=None):
+        """
+        Read the content by chunks.
+        """
+        fileobj = self.open()
+        while True:
+            chunk = fileobj.read(chunk_size or self.CHUNK_SIZE)
+            if not chunk:
+                break
+            yield chunk
+
+    def save(self, dest):
+        """
+        Copy the content to a file. A buffered content is copied from its
+        beginning.
+
+        :param dest: path or file-like object
+        :returns: number of written bytes
+        :rtype: int
+        """
+        if isinstance(dest, basestring):
+            with open(dest, 'wb') as f:
+                return self.save(f)
+
+        if self.buffered:
+            self.rewind()
+        written = 0
+        for chunk in self.iter_chunks():
+            dest.write(chunk)
+            written += len(chunk)
+        return written
+
+    def buffer(self):
+        """
+        Read the stream and keep its content, so it can be read again after
+        :meth:`rewind`.
+        """
+        if not self.buffered:
+            stream = self.open()
+            fileobj = SpooledTemporaryFile(max_size=self.SPILL_SIZE)
+            shutil.copyfileobj(stream, fileobj, self.CHUNK_SIZE)
+            fileobj.seek(0)
+            if hasattr(stream, 'close'):
+                stream.close()
+            self.fileobj = fileobj
+            self.buffered = True
+        return self
+
+    def rewind(self):
+        """
+        Go back to the beginning of a buffered content.
+        """
+        self.buffer()
+        self.fileobj.seek(0)
+
+    def getvalue(self):
+        """
+        Get the whole content as a string. It is buffered, so it can be
+        called several times.
+        """
+        self.rewind()
+        return self.fileobj.read()
+
+    def close(self):
+        if self.fileobj is not None and hasattr(self.fileobj, 'close'):
+            self.fileobj.close()
+
+    def __repr__(self):
+        return '<Payload size=%r>' % self.size
+
+
+class PayloadField(Field):
+    """
+    A field which contains binary data, as a :class:`str` or a lazy
+    :class:`Payload`.
+    """
+
+    def __init__(self, doc, **kwargs):
+        Field.__init__(self, doc, str, Payload, **kwargs)
+
+    def convert(self, value):
+        if isinstance(value, unicode):
+            return value.encode('utf-8')
+        return value
+
+
 class BaseFile(BaseObject):
     """
     Represent a file.
@@ -100,3 +295,30 @@ class CapFile(Capability):
         :rtype: :class:`BaseFile` or None if not found.
         """
         raise NotImplementedError()
+
+
+def test_payload():
+    from requests import Response
+
+    content = ''.join('%06d\n' % i for i in xrange(1000))
+    response = Response()
+    response.raw = BytesIO(content)
+    response.headers['Content-Length'] = str(len(content))
+
+    payload = Payload.from_response(response)
+    assert payload.size == len(content)
+    assert not payload.buffered
+    dest = BytesIO()
+    assert payload.save(dest) == len(content)
+    assert dest.getvalue() == content
+
+    response = Response()
+    response.raw = BytesIO(content)
+    payload = Payload.from_response(response)
+    payload.SPILL_SIZE = 100
+    assert payload.getvalue() == content
+    assert payload.fileobj._rolled
+    assert payload.getvalue() == content
+    dest = BytesIO()
+    payload.save(dest)
+    assert dest.getvalue() == content
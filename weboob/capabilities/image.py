@@ -19,8 +19,8 @@
 # along with weboob. If not, see <http://www.gnu.org/licenses/>.
 
 from weboob.tools.ordereddict import OrderedDict
-from .base import NotLoaded, Field, BytesField
-from .file import CapFile, BaseFile
+from .base import NotLoaded, Field
+from .file import CapFile, BaseFile, PayloadField
 
 __all__ = ['BaseImage', 'Thumbnail', 'CapImage']
 
@@ -38,7 +38,7 @@ class Thumbnail(_BaseImage):
     Thumbnail of an image.
     """
 
-    data = BytesField('Data')
+    data = PayloadField('Data')
 
     def __init__(self, url):
         super(Thumbnail, self).__init__(url)
@@ -57,7 +57,7 @@ class BaseImage(_BaseImage):
     """
     nsfw =      Field('Is this Not Safe For Work', bool, default=False)
     thumbnail = Field('Thumbnail of the image', Thumbnail)
-    data =      BytesField('Data of image')
+    data =      PayloadField('Data of image')
 
     def __iscomplete__(self):
         return self.data is not NotLoaded
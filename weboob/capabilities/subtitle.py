@@ -79,6 +79,6 @@ class CapSubtitle(Capability):
 
         :param _id: ID of subtitle
         :type _id: str
-        :rtype: str
+        :rtype: str or :class:`weboob.capabilities.file.Payload`
         """
         raise NotImplementedError()
@@ -18,19 +18,25 @@
 # along with weboob. If not, see <http://www.gnu.org/licenses/>.
 
 
+from collections import deque
 from copy import copy
-from threading import Thread, Event
+from threading import Thread, Event, Condition
 try:
     import Queue
 except ImportError:
     import queue as Queue
+try:
+    import asyncio
+except ImportError:
+    asyncio = None
 
 from weboob.capabilities.base import BaseObject
+from weboob.tools.compat import basestring, StopAsyncIteration
 from weboob.tools.misc import get_backtrace
 from weboob.tools.log import getLogger
 
 
-__all__ = ['BackendsCall', 'CallErrors']
+__all__ = ['AsyncBackendsCall', 'BackendsCall', 'CallErrors', 'CallTimeout', 'WorkerPool']
 
 
 class CallErrors(Exception):
@@ -46,13 +52,135 @@ class CallErrors(Exception):
         return self.errors.__iter__()
 
 
+class CallTimeout(Exception):
+    """
+    Raised (through :class:`CallErrors`) when a backend did not finish before
+    its timeout or before the deadline of the call.
+    """
+
+
+class WorkerPool(object):
+    """
+    Bounded pool of threads used to run backends calls.
+
+    Instead of starting one thread per backend, tasks are queued and run by at
+    most *max_workers* threads. Workers are started on demand and exit as soon
+    as there is nothing left to do.
+
+    :param max_workers: maximum number of concurrent tasks
+    :type max_workers: int
+    :param module_limits: maximum number of concurrent tasks per module name
+    :type module_limits: dict[:class:`str`, int]
+    """
+
+    MAX_WORKERS = 20
+
+    def __init__(self, max_workers=None, module_limits=None):
+        self.logger = getLogger('bcall.pool')
+        self.max_workers = max_workers or self.MAX_WORKERS
+        self.module_limits = dict(module_limits or {})
+
+        self.cond = Condition()
+        self.pending = deque()
+        self.running = {}
+        self.workers = 0
+        self.active_workers = 0
+
+    @property
+    def queue_depth(self):
+        """Number of tasks waiting for a worker."""
+        return len(self.pending)
+
+    def set_module_limit(self, module, limit):
+        """
+        Set the maximum number of concurrent tasks for a module.
+
+        :param module: name of module
+        :type module: :class:`str`
+        :param limit: maximum number of tasks, or None to remove the limit
+        :type limit: int
+        """
+        with self.cond:
+            if limit is None:
+                self.module_limits.pop(module, None)
+            else:
+                self.module_limits[module] = limit
+            self.cond.notify_all()
+
+    def submit(self, module, function, *args, **kwargs):
+        """
+        Queue a task.
+
+        :param module: name of the module the task is related to, used to
+                       apply module limits
+        :type module: :class:`str`
+        :param function: callable to run
+        :type function: :class:`callable`
+        """
+        with self.cond:
+            self.pending.append((module, function, args, kwargs))
+            if self.workers - self.active_workers < len(self.pending) and self.workers < self.max_workers:
+                self.workers += 1
+                t = Thread(target=self._worker_run)
+                t.daemon = True
+                t.start()
+            else:
+                self.cond.notify()
+
+    def _pop_task(self):
+        # Called with self.cond acquired. Return the first task which
+        # module has not reached its limit.
+        for task in self.pending:
+            module = task[0]
+            limit = self.module_limits.get(module)
+            if limit is None or self.running.get(module, 0) < limit:
+                self.pending.remove(task)
+                return task
+        return None
+
+    def _worker_run(self):
+        while True:
+            with self.cond:
+                task = self._pop_task()
+                while task is None:
+                    if not self.pending:
+                        self.workers -= 1
+                        return
+                    # Every pending task is blocked by a module limit.
+                    self.cond.wait()
+                    task = self._pop_task()
+
+                module, function, args, kwargs = task
+                self.running[module] = self.running.get(module, 0) + 1
+                self.active_workers += 1
+
+            try:
+                function(*args, **kwargs)
+            except Exception:
+                self.logger.error('Task for module %s raised an error:\n%s', module, get_backtrace())
+            finally:
+                with self.cond:
+                    self.active_workers -= 1
+                    self.running[module] -= 1
+                    if not self.running[module]:
+                        del self.running[module]
+                    self.cond.notify_all()
+
+
 class BackendsCall(object):
+    # Sentinels put in the responses queue.
+    FINISHED = object()
+    STOPPED = object()
+
     def __init__(self, backends, function, *args, **kwargs):
         """
         :param backends: List of backends to call
         :type backends: list[:class:`Module`]
         :param function: backends' method name, or callable object.
         :type function: :class:`str` or :class:`callable`
+        :param pool: pool where tasks are run; by default, a new pool
+                     with one worker per backend is used
+        :type pool: :class:`WorkerPool`
         """
         self.logger = getLogger('bcall')
 
@@ -60,13 +188,20 @@ class BackendsCall(object):
         self.errors = []
         self.tasks = Queue.Queue()
         self.stop_event = Event()
-        self.threads = []
+
+        self.pool = kwargs.pop('pool', None)
+        if self.pool is None:
+            self.pool = WorkerPool(max_workers=len(backends) or 1)
+
+        # Number of tasks whose FINISHED sentinel has not been read yet.
+        self.remaining = len(backends)
+        # Names of backends whose task has to stop as soon as possible.
+        self.cancelled = set()
+        self.backend_names = [backend.name for backend in backends]
 
         for backend in backends:
-            t = Thread(target=self.backend_process, args=(function, args, kwargs))
-            t.start()
-            self.threads.append(t)
             self.tasks.put(backend)
+            self.pool.submit(backend.NAME, self.backend_process, backend, function, args, kwargs)
 
     def store_result(self, backend, result):
         """Store the result when a backend task finished."""
@@ -75,53 +210,90 @@ class BackendsCall(object):
 
         if isinstance(result, BaseObject):
             result.backend = backend.name
-        self.responses.put(result)
+        self.push(backend, result)
+
+    def push(self, backend, response):
+        """
+        Hand a response (or a sentinel) over to the consumer.
 
-    def backend_process(self, function, args, kwargs):
+        This is called from the workers threads.
+        """
+        self.responses.put((backend, response))
+
+    def is_cancelled(self, backend):
+        """Return True if the task of this backend has to stop."""
+        return self.stop_event.is_set() or backend.name in self.cancelled
+
+    def backend_process(self, backend, function, args, kwargs):
         """
         Internal method to run a method of a backend.
 
-        As this method may be blocking, it should be run on its own thread.
+        As this method may be blocking, it is run by a worker of the pool.
         """
-        backend = self.tasks.get()
-        with backend:
-            try:
-                # Call method on backend
+        self.tasks.get()
+        try:
+            if self.is_cancelled(backend):
+                # Call was stopped before this task had a chance to run.
+                return
+
+            with backend:
+                self._call_backend(backend, function, args, kwargs)
+        finally:
+            self.push(backend, self.FINISHED)
+            self.tasks.task_done()
+
+    def _call_backend(self, backend, function, args, kwargs):
+        # Call method on backend
+        try:
+            self.logger.debug('%s: Calling function %s', backend, function)
+            if callable(function):
+                result = function(backend, *args, **kwargs)
+            else:
+                result = getattr(backend, function)(*args, **kwargs)
+        except Exception as error:
+            self.logger.debug('%s: Called function %s raised an error: %r', backend, function, error)
+            self.errors.append((backend, error, get_backtrace(error)))
+        else:
+            self.logger.debug('%s: Called function %s returned: %r', backend, function, result)
+
+            if hasattr(result, '__iter__') and not isinstance(result, basestring):
+                # Loop on iterator
                 try:
-                    self.logger.debug('%s: Calling function %s', backend, function)
-                    if callable(function):
-                        result = function(backend, *args, **kwargs)
-                    else:
-                        result = getattr(backend, function)(*args, **kwargs)
+                    for subresult in result:
+                        self.store_result(backend, subresult)
+                        if self.is_cancelled(backend):
+                            if hasattr(result, 'close'):
+                                # Run the generator's cleanup now.
+                                result.close()
+                            break
                 except Exception as error:
-                    self.logger.debug('%s: Called function %s raised an error: %r', backend, function, error)
                     self.errors.append((backend, error, get_backtrace(error)))
-                else:
-                    self.logger.debug('%s: Called function %s returned: %r', backend, function, result)
-
-                    if hasattr(result, '__iter__') and not isinstance(result, basestring):
-                        # Loop on iterator
-                        try:
-                            for subresult in result:
-                                self.store_result(backend, subresult)
-                                if self.stop_event.is_set():
-                                    break
-                        except Exception as error:
-                            self.errors.append((backend, error, get_backtrace(error)))
-                    else:
-                        self.store_result(backend, result)
-            finally:
-                self.tasks.task_done()
+            else:
+                self.store_result(backend, result)
 
-    def _callback_thread_run(self, callback, errback, finishback):
-        while not self.stop_event.is_set() and (self.tasks.unfinished_tasks or not self.responses.empty()):
-            try:
-                response = self.responses.get(timeout=0.1)
-            except Queue.Empty:
-                continue
+    def _iter_responses(self, finished=False):
+        """
+        Yield (backend, result) tuples as soon as results are stored, and
+        return when every task is finished or when the call is stopped.
+
+        With *finished*, (backend, FINISHED) is also yielded when the task of
+        a backend is over.
+        """
+        while self.remaining > 0 and not self.stop_event.is_set():
+            backend, response = self.responses.get()
+            if response is self.FINISHED:
+                self.remaining -= 1
+                if finished:
+                    yield backend, response
+            elif response is self.STOPPED:
+                break
             else:
-                if callback:
-                    callback(response)
+                yield backend, response
+
+    def _callback_thread_run(self, callback, errback, finishback):
+        for _, response in self._iter_responses():
+            if callback:
+                callback(response)
 
         # Raise errors
         while errback and self.errors:
@@ -150,8 +322,7 @@ class BackendsCall(object):
 
     def wait(self):
         """Wait until all tasks are finished."""
-        for thread in self.threads:
-            thread.join()
+        self.tasks.join()
 
         if self.errors:
             raise CallErrors(self.errors)
@@ -165,20 +336,202 @@ class BackendsCall(object):
         """
 
         self.stop_event.set()
+        # Wake up a consumer blocked on the responses queue.
+        self.push(None, self.STOPPED)
 
         if wait:
             self.wait()
 
     def __iter__(self):
         try:
-            while not self.stop_event.is_set() and (self.tasks.unfinished_tasks or not self.responses.empty()):
-                try:
-                    yield self.responses.get(timeout=0.1)
-                except Queue.Empty:
-                    continue
+            for _, response in self._iter_responses():
+                yield response
+        except:
+            self.stop()
+            raise
+
+        if self.errors:
+            raise CallErrors(self.errors)
+
+    def iter_with_backends(self):
+        """
+        Iter on (backend, result) tuples, and on (backend, :attr:`FINISHED`)
+        when a backend has no more results. It lets consumers know when the
+        results of a backend are complete.
+        """
+        try:
+            for item in self._iter_responses(finished=True):
+                yield item
         except:
             self.stop()
             raise
 
         if self.errors:
             raise CallErrors(self.errors)
+
+
+class AsyncBackendsCall(BackendsCall):
+    """
+    Asynchronous iterator on results of backends, to use with :mod:`asyncio`
+    (``async for result in call``).
+
+    Backends still run in the threads of the pool, but results are handed
+    over to the event loop as soon as they are produced. Backends which
+    exceed their timeout, or are still running when the deadline of the call
+    is reached, are cancelled: their remaining results are dropped, their
+    generator is stopped at the next result, and a :class:`CallTimeout` error
+    is reported through :class:`CallErrors` at the end of the iteration.
+
+    Leaving an ``async for`` loop early (with ``break``, ``return`` or an
+    exception) does not stop backends, as it is not a generator: use the
+    call as an asynchronous context manager, which calls :meth:`aclose` on
+    exit, or call :meth:`aclose` yourself::
+
+        async with weboob.async_do('iter_accounts') as call:
+            async for account in call:
+                if account.id == wanted:
+                    break
+
+    :param backends: list of backends to call
+    :type backends: list[:class:`Module`]
+    :param function: backends' method name, or callable object
+    :type function: :class:`str` or :class:`callable`
+    :param args: arguments given to function
+    :type args: tuple
+    :param kwargs: keyword arguments given to function
+    :type kwargs: dict
+    :param pool: pool where tasks are run
+    :type pool: :class:`WorkerPool`
+    :param timeout: maximum duration of each backend call, in seconds, or a
+                    dict of durations by backend name
+    :type timeout: float or dict[:class:`str`, float]
+    :param deadline: maximum duration of the whole call, in seconds
+    :type deadline: float
+    :param loop: event loop; default is the running one
+    """
+
+    def __init__(self, backends, function, args=(), kwargs=None, pool=None, timeout=None, deadline=None, loop=None):
+        if asyncio is None:
+            raise ImportError('asyncio is required to call backends asynchronously')
+
+        self.loop = loop or asyncio.get_event_loop()
+        self.backends = dict((backend.name, backend) for backend in backends)
+        self.running = set(self.backends)
+        self.buffer = deque()
+        self.waiter = None
+        self.done = False
+        self.raised = False
+        self.timers = []
+
+        super(AsyncBackendsCall, self).__init__(backends, function, pool=pool, *args, **(kwargs or {}))
+
+        for name in self.backends:
+            delay = timeout.get(name) if isinstance(timeout, dict) else timeout
+            if delay is not None:
+                self.timers.append(self.loop.call_later(delay, self._expire, name))
+        if deadline is not None:
+            self.timers.append(self.loop.call_later(deadline, self._expire_all))
+        if not self.running:
+            self._finish()
+
+    def push(self, backend, response):
+        try:
+            self.loop.call_soon_threadsafe(self._on_response, backend, response)
+        except RuntimeError:
+            # Event loop is closed, nobody is listening anymore.
+            self.stop_event.set()
+
+    def _on_response(self, backend, response):
+        if response is self.FINISHED:
+            self.running.discard(backend.name)
+            if not self.running:
+                self._finish()
+        elif response is self.STOPPED:
+            self._finish()
+        elif backend.name in self.running and not self.done:
+            self.buffer.append(response)
+        self._wake()
+
+    def _expire(self, name):
+        if name not in self.running:
+            return
+
+        self.logger.debug('%s: Call timed out', name)
+        self.cancelled.add(name)
+        self.running.discard(name)
+        self.errors.append((self.backends[name], CallTimeout('Timeout reached'), ''))
+        if not self.running:
+            self._finish()
+        self._wake()
+
+    def _expire_all(self):
+        for name in list(self.running):
+            self._expire(name)
+        self.stop()
+
+    def _finish(self):
+        self.done = True
+        for timer in self.timers:
+            timer.cancel()
+        self.timers = []
+
+    def _wake(self):
+        if self.waiter is None or self.waiter.done():
+            return
+
+        waiter, self.waiter = self.waiter, None
+        self._resolve(waiter)
+
+    def _resolve(self, future):
+        if self.buffer:
+            future.set_result(self.buffer.popleft())
+        elif self.done:
+            if self.errors and not self.raised:
+                self.raised = True
+                future.set_exception(CallErrors(self.errors))
+            else:
+                future.set_exception(StopAsyncIteration())
+        else:
+            self.waiter = future
+
+    def _on_waiter_done(self, future):
+        if future.cancelled():
+            # The consumer was cancelled, so stop backends.
+            self.aclose()
+
+    def __aiter__(self):
+        return self
+
+    def __anext__(self):
+        future = self.loop.create_future()
+        future.add_done_callback(self._on_waiter_done)
+        self._resolve(future)
+        return future
+
+    def __aenter__(self):
+        future = self.loop.create_future()
+        future.set_result(self)
+        return future
+
+    def __aexit__(self, exc_type, exc_value, traceback):
+        return self.aclose()
+
+    def aclose(self):
+        """
+        Stop the call and drop pending results.
+
+        :rtype: :class:`asyncio.Future`
+        """
+        for name in self.running:
+            self.cancelled.add(name)
+        self.running.clear()
+        self.buffer.clear()
+        self._finish()
+        self.stop()
+
+        future = self.loop.create_future()
+        future.set_result(None)
+        return future
+
+    def __iter__(self):
+        raise TypeError('%s has to be iterated with "async for"' % self.__class__.__name__)
@@ -20,12 +20,22 @@
 import os
 import imp
 import logging
+import sys
+import time
+from threading import RLock
+
+try:
+    import __builtin__ as builtins
+except ImportError:
+    import builtins
 
 from weboob.tools.backend import Module
 from weboob.tools.log import getLogger
+from weboob.tools.ordereddict import OrderedDict
 
 
-__all__ = ['LoadedModule', 'ModulesLoader', 'RepositoryModulesLoader', 'ModuleLoadError']
+__all__ = ['LoadedModule', 'LazyBackend', 'ModulesLoader', 'RepositoryModulesLoader', 'ModuleLoadError',
+           'ImportProfiler']
 
 
 class ModuleLoadError(Exception):
@@ -100,6 +110,136 @@ class LoadedModule(object):
         return backend_instance
 
 
+class LazyBackend(object):
+    """
+    Backend whose module is imported only when it is first used.
+
+    Capabilities are read from the :class:`weboob.core.repositories.ModuleInfo`
+    of the module, so selecting backends does not import anything. Any other
+    attribute access imports the module and creates the real backend, to
+    which it is forwarded. If the backend can't be created (for example
+    because of a configuration error), the error is logged and the backend
+    behaves as if it has no attribute, so it is skipped by callers.
+
+    :param weboob: weboob instance
+    :type weboob: :class:`weboob.core.ouiboube.Weboob`
+    :param minfo: information about the module
+    :type minfo: :class:`weboob.core.repositories.ModuleInfo`
+    :param name: name of backend
+    :param config: parameters to give to backend
+    :type config: :class:`dict`
+    :param storage: storage to use
+    :type storage: :class:`weboob.tools.storage.IStorage`
+    """
+
+    def __init__(self, weboob, minfo, name, config, storage):
+        self.weboob = weboob
+        self.minfo = minfo
+        self.NAME = minfo.name
+        self.name = name
+        self._params = config
+        self._storage = storage
+        # Shared with the real backend once it is created.
+        self.lock = RLock()
+        self._backend = None
+        self._error = None
+
+    def __enter__(self):
+        self.lock.acquire()
+
+    def __exit__(self, t, v, tb):
+        self.lock.release()
+
+    def __repr__(self):
+        return u"<Backend %r>" % self.name
+
+    def __getattr__(self, name):
+        if self._error is None:
+            try:
+                return getattr(self.get_backend(), name)
+            except (ModuleLoadError, Module.ConfigError) as e:
+                self._error = e
+                self.weboob.logger.error(u'Unable to load backend "%s": %s', self.name, e)
+        raise AttributeError('%s (unable to load backend: %s)' % (name, self._error))
+
+    def is_loaded(self):
+        return self._backend is not None
+
+    def get_backend(self):
+        """
+        Get the real backend, and create it if needed.
+
+        :rtype: :class:`weboob.tools.backend.Module`
+        """
+        with self.lock:
+            if self._backend is None:
+                module = self.weboob.modules_loader.get_or_load_module(self.NAME)
+                backend = module.create_instance(self.weboob, self.name, self._params, self._storage)
+                backend.lock = self.lock
+                self._backend = backend
+            return self._backend
+
+    def has_caps(self, *caps):
+        if self._backend is not None:
+            return self._backend.has_caps(*caps)
+        return self.minfo.has_caps(*caps)
+
+    def deinit(self):
+        if self._backend is not None:
+            self._backend.deinit()
+
+
+class ImportProfiler(object):
+    """
+    Measure the time spent to import Python modules.
+
+    When started, every import statement which adds modules to
+    :data:`sys.modules` is timed, including imports of its own imports.
+    """
+
+    def __init__(self):
+        self.imports = []
+        self.depth = 0
+        self._import = None
+
+    def start(self):
+        self._import = builtins.__import__
+        builtins.__import__ = self._profiled_import
+
+    def stop(self):
+        if self._import is not None:
+            builtins.__import__ = self._import
+            self._import = None
+
+    def _profiled_import(self, name, *args, **kwargs):
+        count = len(sys.modules)
+        index = len(self.imports)
+        self.imports.append(None)
+        self.depth += 1
+        start = time.time()
+        try:
+            return self._import(name, *args, **kwargs)
+        finally:
+            elapsed = time.time() - start
+            self.depth -= 1
+            if len(sys.modules) > count:
+                self.imports[index] = (self.depth, name, elapsed)
+            else:
+                del self.imports[index:]
+
+    def iter_report(self, threshold=0.001):
+        """
+        Iter on lines describing imports which took at least *threshold*
+        seconds, including their own imports.
+        """
+        for item in self.imports:
+            if item is None:
+                continue
+            depth, name, elapsed = item
+            if elapsed >= threshold:
+                yield u'%8.1f ms %s%s' % (elapsed * 1000, u'  ' * depth, name)
+
+
 class ModulesLoader(object):
     """
     Load modules.
@@ -109,15 +249,20 @@ class ModulesLoader(object):
         self.version = version
         self.path = path
         self.loaded = {}
+        # Time spent to import each module, in seconds.
+        self.load_times = OrderedDict()
+        self.lock = RLock()
         self.logger = getLogger('modules')
 
     def get_or_load_module(self, module_name):
         """
         Can raise a ModuleLoadError exception.
         """
-        if module_name not in self.loaded:
-            self.load_module(module_name)
-        return self.loaded[module_name]
+        # Lazy backends can be loaded concurrently by several threads.
+        with self.lock:
+            if module_name not in self.loaded:
+                self.load_module(module_name)
+            return self.loaded[module_name]
 
     def iter_existing_module_names(self):
         for name in os.listdir(self.path):
@@ -142,6 +287,7 @@ class ModulesLoader(object):
 
         path = self.get_module_path(module_name)
 
+        start = time.time()
         try:
             fp, pathname, description = imp.find_module(module_name, [path])
             try:
@@ -153,6 +299,8 @@ class ModulesLoader(object):
             if logging.root.level <= logging.DEBUG:
                 self.logger.exception(e)
             raise ModuleLoadError(module_name, e)
+        finally:
+            self.load_times[module_name] = time.time() - start
 
         if module.version != self.version:
             raise ModuleLoadError(module_name, "Module requires Weboob %s, but you use Weboob %s. Hint: use 'weboob-config update'"
@@ -20,8 +20,8 @@
 
 import os
 
-from weboob.core.bcall import BackendsCall
-from weboob.core.modules import ModulesLoader, RepositoryModulesLoader, ModuleLoadError
+from weboob.core.bcall import AsyncBackendsCall, BackendsCall, WorkerPool
+from weboob.core.modules import LazyBackend, ModulesLoader, RepositoryModulesLoader, ModuleLoadError
 from weboob.core.backendscfg import BackendsConfig
 from weboob.core.repositories import Repositories, PrintProgress
 from weboob.core.scheduler import Scheduler
@@ -50,10 +50,14 @@ class WebNip(object):
     :type storage: :class:`weboob.tools.storage.IStorage`
     :param scheduler: what scheduler to use; default is :class:`weboob.core.scheduler.Scheduler`
     :type scheduler: :class:`weboob.core.scheduler.IScheduler`
+    :param pool: pool of workers used to call backends; default is a
+                 :class:`weboob.core.bcall.WorkerPool` with
+                 :attr:`weboob.core.bcall.WorkerPool.MAX_WORKERS` workers
+    :type pool: :class:`weboob.core.bcall.WorkerPool`
     """
     VERSION = '1.2'
 
-    def __init__(self, modules_path=None, storage=None, scheduler=None):
+    def __init__(self, modules_path=None, storage=None, scheduler=None, pool=None):
         self.logger = getLogger('weboob')
         self.backend_instances = {}
         self.callbacks = {'login':   lambda backend_name, value: None,
@@ -71,6 +75,10 @@ class WebNip(object):
             scheduler = Scheduler()
         self.scheduler = scheduler
 
+        if pool is None:
+            pool = WorkerPool()
+        self.pool = pool
+
         self.storage = storage
 
     def __deinit__(self):
@@ -155,6 +163,10 @@ class WebNip(object):
 
         for name in names:
             backend = self.backend_instances.pop(name)
+            if isinstance(backend, LazyBackend) and not backend.is_loaded():
+                # Its module has never been imported, nothing to deinit.
+                unloaded[backend.name] = backend
+                continue
             with backend:
                 backend.deinit()
             unloaded[backend.name] = backend
@@ -214,31 +226,15 @@ class WebNip(object):
             return self.do(name, *args, **kwargs)
         return caller
 
-    def do(self, function, *args, **kwargs):
-        r"""
-        Do calls on loaded backends with specified arguments, in separated
-        threads.
-
-        This function has two modes:
-
-        - If *function* is a string, it calls the method with this name on
-          each backends with the specified arguments;
-        - If *function* is a callable, it calls it in a separated thread with
-          the locked backend instance at first arguments, and \*args and
-          \*\*kwargs.
-
-        :param function: backend's method name, or a callable object
-        :type function: :class:`str`
-        :param backends: list of backends to iterate on
-        :type backends: list[:class:`str`]
-        :param caps: iterate on backends which implement this caps
-        :type caps: list[:class:`weboob.capabilities.base.Capability`]
-        :rtype: A :class:`weboob.core.bcall.BackendsCall` object (iterable)
+    def _select_backends(self, kwargs):
+        """
+        Get backends to call, according to the *backends* and *caps* keys
+        of kwargs (which are removed).
         """
         backends = self.backend_instances.values()
         _backends = kwargs.pop('backends', None)
         if _backends is not None:
-            if isinstance(_backends, Module):
+            if isinstance(_backends, (Module, LazyBackend)):
                 backends = [_backends]
             elif isinstance(_backends, basestring):
                 if len(_backends) > 0:
@@ -263,11 +259,65 @@ class WebNip(object):
             caps = kwargs.pop('caps')
             backends = [backend for backend in backends if backend.has_caps(caps)]
 
+        return backends
+
+    def do(self, function, *args, **kwargs):
+        r"""
+        Do calls on loaded backends with specified arguments, in separated
+        threads of :attr:`pool`.
+
+        This function has two modes:
+
+        - If *function* is a string, it calls the method with this name on
+          each backends with the specified arguments;
+        - If *function* is a callable, it calls it in a separated thread with
+          the locked backend instance at first arguments, and \*args and
+          \*\*kwargs.
+
+        :param function: backend's method name, or a callable object
+        :type function: :class:`str`
+        :param backends: list of backends to iterate on
+        :type backends: list[:class:`str`]
+        :param caps: iterate on backends which implement this caps
+        :type caps: list[:class:`weboob.capabilities.base.Capability`]
+        :rtype: A :class:`weboob.core.bcall.BackendsCall` object (iterable)
+        """
+        backends = self._select_backends(kwargs)
+
         # The return value MUST BE the BackendsCall instance. Please never iterate
         # here on this object, because caller might want to use other methods, like
         # wait() on callback_thread().
         # Thanks a lot.
-        return BackendsCall(backends, function, *args, **kwargs)
+        return BackendsCall(backends, function, *args, pool=self.pool, **kwargs)
+
+    def async_do(self, function, *args, **kwargs):
+        r"""
+        Do calls on loaded backends with specified arguments, and get results
+        with an :mod:`asyncio` asynchronous iterator::
+
+            async for result in weboob.async_do('iter_accounts', timeout=30):
+                print(result)
+
+        To leave the loop early, use the call in an ``async with`` block (or
+        call its ``aclose()`` method), so backends are stopped.
+
+        Backends are run in threads of :attr:`pool`, and results are yielded
+        as soon as any backend produces them. Parameters are the same than
+        :func:`do`, plus:
+
+        :param timeout: maximum duration of each backend call, in seconds, or
+                        a dict of durations by backend name
+        :type timeout: float or dict[:class:`str`, float]
+        :param deadline: maximum duration of the whole call, in seconds
+        :type deadline: float
+        :rtype: A :class:`weboob.core.bcall.AsyncBackendsCall` object (async iterable)
+        """
+        backends = self._select_backends(kwargs)
+        timeout = kwargs.pop('timeout', None)
+        deadline = kwargs.pop('deadline', None)
+
+        return AsyncBackendsCall(backends, function, args, kwargs, pool=self.pool,
+                                 timeout=timeout, deadline=deadline)
 
     def schedule(self, interval, function, *args):
         """
@@ -330,11 +380,13 @@ class Weboob(WebNip):
     :type backends_filename: str
     :param storage: provide a storage where backends can save data
     :type storage: :class:`weboob.tools.storage.IStorage`
+    :param pool: pool of workers used to call backends
+    :type pool: :class:`weboob.core.bcall.WorkerPool`
     """
     BACKENDS_FILENAME = 'backends'
 
-    def __init__(self, workdir=None, datadir=None, backends_filename=None, scheduler=None, storage=None):
-        super(Weboob, self).__init__(modules_path=False, scheduler=scheduler, storage=storage)
+    def __init__(self, workdir=None, datadir=None, backends_filename=None, scheduler=None, storage=None, pool=None):
+        super(Weboob, self).__init__(modules_path=False, scheduler=scheduler, storage=storage, pool=pool)
 
         # Create WORKDIR
         if workdir is None:
@@ -409,10 +461,16 @@ class Weboob(WebNip):
 
         return super(Weboob, self).build_backend(module_name, params, storage, name)
 
-    def load_backends(self, caps=None, names=None, modules=None, exclude=None, storage=None, errors=None):
+    def load_backends(self, caps=None, names=None, modules=None, exclude=None, storage=None, errors=None, lazy=False):
         """
         Load backends listed in config file.
 
+        With *lazy*, modules are not imported here: backends are
+        :class:`weboob.core.modules.LazyBackend` objects, selected by
+        capabilities listed in repositories, and created when they are first
+        used. Configuration errors are then raised by this first use instead
+        of being stored in *errors*.
+
         :param caps: load backends which implement all of specified caps
         :type caps: tuple[:class:`weboob.capabilities.base.Capability`]
         :param names: load backends in list
@@ -425,6 +483,8 @@ class Weboob(WebNip):
         :type storage: :class:`weboob.tools.storage.IStorage`
         :param errors: if specified, store every errors in this list
         :type errors: list[:class:`LoadError`]
+        :param lazy: import modules only when backends are used
+        :type lazy: :class:`bool`
         :returns: loaded backends
         :rtype: dict[:class:`str`, :class:`weboob.tools.backend.Module`]
         """
@@ -456,16 +516,22 @@ class Weboob(WebNip):
                 self.repositories.install(minfo)
 
             module = None
-            try:
-                module = self.modules_loader.get_or_load_module(module_name)
-            except ModuleLoadError as e:
-                self.logger.error(u'Unable to load module "%s": %s', module_name, e)
-                continue
+            if not lazy:
+                try:
+                    module = self.modules_loader.get_or_load_module(module_name)
+                except ModuleLoadError as e:
+                    self.logger.error(u'Unable to load module "%s": %s', module_name, e)
+                    continue
 
             if backend_name in self.backend_instances:
                 self.logger.warning(u'Oops, the backend "%s" is already loaded. Unload it before reloading...', backend_name)
                 self.unload_backends(backend_name)
 
+            if lazy:
+                self.backend_instances[backend_name] = loaded[backend_name] = \
+                    LazyBackend(self, minfo, backend_name, params, storage)
+                continue
+
             try:
                 backend_instance = module.create_instance(self, backend_name, params, storage)
             except Module.ConfigError as e:
@@ -27,10 +27,12 @@ import sys
 import os
 import subprocess
 import hashlib
+import time
 from datetime import datetime
 from contextlib import closing
 from compileall import compile_dir
 from io import BytesIO
+from multiprocessing import Pool
 
 from weboob.exceptions import BrowserHTTPError, BrowserHTTPNotFound
 from .modules import LoadedModule
@@ -62,6 +64,8 @@ class ModuleInfo(object):
         self.license = u''
         self.icon = u''
         self.urls = u''
+        # digest of the files of the module, to know if it has changed
+        self.tree_hash = u''
 
     def load(self, items):
         self.version = int(items['version'])
@@ -71,6 +75,7 @@ class ModuleInfo(object):
         self.license = to_unicode(items['license'])
         self.icon = items['icon'].strip() or None
         self.urls = items['urls']
+        self.tree_hash = items.get('tree_hash', u'')
 
     def has_caps(self, *caps):
         """Return True if module implements at least one of the caps."""
@@ -97,9 +102,48 @@ class ModuleInfo(object):
                 ('license', self.license),
                 ('icon', self.icon or ''),
                 ('urls', self.urls),
+                ('tree_hash', self.tree_hash),
                )
 
 
+def load_module_info(args):
+    """
+    Import a module to read its information.
+
+    It is run in a worker process by :meth:`Repository.build_index`, so it
+    only takes and returns picklable values.
+
+    :param args: path of the repository, name, version and tree hash of the
+                 module
+    :type args: tuple
+    :returns: name, dict of information, error message and loading time
+    :rtype: tuple
+    """
+    path, name, version, tree_hash = args
+    start = time.time()
+    try:
+        fp, pathname, description = imp.find_module(name, [path])
+        try:
+            module = LoadedModule(imp.load_module(name, fp, pathname, description))
+        finally:
+            if fp:
+                fp.close()
+    except Exception as e:
+        getLogger('repository').debug(get_backtrace(e))
+        return name, None, '[%s] %s' % (type(e).__name__, e), time.time() - start
+
+    items = {'name': module.name,
+             'version': version,
+             'capabilities': list(set([c.__name__ for c in module.iter_caps()])),
+             'description': module.description,
+             'maintainer': module.maintainer,
+             'license': module.license,
+             'icon': module.icon or '',
+             'tree_hash': tree_hash,
+            }
+    return name, items, None, time.time() - start
+
+
 class RepositoryUnavailable(Exception):
     """
     Repository in not available.
@@ -178,7 +222,7 @@ class Repository(object):
 
         if self.local:
             # Always rebuild index of a local repository.
-            self.build_index(self.localurl2path(), filename)
+            self.build_index(self.localurl2path(), filename, incremental=True)
 
         # Save the repository index in ~/.weboob/repositories/
         self.save(repo_path, private=True)
@@ -254,7 +298,7 @@ class Repository(object):
                 module.signed = self.signed
             self.modules[section] = module
 
-    def build_index(self, path, filename):
+    def build_index(self, path, filename, incremental=False, processes=None):
         """
         Rebuild index of modules of repository.
 
@@ -262,8 +306,16 @@ class Repository(object):
         :type path: str
         :param filename: file to save index
         :type filename: str
+        :param incremental: keep the current information of modules which
+                            files have not been added, removed or modified
+                            since the index was built
+        :type incremental: bool
+        :param processes: number of processes used to load modules (default
+                          is the number of CPUs)
+        :type processes: int
         """
         print('Rebuild index')
+        previous = self.modules.copy() if incremental else {}
         self.modules.clear()
 
         if os.path.isdir(os.path.join(path, self.KEYDIR)):
@@ -273,47 +325,83 @@ class Repository(object):
             self.signed = False
             self.key_update = 0
 
+        to_load = []
         for name in sorted(os.listdir(path)):
             module_path = os.path.join(path, name)
             if not os.path.isdir(module_path) or '.' in name or name == self.KEYDIR:
                 continue
 
-            try:
-                fp, pathname, description = imp.find_module(name, [path])
-                try:
-                    module = LoadedModule(imp.load_module(name, fp, pathname, description))
-                finally:
-                    if fp:
-                        fp.close()
-            except Exception as e:
-                print('Unable to build module %s: [%s] %s' % (name, type(e).__name__, e), file=sys.stderr)
-                self.logger.debug(get_backtrace(e))
+            version = self.get_tree_mtime(module_path)
+            tree_hash = self.get_tree_hash(module_path)
+            if name in previous and previous[name].tree_hash == tree_hash:
+                self.modules[name] = previous[name]
             else:
-                m = ModuleInfo(module.name)
-                m.version = self.get_tree_mtime(module_path)
-                m.capabilities = list(set([c.__name__ for c in module.iter_caps()]))
-                m.description = module.description
-                m.maintainer = module.maintainer
-                m.license = module.license
-                m.icon = module.icon or ''
-                self.modules[module.name] = m
+                to_load.append((path, name, version, tree_hash))
+
+        print('%d modules unchanged, loading %d modules' % (len(self.modules), len(to_load)))
+        if len(to_load) > 1 and processes != 1:
+            pool = Pool(processes)
+            try:
+                results = pool.imap_unordered(load_module_info, to_load)
+                self._add_loaded_modules(results)
+            finally:
+                pool.terminate()
+        else:
+            self._add_loaded_modules(load_module_info(args) for args in to_load)
 
         self.update = int(datetime.now().strftime('%Y%m%d%H%M'))
         self.save(filename)
 
+    def _add_loaded_modules(self, results):
+        for name, items, error, elapsed in results:
+            if error is not None:
+                print('Unable to build module %s: %s' % (name, error), file=sys.stderr)
+                continue
+
+            print('Module %s loaded in %.3fs' % (name, elapsed))
+            m = ModuleInfo(items['name'])
+            m.version = items['version']
+            m.capabilities = items['capabilities']
+            m.description = items['description']
+            m.maintainer = items['maintainer']
+            m.license = items['license']
+            m.icon = items['icon']
+            m.tree_hash = items['tree_hash']
+            self.modules[m.name] = m
+
     @staticmethod
     def get_tree_mtime(path, include_root=False):
         mtime = 0
         if include_root:
-            mtime = int(datetime.fromtimestamp(os.path.getmtime(path)).strftime('%Y%m%d%H%M'))
+            mtime = os.path.getmtime(path)
         for root, dirs, files in os.walk(path):
             for f in files:
                 if f.endswith('.pyc'):
                     continue
-                m = int(datetime.fromtimestamp(os.path.getmtime(os.path.join(root, f))).strftime('%Y%m%d%H%M'))
-                mtime = max(mtime, m)
+                mtime = max(mtime, os.path.getmtime(os.path.join(root, f)))
 
-        return mtime
+        if not mtime:
+            return 0
+        return int(datetime.fromtimestamp(mtime).strftime('%Y%m%d%H%M'))
+
+    @staticmethod
+    def get_tree_hash(path):
+        """
+        Get a digest of the names, sizes and exact modification times of the
+        files of a tree, which changes when a file is added, removed or
+        modified (:meth:`get_tree_mtime` is rounded to the minute).
+        """
+        digest = hashlib.sha1()
+        for root, dirs, files in os.walk(path):
+            dirs.sort()
+            for f in sorted(files):
+                if f.endswith('.pyc'):
+                    continue
+                filepath = os.path.join(root, f)
+                st = os.stat(filepath)
+                line = u'%s %d %r\n' % (to_unicode(os.path.relpath(filepath, path)), st.st_size, st.st_mtime)
+                digest.update(line.encode('utf-8'))
+        return digest.hexdigest()
 
     def save(self, filename, private=False):
         """
@@ -830,3 +918,54 @@ class Keyring(object):
                 h = hashlib.sha1(f.read()).hexdigest()
             return 'Keyring version %s, checksum %s' % (self.version, h)
         return 'NO KEYRING'
+
+
+def test_build_index():
+    from tempfile import mkdtemp
+
+    def write_module(description, mtime):
+        with open(os.path.join(module_path, '__init__.py'), 'w') as f:
+            f.write('from weboob.tools.backend import Module\n\n\n'
+                    'class IndexTestModule(Module):\n'
+                    '    NAME = "weboobindextest"\n'
+                    '    DESCRIPTION = u"%s"\n' % description)
+        os.utime(os.path.join(module_path, '__init__.py'), (mtime, mtime))
+        for f in os.listdir(module_path):
+            if f.endswith('.pyc'):
+                os.remove(os.path.join(module_path, f))
+
+    path = mkdtemp()
+    try:
+        module_path = os.path.join(path, 'weboobindextest')
+        os.mkdir(module_path)
+        filename = os.path.join(path, Repository.INDEX)
+        repository = Repository('file://%s' % path)
+        repository.name = 'test'
+
+        # Every change happens in the same minute.
+        write_module('first', 1500000000)
+        with open(os.path.join(module_path, 'browser.py'), 'w') as f:
+            f.write('\n')
+        os.utime(os.path.join(module_path, 'browser.py'), (1500000001, 1500000001))
+        repository.build_index(path, filename, processes=1)
+        module = repository.modules['weboobindextest']
+        assert module.description == 'first'
+
+        repository.build_index(path, filename, incremental=True, processes=1)
+        assert repository.modules['weboobindextest'] is module
+
+        write_module('second', 1500000010)
+        repository.build_index(path, filename, incremental=True, processes=1)
+        module = repository.modules['weboobindextest']
+        assert module.description == 'second'
+        assert module.version == Repository.get_tree_mtime(module_path)
+
+        os.remove(os.path.join(module_path, 'browser.py'))
+        repository.build_index(path, filename, incremental=True, processes=1)
+        assert repository.modules['weboobindextest'] is not module
+
+        with open(filename, 'r') as fp:
+            repository.parse_index(fp)
+        assert repository.modules['weboobindextest'].tree_hash == Repository.get_tree_hash(module_path)
+    finally:
+        shutil.rmtree(path)
@@ -20,17 +20,21 @@
 
 from __future__ import print_function
 
-from threading import Event, RLock
+from heapq import heappop, heappush
+from random import uniform
+from threading import Condition, Event, RLock, Thread
+from time import time
 try:
     from threading import _Timer as Timer
 except ImportError:
     from threading import Timer
 
+from weboob.core.bcall import WorkerPool
 from weboob.tools.log import getLogger
 from weboob.tools.misc import get_backtrace
 
 
-__all__ = ['Scheduler']
+__all__ = ['HeapScheduler', 'Scheduler']
 
 
 class IScheduler(object):
@@ -176,3 +180,195 @@ class Scheduler(IScheduler):
                 # Contrary to _wait_to_stop(), don't call t.join
                 # because want_stop() have to be non-blocking.
             self.queue = {}
+
+
+class ScheduledCall(object):
+    def __init__(self, id, interval, function, args, repeat):
+        self.id = id
+        self.interval = interval
+        self.function = function
+        self.args = args
+        self.repeat = repeat
+        self.deadline = None
+        self.failures = 0
+
+
+class HeapScheduler(IScheduler):
+    """
+    Scheduler using a single thread and a heap of deadlines.
+
+    Due functions are run by a :class:`weboob.core.bcall.WorkerPool`. A
+    repeated function is run immediately, and then *interval* seconds after
+    the end of its previous call, so it is never run twice at the same time.
+
+    :param max_workers: maximum number of functions running at the same time
+    :type max_workers: int
+    :param jitter: fraction of the interval randomly added to or removed from
+                   the delay between two calls of a repeated function; the
+                   first call is also delayed by up to this fraction
+    :type jitter: float
+    :param backoff: factor applied to the interval of a repeated function
+                    after each consecutive failed call
+    :type backoff: float
+    :param max_interval: maximum interval after a back-off
+    :type max_interval: float
+    """
+
+    MISSED_DELAY = 1.0
+    """
+    A call started more than this number of seconds after its deadline is
+    counted as missed.
+    """
+
+    def __init__(self, max_workers=None, jitter=0, backoff=1, max_interval=None):
+        self.logger = getLogger('scheduler')
+        self.pool = WorkerPool(max_workers)
+        self.jitter = jitter
+        self.backoff = backoff
+        self.max_interval = max_interval
+
+        self.cond = Condition()
+        self.stop_event = Event()
+        self.thread = None
+        self.count = 0
+        self.heap = []
+        self.events = {}
+        self.running = 0
+        self.stats = {'calls': 0, 'errors': 0, 'missed': 0, 'max_lateness': 0.0}
+
+    def schedule(self, interval, function, *args):
+        return self._schedule(interval, function, args, False, interval)
+
+    def repeat(self, interval, function, *args):
+        return self._schedule(interval, function, args, True, uniform(0, interval * self.jitter))
+
+    def _schedule(self, interval, function, args, repeat, delay):
+        if self.stop_event.isSet():
+            return
+
+        with self.cond:
+            self.count += 1
+            ev = ScheduledCall(self.count, interval, function, args, repeat)
+            self.events[ev.id] = ev
+            self.logger.debug('function "%s" will be called in %s seconds' % (function.__name__, delay))
+            self._push(ev, delay)
+
+            if self.thread is None:
+                self.thread = Thread(target=self._dispatch, name='scheduler')
+                self.thread.daemon = True
+                self.thread.start()
+            return ev.id
+
+    def _push(self, ev, delay):
+        # Called with self.cond acquired.
+        ev.deadline = time() + delay
+        heappush(self.heap, (ev.deadline, ev.id))
+        self.cond.notify_all()
+
+    def _next_interval(self, ev):
+        interval = ev.interval * self.backoff ** ev.failures
+        if self.max_interval is not None:
+            interval = min(interval, max(ev.interval, self.max_interval))
+        if self.jitter:
+            interval += interval * uniform(-self.jitter, self.jitter)
+        return max(interval, 0)
+
+    def _dispatch(self):
+        with self.cond:
+            while not self.stop_event.isSet():
+                now = time()
+                while self.heap and self.heap[0][0] <= now:
+                    deadline, id = heappop(self.heap)
+                    ev = self.events.get(id)
+                    if ev is None or ev.deadline != deadline:
+                        # canceled
+                        continue
+
+                    ev.deadline = None
+                    self.running += 1
+                    self.pool.submit(None, self._run, ev, deadline)
+
+                if self.heap:
+                    self.cond.wait(self.heap[0][0] - now)
+                else:
+                    self.cond.wait()
+
+    def _run(self, ev, deadline):
+        lateness = time() - deadline
+        with self.cond:
+            self.stats['calls'] += 1
+            self.stats['max_lateness'] = max(self.stats['max_lateness'], lateness)
+            if lateness > self.MISSED_DELAY:
+                self.stats['missed'] += 1
+                self.logger.debug('function "%s" called %.1f seconds late' % (ev.function.__name__, lateness))
+
+        failed = False
+        try:
+            ev.function(*ev.args)
+        except Exception:
+            failed = True
+            self.logger.error(get_backtrace())
+        finally:
+            with self.cond:
+                self.running -= 1
+                if failed:
+                    self.stats['errors'] += 1
+
+                if not ev.repeat:
+                    self.events.pop(ev.id, None)
+                elif ev.id in self.events:
+                    ev.failures = ev.failures + 1 if failed else 0
+                    interval = self._next_interval(ev)
+                    self.logger.debug('function "%s" will be called in %s seconds' % (ev.function.__name__, interval))
+                    self._push(ev, interval)
+                self.cond.notify_all()
+
+    def cancel(self, ev):
+        with self.cond:
+            try:
+                e = self.events.pop(ev)
+            except KeyError:
+                return False
+            self.logger.debug('scheduled function "%s" is canceled' % e.function.__name__)
+            return True
+
+    def get_stats(self):
+        """
+        Get statistics about calls.
+
+        :returns: number of scheduled and running functions, number of calls,
+                  of failed calls, of calls started more than
+                  :attr:`MISSED_DELAY` seconds late, and the maximum lateness
+        :rtype: dict
+        """
+        with self.cond:
+            stats = dict(self.stats)
+            stats['scheduled'] = len(self.events)
+            stats['running'] = self.running
+            return stats
+
+    def _wait_to_stop(self):
+        self.want_stop()
+        if self.thread is not None:
+            self.thread.join()
+        with self.cond:
+            while self.running > 0:
+                self.cond.wait(0.1)
+
+    def run(self):
+        try:
+            while not self.stop_event.isSet():
+                self.stop_event.wait(1)
+        except KeyboardInterrupt:
+            self._wait_to_stop()
+            raise
+        else:
+            self._wait_to_stop()
+        return True
+
+    def want_stop(self):
+        self.stop_event.set()
+        with self.cond:
+            self.events = {}
+            self.heap = []
+            self.cond.notify_all()
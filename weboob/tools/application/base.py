@@ -24,6 +24,7 @@ import logging
 import optparse
 from optparse import OptionGroup, OptionParser
 from datetime import datetime
+from itertools import islice
 import os
 import sys
 import warnings
@@ -31,6 +32,7 @@ import warnings
 from weboob.capabilities.base import ConversionWarning, BaseObject
 from weboob.core import Weboob, CallErrors
 from weboob.core.backendscfg import BackendsConfig
+from weboob.core.modules import ImportProfiler
 from weboob.tools.config.iconfig import ConfigError
 from weboob.exceptions import FormFieldConversionWarning
 from weboob.tools.log import createColoredFormatter, getLogger, DEBUG_FILTERS, settings as log_settings
@@ -101,6 +103,13 @@ class Application(object):
     COPYRIGHT = None
     # Verbosity of DEBUG
     DEBUG_FILTER = 2
+    # Number of objects given at once to Module.fillobjs()
+    FILL_CHUNK_SIZE = 20
+    # Import modules only when their backends are used. Load and
+    # configuration errors are then raised by the first use instead of
+    # being reported by load_backends(), so ConsoleApplication can not
+    # offer to reconfigure the backend.
+    LAZY_BACKENDS = False
 
     stdin = sys.stdin
     stdout = sys.stdout
@@ -150,6 +159,7 @@ class Application(object):
         self.options = None
         self.condition = None
         self.storage = None
+        self.import_profiler = None
         if option_parser is None:
             self._parser = OptionParser(self.SYNOPSIS, version=self._get_optparse_version())
         else:
@@ -169,6 +179,7 @@ class Application(object):
         logging_options.add_option('-v', '--verbose', action='store_true', help='display info messages')
         logging_options.add_option('--logging-file', action='store', type='string', dest='logging_file', help='file to save logs')
         logging_options.add_option('-a', '--save-responses', action='store_true', help='save every response')
+        logging_options.add_option('--profile-startup', action='store_true', help='display time spent to import modules')
         self._parser.add_option_group(logging_options)
         self._parser.add_option('--shell-completion', action='store_true', help=optparse.SUPPRESS_HELP)
         self._is_default_count = True
@@ -179,6 +190,21 @@ class Application(object):
     def deinit(self):
         self.weboob.want_stop()
         self.weboob.deinit()
+        if self.import_profiler is not None:
+            self.print_import_profile()
+
+    def print_import_profile(self):
+        """
+        Display the time spent to import modules of backends, and Python
+        modules imported since options have been parsed.
+        """
+        self.import_profiler.stop()
+        print(u'Modules:', file=self.stderr)
+        for name, elapsed in self.weboob.modules_loader.load_times.iteritems():
+            print(u'%8.1f ms %s' % (elapsed * 1000, name), file=self.stderr)
+        print(u'Imports:', file=self.stderr)
+        for line in self.import_profiler.iter_report():
+            print(line, file=self.stderr)
 
     def create_storage(self, path=None, klass=None, localonly=False):
         """
@@ -245,6 +271,7 @@ class Application(object):
             names = self.options.backends.split(',')
         if exclude is None and self.options.exclude_backends:
             exclude = self.options.exclude_backends.split(',')
+        kwargs.setdefault('lazy', self.LAZY_BACKENDS)
         loaded = self.weboob.load_backends(caps, names, exclude=exclude, *args, **kwargs)
         if not loaded:
             logging.info(u'No backend loaded')
@@ -271,24 +298,50 @@ class Application(object):
             backend.fillobj(obj, fields)
         return obj
 
+    def _do_complete_objs(self, backend, fields, objs):
+        to_fill = []
+        for obj in objs:
+            if obj and isinstance(obj, BaseObject):
+                obj.backend = backend.name
+                to_fill.append(obj)
+
+        if to_fill and (fields is None or len(fields) > 0):
+            backend.fillobjs(to_fill, fields)
+        return objs
+
     def _do_complete_iter(self, backend, count, fields, res):
         modif = 0
-
-        for i, sub in enumerate(res):
-            sub = self._do_complete_obj(backend, fields, sub)
-            if self.condition and self.condition.limit and \
-               self.condition.limit == i:
+        i = 0
+        res = iter(res)
+
+        while True:
+            # Fill objects by chunks, but not more than needed to reach the
+            # count or the limit of condition.
+            size = self.FILL_CHUNK_SIZE
+            if count:
+                size = min(size, count - (i - modif) + 1)
+            if self.condition and self.condition.limit:
+                size = min(size, self.condition.limit - i + 1)
+
+            chunk = list(islice(res, size))
+            if not chunk:
                 return
 
-            if self.condition and not self.condition.is_valid(sub):
-                modif += 1
-            else:
-                if count and i - modif == count:
-                    if self._is_default_count:
-                        raise MoreResultsAvailable()
-                    else:
-                        return
-                yield sub
+            for sub in self._do_complete_objs(backend, fields, chunk):
+                if self.condition and self.condition.limit and \
+                   self.condition.limit == i:
+                    return
+
+                if self.condition and not self.condition.is_valid(sub):
+                    modif += 1
+                else:
+                    if count and i - modif == count:
+                        if self._is_default_count:
+                            raise MoreResultsAvailable()
+                        else:
+                            return
+                    yield sub
+                i += 1
 
     def _do_complete(self, backend, count, selected_fields, function, *args, **kwargs):
         assert count is None or count > 0
@@ -366,6 +419,9 @@ class Application(object):
             level = logging.WARNING
         if self.options.insecure:
             log_settings['ssl_insecure'] = True
+        if self.options.profile_startup:
+            self.import_profiler = ImportProfiler()
+            self.import_profiler.start()
 
         # this only matters to developers
         if not self.options.debug and not self.options.save_responses:
@@ -19,6 +19,7 @@
 
 
 from weboob.capabilities.base import NotAvailable, NotLoaded
+from weboob.capabilities.file import Payload
 from weboob.tools.json import json
 
 from .iformatter import IFormatter
@@ -35,6 +36,9 @@ class Encoder(json.JSONEncoder):
         except TypeError:
             if obj is NotAvailable or obj is NotLoaded:
                 return None
+            if isinstance(obj, Payload):
+                # Binary content is not dumped.
+                return None
 
             try:
                 dct = obj.to_dict()
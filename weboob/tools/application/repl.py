@@ -21,6 +21,8 @@ from __future__ import print_function
 
 import atexit
 from cmd import Cmd
+import heapq
+import itertools
 import logging
 import re
 from optparse import OptionGroup, OptionParser, IndentedHelpFormatter
@@ -99,6 +101,8 @@ class ReplApplication(Cmd, ConsoleApplication):
     SYNOPSIS =  'Usage: %prog [-dqv] [-b backends] [-cnfs] [command [arguments..]]\n'
     SYNOPSIS += '       %prog [--help] [--version]'
     DISABLE_REPL = False
+    # Maximum number of results of each backend sorted together by "ls -m"
+    MERGE_BUFFER_SIZE = 10
 
     EXTRA_FORMATTERS = {}
     DEFAULT_FORMATTER = 'multiline'
@@ -971,12 +975,14 @@ class ReplApplication(Cmd, ConsoleApplication):
     @defaultcount(40)
     def do_ls(self, line):
         """
-        ls [-d] [-U] [PATH]
+        ls [-d] [-U] [-m] [PATH]
 
         List objects in current path.
         If an argument is given, list the specified path.
         Use -U option to not sort results. It allows you to use a "fast path" to
         return results as soon as possible.
+        Use -m option to display results as soon as they come, sorted by
+        small groups.
         Use -d option to display information about a collection (and to not
         display the content of it). It has the same behavior than the well
         known UNIX "ls" command.
@@ -985,11 +991,16 @@ class ReplApplication(Cmd, ConsoleApplication):
         path = line.strip()
         only = False
         sort = True
+        merge = False
 
         if '-U' in line.strip().partition(' '):
             path = line.strip().partition(' ')[-1]
             sort = False
 
+        if '-m' in line.strip().partition(' '):
+            path = line.strip().partition(' ')[-1]
+            merge = True
+
         if '-d' in line.strip().partition(' '):
             path = None
             only = line.strip().partition(' ')[-1]
@@ -1005,18 +1016,21 @@ class ReplApplication(Cmd, ConsoleApplication):
 
         self.start_format()
 
-        for res in self._fetch_objects(objs=self.COLLECTION_OBJECTS):
-            if isinstance(res, Collection):
-                collections.append(res)
-                if sort is False:
-                    self.formatter.format_collection(res, only)
-            else:
-                if sort:
-                    objects.append(res)
+        if merge:
+            collections = self._merge_resources(only)
+        else:
+            for res in self._fetch_objects(objs=self.COLLECTION_OBJECTS):
+                if isinstance(res, Collection):
+                    collections.append(res)
+                    if sort is False:
+                        self.formatter.format_collection(res, only)
                 else:
-                    self._format_obj(res, only)
+                    if sort:
+                        objects.append(res)
+                    else:
+                        self._format_obj(res, only)
 
-        if sort:
+        if sort and not merge:
             objects.sort(cmp=self.comp_object)
             collections = self._merge_collections_with_same_path(collections)
             collections.sort(cmp=self.comp_object)
@@ -1033,6 +1047,74 @@ class ReplApplication(Cmd, ConsoleApplication):
             # Save collections only if we listed the current path.
             self.collections = collections
 
+    def _merge_resources(self, only):
+        """
+        Display resources of the current path as they come from backends,
+        sorted by small groups.
+
+        Results of each backend are kept sorted (collections first, then by
+        id, then by backend name) in a buffer of at most
+        :attr:`MERGE_BUFFER_SIZE` items, and of a quarter of the count of
+        results, so output starts before backends reach the count. When a
+        buffer is full, the smallest head of all buffers is displayed, so no
+        backend waits for another one. When a backend finishes, its buffer is
+        drained the same way and it leaves the merge.
+
+        A collection with the same path than a displayed one is not displayed
+        again. Its backend is added to the displayed one, so the merged list
+        of backends is in the returned collections (and then in
+        :attr:`collections`, used by ``cd`` and completion), but not on the
+        line already printed.
+
+        :returns: displayed collections
+        :rtype: list[:class:`weboob.capabilities.collection.Collection`]
+        """
+        call = self.do('iter_resources', objs=self.COLLECTION_OBJECTS,
+                                         split_path=self.working_path.get(),
+                                         caps=CapCollection)
+        order = dict((name, i) for i, name in enumerate(sorted(call.backend_names)))
+        buffers = dict((name, []) for name in order)
+        size = self.MERGE_BUFFER_SIZE
+        if self.options.count:
+            size = max(1, min(size, self.options.count // 4))
+        counter = itertools.count()
+        collections = OrderedDict()
+
+        def display(res):
+            if isinstance(res, Collection):
+                col = collections.get(tuple(res.split_path))
+                if col is not None:
+                    col.backend += ' %s' % res.backend
+                    return
+                collections[tuple(res.split_path)] = res
+                self.formatter.format_collection(res, only)
+            else:
+                self._format_obj(res, only)
+
+        def pop():
+            # Merge the heads of the buffers.
+            heap = min((heap for heap in buffers.itervalues() if heap), key=lambda heap: heap[0])
+            display(heapq.heappop(heap)[-1])
+
+        try:
+            for backend, res in call.iter_with_backends():
+                buf = buffers[backend.name]
+                if res is call.FINISHED:
+                    while buf:
+                        pop()
+                    del buffers[backend.name]
+                    continue
+                heapq.heappush(buf, (not isinstance(res, Collection), res.id, order[backend.name], next(counter), res))
+                while len(buf) > size:
+                    pop()
+        except CallErrors as errors:
+            self.bcall_errors_handler(errors, CollectionNotFound)
+
+        while any(buffers.itervalues()):
+            pop()
+
+        return collections.values()
+
     def _find_collection(self, collection, collections):
         for col in collections:
             if col.split_path == collection.split_path:
@@ -1224,3 +1306,56 @@ class ReplApplication(Cmd, ConsoleApplication):
 
     def flush(self):
         self.formatter.flush()
+
+
+def test_merge_resources():
+    from threading import Event
+    from weboob.capabilities.base import BaseObject
+    from weboob.core.bcall import BackendsCall
+
+    class Options(object):
+        count = 8
+
+    class Formatter(object):
+        def format_collection(self, collection, only):
+            output.append(('/'.join(collection.split_path), collection.backend))
+            displayed.set()
+
+    class Backend(object):
+        def __init__(self, name):
+            self.name = self.NAME = name
+
+        def __enter__(self):
+            return self
+
+        def __exit__(self, *args):
+            pass
+
+    def iter_resources(backend):
+        yield Collection(['shared'])
+        for i in range(4):
+            yield BaseObject('%s%d' % (backend.name, i))
+        # Results have to be displayed while this backend is still running.
+        displayed.wait(5)
+        early.append(len(output))
+        yield BaseObject('%s9' % backend.name)
+
+    def format_obj(obj, only):
+        output.append((obj.id, obj.backend))
+        displayed.set()
+
+    output = []
+    early = []
+    displayed = Event()
+    app = ReplApplication.__new__(ReplApplication)
+    app.options = Options()
+    app.formatter = Formatter()
+    app.working_path = WorkingPath()
+    app._format_obj = format_obj
+    app.do = lambda *args, **kwargs: BackendsCall([Backend('b'), Backend('a')], iter_resources)
+
+    collections = app._merge_resources(False)
+    assert early and min(early) > 0
+    assert sorted(output[1:]) == sorted([('%s%d' % (name, i), name) for name in 'ab' for i in (0, 1, 2, 3, 9)])
+    assert output[0][0] == 'shared'
+    assert len(collections) == 1 and sorted(collections[0].backend.split()) == ['a', 'b']
@@ -355,6 +355,10 @@ class Module(object):
 
         browser = self.BROWSER(*args, **kwargs)
 
+        if hasattr(browser, 'cache_namespace'):
+            # Entries of the HTTP cache are separated by backend.
+            browser.cache_namespace = self.name
+
         if hasattr(browser, 'load_state'):
             browser.load_state(self.storage.get('browser_state', default={}))
 
@@ -440,3 +444,21 @@ class Module(object):
             setattr(obj, field, NotAvailable)
 
         return obj
+
+    def fillobjs(self, objs, fields=None):
+        """
+        Fill several objects with the wanted fields.
+
+        By default, :meth:`fillobj` is called for each object. Modules can
+        override this method to get data of several objects at once, for
+        example with one request, or concurrently with the asynchronous
+        session of the browser.
+
+        :param objs: objects to fill
+        :type objs: :class:`list`
+        :param fields: what fields to fill; if None, all fields are filled
+        :type fields: :class:`list`
+        :returns: filled objects, in the same order
+        :rtype: :class:`list`
+        """
+        return [self.fillobj(obj, fields) for obj in objs]
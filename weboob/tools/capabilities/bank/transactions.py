@@ -356,3 +356,54 @@ def test():
     decimal_amount = AmericanTransaction.decimal_amount
     assert decimal_amount('$12,442.12 USD') == Decimal('12442.12')
     assert decimal_amount('') == Decimal('0')
+
+
+def test_parse():
+    class Transaction(FrenchTransaction):
+        PATTERNS = [(re.compile(r'^VIR(EMENT)? (?P<text>.*)'), FrenchTransaction.TYPE_TRANSFER),
+                    (re.compile(r'^PRLV (?P<text>.*)'), FrenchTransaction.TYPE_ORDER),
+                    (re.compile(r'^(?P<text>.*) CARTE \d+ PAIEMENT CB\s+(?P<dd>\d{2})(?P<mm>\d{2}) ?(.*)$'),
+                                                        FrenchTransaction.TYPE_CARD),
+                    (re.compile(r'^RETRAIT DAB (?P<dd>\d{2})/(?P<mm>\d{2})/(?P<yy>\d{2}) '
+                                r'(?P<HH>\d{2})H(?P<MM>\d{2}) (?P<text>.*)'),
+                                                        FrenchTransaction.TYPE_WITHDRAWAL),
+                    (re.compile(r'^CHEQUE( (?P<text>.*))?$'), FrenchTransaction.TYPE_CHECK),
+                    (re.compile(r'^(F )?COTIS\.? (?P<text>.*)'), FrenchTransaction.TYPE_BANK),
+                    (re.compile(r'^(?P<category>FRAIS|COMMISSION) (?P<text>.*)'), FrenchTransaction.TYPE_BANK),
+                    (re.compile(r'^(REMISE|REM CHQ) (?P<text>.*)'), FrenchTransaction.TYPE_DEPOSIT),
+                    (re.compile(r'^(?P<text>.*) CARTE \d+'), FrenchTransaction.TYPE_CARD),
+                   ]
+
+    date = datetime.date(2016, 3, 15)
+    # raw label: (type, label, category, rdate)
+    corpus = {
+        u'VIR SEPA MR DUPONT':          (Transaction.TYPE_TRANSFER, u'SEPA MR DUPONT', NotAvailable, date),
+        u'VIREMENT LOYER':              (Transaction.TYPE_TRANSFER, u'LOYER', NotAvailable, date),
+        u'VIR\nRECU':                   (Transaction.TYPE_TRANSFER, u'RECU', NotAvailable, date),
+        u'VIREMENT':                    (Transaction.TYPE_UNKNOWN, u'VIREMENT', NotAvailable, date),
+        u'PRLV FREE MOBILE':            (Transaction.TYPE_ORDER, u'FREE MOBILE', NotAvailable, date),
+        u'AMAZON CARTE 1234 PAIEMENT CB 1203 PARIS':
+                                        (Transaction.TYPE_CARD, u'AMAZON', NotAvailable, datetime.date(2016, 3, 12)),
+        u'AMAZON CARTE 1234 PAIEMENT CB 2012':
+                                        (Transaction.TYPE_CARD, u'AMAZON', NotAvailable, datetime.date(2015, 12, 20)),
+        u'AMAZON CARTE 1234 PAIEMENT CB 2902':
+                                        (Transaction.TYPE_CARD, u'AMAZON', NotAvailable, datetime.date(2016, 2, 29)),
+        u'AMAZON CARTE 1234':           (Transaction.TYPE_CARD, u'AMAZON', NotAvailable, date),
+        u'RETRAIT DAB 12/03/15 10H21 PARIS':
+                                        (Transaction.TYPE_WITHDRAWAL, u'PARIS', NotAvailable,
+                                         datetime.datetime(2015, 3, 12, 10, 21)),
+        u'CHEQUE':                      (Transaction.TYPE_CHECK, u'CHEQUE', NotAvailable, date),
+        u'CHEQUE 1234567':              (Transaction.TYPE_CHECK, u'1234567', NotAvailable, date),
+        u'F COTIS CARTE BLEUE':         (Transaction.TYPE_BANK, u'CARTE BLEUE', NotAvailable, date),
+        u'COTIS. VISA':                 (Transaction.TYPE_BANK, u'VISA', NotAvailable, date),
+        u'FRAIS TENUE DE COMPTE':       (Transaction.TYPE_BANK, u'TENUE DE COMPTE', u'FRAIS', date),
+        u'REM CHQ 1234':                (Transaction.TYPE_DEPOSIT, u'1234', NotAvailable, date),
+        u'SALAIRE  MARS':               (Transaction.TYPE_UNKNOWN, u'MARS', u'SALAIRE', date),
+        u'DEPOT ESPECES':               (Transaction.TYPE_UNKNOWN, u'DEPOT ESPECES', NotAvailable, date),
+        u'':                            (Transaction.TYPE_UNKNOWN, u'', NotAvailable, date),
+    }
+
+    for raw, expected in corpus.iteritems():
+        tr = Transaction(0)
+        tr.parse(date, raw)
+        assert (tr.type, tr.label, tr.category, tr.rdate) == expected, (raw, tr.type, tr.label, tr.category, tr.rdate)
@@ -20,6 +20,7 @@
 
 import re
 
+from weboob.browser.download import Downloader
 from weboob.capabilities.gallery import CapGallery, BaseGallery, BaseImage
 from weboob.tools.backend import Module
 from weboob.deprecated.browser import Browser, Page
@@ -105,6 +106,21 @@ class GenericComicReaderModule(Module, CapGallery):
         with self.browser:
             return gallery
 
+    def create_downloader(self, max_concurrent=None):
+        """
+        Create the downloader used by applications to fetch images of
+        galleries. Images returned by :meth:`iter_gallery_images` already
+        have their url, so they can be downloaded concurrently without
+        filling their data.
+
+        The browser of this module can not make asynchronous requests, so the
+        downloader uses its own browser. Override this method if the site
+        needs cookies or headers to serve images.
+
+        :rtype: :class:`weboob.browser.download.Downloader`
+        """
+        return Downloader(max_concurrent=max_concurrent, logger=self.logger)
+
     def fill_gallery(self, gallery, fields):
         gallery.title = gallery.id
 
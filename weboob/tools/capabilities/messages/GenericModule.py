@@ -18,11 +18,11 @@
 # along with weboob. If not, see <http://www.gnu.org/licenses/>.
 
 
-import time
 from weboob.capabilities.messages import CapMessages, Message, Thread
 from weboob.capabilities.base import find_object
 from weboob.tools.backend import Module
 from weboob.tools.newsfeed import Newsfeed
+from weboob.tools.capabilities.messages.seen import SeenIndex
 
 
 class GenericNewspaperModule(Module, CapMessages):
@@ -38,6 +38,33 @@ class GenericNewspaperModule(Module, CapMessages):
     RSSID = None
     URL2ID = None
     RSSSIZE = 0
+    # Seconds during which the parsed feed is reused (None for the default
+    # of FeedCache)
+    RSS_TTL = None
+    # Maximum number of seen threads which are remembered (None for
+    # RSSSIZE + 10 if RSSSIZE is set, or the default of SeenIndex)
+    SEEN_SIZE = None
+
+    _seen = None
+
+    @property
+    def seen(self):
+        """
+        Index of seen threads.
+
+        :rtype: :class:`SeenIndex`
+        """
+        if self._seen is None:
+            size = self.SEEN_SIZE
+            if size is None and self.RSSSIZE:
+                size = self.RSSSIZE + 10
+            self._seen = SeenIndex(self.storage, 'seen', max_size=size)
+        return self._seen
+
+    def deinit(self):
+        if self._seen is not None:
+            self._seen.flush()
+        super(GenericNewspaperModule, self).deinit()
 
     def get_thread(self, _id):
         if isinstance(_id, Thread):
@@ -57,7 +84,7 @@ class GenericNewspaperModule(Module, CapMessages):
             thread = Thread(id)
 
         flags = Message.IS_HTML
-        if thread.id not in self.storage.get('seen', default={}):
+        if thread.id not in self.seen:
             flags |= Message.IS_UNREAD
         thread.title = content.title
         if not thread.date:
@@ -78,7 +105,7 @@ class GenericNewspaperModule(Module, CapMessages):
         return thread
 
     def iter_threads(self):
-        for article in Newsfeed(self.RSS_FEED, GenericNewspaperModule.RSSID).iter_entries():
+        for article in Newsfeed(self.RSS_FEED, GenericNewspaperModule.RSSID, ttl=self.RSS_TTL).iter_entries():
             thread = Thread(article.id)
             thread.title = article.title
             thread.date = article.datetime
@@ -91,38 +118,13 @@ class GenericNewspaperModule(Module, CapMessages):
 
     def iter_unread_messages(self):
         for thread in self.iter_threads():
-            if thread.id in self.storage.get('seen', default={}):
+            if thread.id in self.seen:
                 continue
             self.fill_thread(thread, 'root')
             for msg in thread.iter_all_messages():
                 yield msg
 
     def set_message_read(self, message):
-        self.storage.set(
-            'seen',
-            message.thread.id,
-            'comments',
-            self.storage.get(
-                'seen',
-                message.thread.id,
-                'comments',
-                default=[]) + [message.id])
-
-        if self.URL2ID and self.RSSSIZE != 0:
-            url2id = self.URL2ID
-            lastpurge = self.storage.get('lastpurge', default=0)
-            l = []
-            if time.time() - lastpurge > 7200:
-                self.storage.set('lastpurge', time.time())
-                for id in self.storage.get('seen', default={}):
-                    l.append((int(url2id(id)), id))
-                l.sort()
-                l.reverse()
-                tosave = [v[1] for v in l[0:self.RSSSIZE + 10]]
-                toremove = set([v for v in self.storage.get('seen', default={})]).difference(tosave)
-                for id in toremove:
-                    self.storage.delete('seen', id)
-
-        self.storage.save()
+        self.seen.add(message.thread.id)
 
     OBJECTS = {Thread: fill_thread}
@@ -0,0 +1,241 @@
+# -*- coding: utf-8 -*-
+
+# Copyright(C) 2016 weboob project
+#
+# This file is part of weboob.
+#
+# weboob is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Affero General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# weboob is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE. See the
+# GNU Affero General Public License for more details.
+#
+# You should have received a copy of the GNU Affero General Public License
+# along with weboob. If not, see <http://www.gnu.org/licenses/>.
+
+import time
+from threading import RLock
+from weakref import WeakSet
+
+from weboob.tools.ordereddict import OrderedDict
+
+
+__all__ = ['SeenIndex', 'flush_seen_indexes']
+
+
+_dirty_indexes = WeakSet()
+_dirty_lock = RLock()
+
+
+def flush_seen_indexes():
+    """
+    Save every :class:`SeenIndex` which has been changed since its last
+    flush. Applications call it once after a pass on unread messages.
+    """
+    with _dirty_lock:
+        indexes = list(_dirty_indexes)
+    for index in indexes:
+        index.flush()
+
+
+class SeenIndex(object):
+    """
+    Index of ids of seen messages or threads, for modules implementing
+    :class:`weboob.capabilities.messages.CapMessages`.
+
+    It is kept in the backend storage as a dict of ids to the last time they
+    were marked. In memory, ids are ordered from the least recently used to
+    the most recently used one, so membership tests are O(1) and the oldest
+    ids are removed first when there are more than *max_size* of them or
+    when they are older than *max_age* seconds.
+
+    Looking up an id does not change the index, so a pass on messages
+    without anything new does not write the storage. The date of an id is
+    only refreshed by a lookup when it is older than half of *max_age*, so
+    ids still listed by the site do not expire.
+
+    Changes are not written to the storage until :meth:`flush` is called
+    (by :func:`flush_seen_indexes` or when the backend is deinitialized).
+    The whole index is written then, as the storage can not be appended to.
+
+    Values of the storage key in previous formats (a list of ids, or a dict
+    of ids to anything else than a timestamp) are imported as seen now.
+
+    >>> index = SeenIndex(None, max_size=2)
+    >>> index.add('a'); index.add('b')
+    >>> 'a' in index
+    True
+    >>> index.add('c')
+    >>> sorted(index)
+    ['a', 'c']
+    >>> 'b' in index
+    False
+
+    :param storage: storage of the backend
+    :type storage: :class:`weboob.tools.backend.BackendStorage`
+    :param key: key of the storage in which ids are kept
+    :type key: str
+    :param max_size: maximum number of ids (None for :attr:`MAX_SIZE`, 0 for
+                     no limit)
+    :type max_size: int
+    :param max_age: seconds after which an id not used anymore is removed
+                    (None for :attr:`MAX_AGE`, 0 for no limit)
+    :type max_age: int
+    """
+
+    MAX_SIZE = 10000
+    MAX_AGE = 90 * 24 * 3600
+
+    def __init__(self, storage, key='seen', max_size=None, max_age=None):
+        self.storage = storage
+        self.key = key
+        self.max_size = self.MAX_SIZE if max_size is None else max_size
+        self.max_age = self.MAX_AGE if max_age is None else max_age
+        self.lock = RLock()
+        self.dirty = False
+        self.ids = OrderedDict()
+        self.load()
+
+    def load(self):
+        """
+        Read ids from the storage, dropping unsaved changes.
+        """
+        value = self.storage.get(self.key, default={}) if self.storage is not None else {}
+        now = time.time()
+        if isinstance(value, dict):
+            items = [(id, date if isinstance(date, (int, long, float)) else now)
+                     for id, date in value.iteritems()]
+        else:
+            items = [(id, now) for id in value]
+        items.sort(key=lambda item: item[1])
+
+        with self.lock:
+            self.ids = OrderedDict(items)
+            self.dirty = False
+            self._evict(now)
+
+    def __contains__(self, id):
+        """
+        Check if an id has been seen. It is then kept as recently used.
+        """
+        with self.lock:
+            date = self.ids.pop(id, None)
+            if date is None:
+                return False
+            now = time.time()
+            if self.max_age and now - date > self.max_age / 2:
+                date = now
+                self._set_dirty()
+            self.ids[id] = date
+            return True
+
+    def __iter__(self):
+        with self.lock:
+            return iter(list(self.ids))
+
+    def __len__(self):
+        return len(self.ids)
+
+    def add(self, id):
+        """
+        Mark an id as seen.
+        """
+        with self.lock:
+            now = time.time()
+            self._touch(id, now)
+            self._evict(now)
+
+    def discard(self, id):
+        """
+        Mark an id as unseen.
+        """
+        with self.lock:
+            if self.ids.pop(id, None) is not None:
+                self._set_dirty()
+
+    def _touch(self, id, now):
+        # Move the id at the end (most recently used). The date is stored
+        # with a one minute precision to avoid rewriting the storage when an
+        # id is marked several times.
+        date = self.ids.pop(id, None)
+        if date is None or now - date > 60:
+            date = now
+            self._set_dirty()
+        self.ids[id] = date
+
+    def _evict(self, now):
+        while self.max_size and len(self.ids) > self.max_size:
+            self.ids.popitem(last=False)
+            self._set_dirty()
+        while self.max_age and self.ids:
+            id, date = next(self.ids.iteritems())
+            if now - date <= self.max_age:
+                break
+            del self.ids[id]
+            self._set_dirty()
+
+    def _set_dirty(self):
+        if not self.dirty:
+            self.dirty = True
+            with _dirty_lock:
+                _dirty_indexes.add(self)
+
+    def flush(self):
+        """
+        Write ids to the storage if they have changed.
+        """
+        with self.lock:
+            if not self.dirty:
+                return
+            self.dirty = False
+            with _dirty_lock:
+                _dirty_indexes.discard(self)
+            if self.storage is None:
+                return
+            self.storage.set(self.key, dict(self.ids))
+            self.storage.save()
+
+
+def test_seen_index():
+    class Storage(object):
+        def __init__(self, values):
+            self.values = values
+            self.saved = 0
+
+        def get(self, key, default=None):
+            return self.values.get(key, default)
+
+        def set(self, key, value):
+            self.values[key] = value
+
+        def save(self):
+            self.saved += 1
+
+    storage = Storage({'seen': {'1': {'comments': [0]}, '2': {'comments': [0]}}})
+    index = SeenIndex(storage, max_age=3600)
+    assert '1' in index and '3' not in index
+    index.add('3')
+    index.add('4')
+    assert storage.saved == 0 and set(storage.values['seen']) == set(['1', '2'])
+    flush_seen_indexes()
+    flush_seen_indexes()
+    assert storage.saved == 1
+    assert set(storage.values['seen']) == set(['1', '2', '3', '4'])
+
+    # Lookups do not write anything.
+    assert '1' in index and '2' in index and '5' not in index
+    flush_seen_indexes()
+    assert storage.saved == 1
+
+    storage.values['seen']['1'] = time.time() - 7200
+    storage.values['seen']['2'] = time.time() - 3000
+    index.load()
+    assert '1' not in index and len(index) == 3
+    # An id which would soon expire is refreshed by a lookup.
+    assert '2' in index and index.dirty
+    flush_seen_indexes()
+    assert storage.saved == 2 and time.time() - storage.values['seen']['2'] < 60
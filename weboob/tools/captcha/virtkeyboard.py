@@ -19,13 +19,26 @@
 
 
 import hashlib
+import string
 import tempfile
 
 try:
-    from PIL import Image
+    from PIL import Image, ImageChops
 except ImportError:
     raise ImportError('Please install python-imaging')
 
+from weboob.tools.ordereddict import OrderedDict
+
+
+# Translation tables to get a byte 0xff for pixels matching a color component,
+# and 0x00 for other ones.
+_COMPONENT_TABLES = [''.join('\xff' if j == i else '\x00' for j in range(256))
+                     for i in range(256)]
+_MASK_TABLE = string.maketrans('\x00\xff', ' .')
+
+# Symbols found in already seen images.
+_KEYBOARDS_CACHE = OrderedDict()
+
 
 class VirtKeyboardError(Exception):
     pass
@@ -43,6 +56,23 @@ class VirtKeyboard(object):
     """
     margin = None
 
+    MASK_MODES = ('L', 'P', 'RGB', 'RGBA', 'RGBX', 'CMYK', 'LA')
+    """
+    Modes of images with one byte per band, where the mask of matching pixels
+    is computed by PIL.
+    """
+
+    MASK_MAX_COLORS = 16
+    """
+    Maximum number of colors accepted by :meth:`check_color` to compute the
+    mask with PIL, instead of a Python loop on pixels.
+    """
+
+    KEYBOARDS_CACHE_SIZE = 100
+    """
+    Number of keyboard images for which symbols are kept in cache.
+    """
+
     def __init__(self, file=None, coords=None, color=None, convert=None):
         # file: virtual keyboard image
         # coords: dictionary <value to return>:<tuple(x1,y1,x2,y2)>
@@ -83,26 +113,101 @@ class VirtKeyboard(object):
 
         self.width, self.height = self.image.size
         self.pixar = self.image.load()
+        self.mask = None
 
     def load_symbols(self, coords):
-        self.coords = {}
-        self.md5 = {}
-        for i in coords:
-            coord = self.get_symbol_coords(coords[i])
-            if coord == (-1, -1, -1, -1):
-                continue
-            self.coords[i] = coord
-            self.md5[i] = self.checksum(self.coords[i])
+        key = None
+        if getattr(self, 'image', None) is not None:
+            image_md5 = hashlib.md5(self.image.mode + repr(self.image.size) + self.image.tobytes()).hexdigest()
+            key = (type(self), image_md5, self.color, self.margin, frozenset(coords.iteritems()))
+
+        if key in _KEYBOARDS_CACHE:
+            self.coords, self.md5 = _KEYBOARDS_CACHE[key]
+            self.coords = dict(self.coords)
+            self.md5 = dict(self.md5)
+        else:
+            self.coords = {}
+            self.md5 = {}
+            for i in coords:
+                coord = self.get_symbol_coords(coords[i])
+                if coord == (-1, -1, -1, -1):
+                    continue
+                self.coords[i] = coord
+                self.md5[i] = self.checksum(self.coords[i])
+
+            if key is not None:
+                _KEYBOARDS_CACHE[key] = (dict(self.coords), dict(self.md5))
+                while len(_KEYBOARDS_CACHE) > self.KEYBOARDS_CACHE_SIZE:
+                    _KEYBOARDS_CACHE.popitem(last=False)
+
+        self.md5_index = {}
+        for i, md5sum in self.md5.iteritems():
+            self.md5_index.setdefault(md5sum, i)
 
     def check_color(self, pixel):
         return pixel == self.color
 
+    def get_mask(self):
+        """
+        Get a string with a "." for each pixel matching :meth:`check_color`
+        and a " " for other ones, row after row.
+
+        :meth:`check_color` is called once per color of the image, so it must
+        only depend on the pixel value.
+        """
+        if self.mask is not None:
+            return self.mask
+
+        size = self.width * self.height
+        matching = [color for count, color in self.image.getcolors(size) if self.check_color(color)]
+
+        if self.image.mode in self.MASK_MODES and len(matching) <= self.MASK_MAX_COLORS:
+            bands = [band.tobytes() for band in self.image.split()]
+            mask = None
+            for color in matching:
+                if not isinstance(color, tuple):
+                    color = (color,)
+                color_mask = None
+                for band, component in zip(bands, color):
+                    band_mask = Image.frombytes('L', self.image.size, band.translate(_COMPONENT_TABLES[component]))
+                    color_mask = band_mask if color_mask is None else ImageChops.darker(color_mask, band_mask)
+                mask = color_mask if mask is None else ImageChops.lighter(mask, color_mask)
+
+            if mask is None:
+                self.mask = ' ' * size
+            else:
+                self.mask = mask.tobytes().translate(_MASK_TABLE)
+        else:
+            matching = set(matching)
+            self.mask = ''.join(['.' if pixel in matching else ' ' for pixel in self.image.getdata()])
+
+        return self.mask
+
     def get_symbol_coords(self, coords):
         (x1, y1, x2, y2) = coords
         if self.margin:
             top, right, bottom, left = self.margin
             x1, y1, x2, y2 = x1 + left, y1 + top, x2 - right, y2 - bottom
 
+        if x1 >= 0 and y1 >= 0:
+            mask = self.get_mask()
+            xend = min(x2 + 1, self.width)
+            newX1 = newY1 = newX2 = newY2 = -1
+            for y in range(y1, min(y2 + 1, self.height)):
+                line = mask[y * self.width + x1:y * self.width + xend]
+                first = line.find('.')
+                if first < 0:
+                    continue
+                if newY1 < 0:
+                    newY1 = y
+                    newX1, newX2 = first, line.rfind('.')
+                else:
+                    newX1, newX2 = min(newX1, first), max(newX2, line.rfind('.'))
+                newY2 = y
+            if newY1 < 0:
+                return (-1, -1, -1, -1)
+            return (x1 + newX1, newY1, x1 + newX2, newY2)
+
         newY1 = -1
         newY2 = -1
         for y in range(y1, min(y2 + 1, self.height)):
@@ -131,6 +236,13 @@ class VirtKeyboard(object):
 
     def checksum(self, coords):
         (x1, y1, x2, y2) = coords
+        if x1 >= 0 and y1 >= 0:
+            mask = self.get_mask()
+            xend = min(x2 + 1, self.width)
+            s = ''.join([mask[y * self.width + x1:y * self.width + xend]
+                         for y in range(y1, min(y2 + 1, self.height))])
+            return hashlib.md5(s).hexdigest()
+
         s = ''
         for y in range(y1, min(y2 + 1, self.height)):
             for x in range(x1, min(x2 + 1, self.width)):
@@ -145,9 +257,8 @@ class VirtKeyboard(object):
             md5sum_list = [md5sum_list]
 
         for md5sum in md5sum_list:
-            for i in self.md5:
-                if md5sum == self.md5[i]:
-                    return i
+            if md5sum in self.md5_index:
+                return self.md5_index[md5sum]
         raise VirtKeyboardError('Symbol not found for hash "%s".' % md5sum)
 
     def get_string_code(self, string):
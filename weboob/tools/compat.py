@@ -18,7 +18,7 @@
 # along with weboob. If not, see <http://www.gnu.org/licenses/>.
 
 
-__all__ = ['unicode', 'long', 'basestring', 'check_output']
+__all__ = ['unicode', 'long', 'basestring', 'StopAsyncIteration', 'check_output']
 
 
 try:
@@ -36,6 +36,11 @@ try:
 except NameError:
     basestring = str
 
+try:
+    StopAsyncIteration = StopAsyncIteration
+except NameError:
+    StopAsyncIteration = StopIteration
+
 
 try:
     from subprocess import check_output
@@ -20,7 +20,10 @@
 # because we don't want to import this file by "import json"
 from __future__ import absolute_import
 
-__all__ = ['json', 'mini_jsonpath']
+import re
+from collections import deque
+
+__all__ = ['json', 'mini_jsonpath', 'JsonPath', 'compile_path']
 
 try:
     # try simplejson first because it is faster
@@ -30,10 +33,157 @@ except ImportError:
     import json
 
 
+class JsonPath(object):
+    """
+    Compiled path to evaluate against JSON data.
+
+    Each step of the path is a key of a dict, an index or a slice (like
+    ``1:10`` or ``::2``) of a list, or a star wildcard to take every child.
+    A key of a dict is always used as is when it exists, even if it looks
+    like a slice or a wildcard. With *wildcards* set to False, steps are
+    only keys and indexes. Use :func:`compile_path` to get cached instances.
+
+    >>> path = JsonPath('data.*.y')
+    >>> data = {"data": [{"x": "foo", "y": 13}, {"x": "bar", "y": 42}, {"x": "baz", "y": 128}]}
+    >>> list(path.iter(data))
+    [13, 42, 128]
+    >>> list(JsonPath('data.-1.x').iter(data))
+    ['baz']
+    >>> list(JsonPath('data.:2.y').iter(data))
+    [13, 42]
+    >>> JsonPath('data.1.y').get(data)
+    42
+    >>> JsonPath('data.x').get(data, 'default')
+    'default'
+    >>> list(JsonPath('hours.12:30').iter({'hours': {'12:30': 'lunch'}}))
+    ['lunch']
+    >>> list(JsonPath('hours.*', wildcards=False).iter({'hours': {'*': 'all', 'x': 'one'}}))
+    ['all']
+
+    :param path: dot separated string, or list of steps
+    :type path: :class:`basestring` or :class:`list`
+    :param wildcards: parse wildcards and slices
+    :type wildcards: bool
+    """
+
+    KEY, INDEX, SLICE, WILDCARD = range(4)
+
+    INDEX_RE = re.compile(r'^-?\d+$')
+    SLICE_RE = re.compile(r'^(-?\d*):(-?\d*)(?::(-?\d*))?$')
+
+    def __init__(self, path, wildcards=True):
+        if isinstance(path, basestring):
+            path = path.split('.') if path else []
+        self.path = path
+        self.steps = [self.parse_step(step, wildcards) for step in path]
+        self.multiple = any(kind in (self.SLICE, self.WILDCARD) for kind, _, _ in self.steps)
+
+    def __repr__(self):
+        return '<JsonPath %r>' % (self.path,)
+
+    @classmethod
+    def parse_step(cls, step, wildcards=True):
+        """
+        Get a tuple (kind, key, value) from a step, where key is used on
+        dicts and value on lists.
+        """
+        if isinstance(step, (int, long)):
+            return cls.INDEX, unicode(step), step
+        if cls.INDEX_RE.match(step):
+            return cls.INDEX, step, int(step)
+        if wildcards:
+            if step == '*':
+                return cls.WILDCARD, step, None
+            m = cls.SLICE_RE.match(step)
+            if m:
+                return cls.SLICE, step, slice(*[int(i) if i else None for i in m.groups()])
+        return cls.KEY, step, None
+
+    def iter(self, node):
+        """
+        Evaluate the path against a node, and yield every matching values.
+
+        :param node: JSON data, as a string or decoded
+        """
+        if isinstance(node, basestring):
+            node = json.loads(node)
+
+        INDEX, SLICE, WILDCARD = self.INDEX, self.SLICE, self.WILDCARD
+        steps = self.steps
+        length = len(steps)
+        queue = deque([(node, 0)])
+        while queue:
+            node, depth = queue.popleft()
+            if depth == length:
+                yield node
+                continue
+
+            kind, key, value = steps[depth]
+            depth += 1
+            if isinstance(node, dict):
+                if key in node:
+                    queue.append((node[key], depth))
+                elif kind == WILDCARD:
+                    queue.extend((child, depth) for child in node.itervalues())
+            elif isinstance(node, list):
+                if kind == WILDCARD:
+                    queue.extend((child, depth) for child in node)
+                elif kind == INDEX:
+                    if -len(node) <= value < len(node):
+                        queue.append((node[value], depth))
+                elif kind == SLICE:
+                    queue.extend((child, depth) for child in node[value])
+
+    def get(self, node, default=None):
+        """
+        Evaluate the path against a node, and return the first matching
+        value.
+
+        :param node: JSON data, as a string or decoded
+        :param default: value returned if nothing matches
+        """
+        if self.multiple:
+            for value in self.iter(node):
+                return value
+            return default
+
+        if isinstance(node, basestring):
+            node = json.loads(node)
+
+        try:
+            for kind, key, value in self.steps:
+                # value is None for keys, so it fails on lists
+                node = node[value] if isinstance(node, list) else node[key]
+        except (KeyError, IndexError, TypeError):
+            return default
+        return node
+
+
+_PATHS_CACHE = {}
+
+
+def compile_path(path, wildcards=True):
+    """
+    Get a :class:`JsonPath`, cached by path.
+
+    :param path: dot separated string, or list of steps
+    :type path: :class:`basestring` or :class:`list`
+    :param wildcards: parse wildcards and slices
+    :type wildcards: bool
+    :rtype: :class:`JsonPath`
+    """
+    key = (path if isinstance(path, basestring) else tuple(path), wildcards)
+    try:
+        return _PATHS_CACHE[key]
+    except KeyError:
+        compiled = _PATHS_CACHE[key] = JsonPath(path, wildcards)
+        return compiled
+
+
 def mini_jsonpath(node, path):
     """
     Evaluates a dot separated path against JSON data. Path can contains
-    star wilcards. Always returns a generator.
+    star wilcards, list indexes and slices. Always returns a generator.
 
     Relates to http://goessner.net/articles/JsonPath/ but in a really basic
     and simpler form.
@@ -45,28 +195,4 @@ def mini_jsonpath(node, path):
     >>> list(mini_jsonpath('{"data": [{"x": "foo", "y": 13}, {"x": "bar", "y": 42}, {"x": "baz", "y": 128}]}', 'data.*.y'))
     [13, 42, 128]
     """
-
-    def iterkeys(i):
-        return range(len(i)) if type(i) is list else i.iterkeys()
-
-    def cut(s):
-        p = s.split('.', 1) if s else [None]
-        return p + [None] if len(p) == 1 else p
-
-    if isinstance(node, basestring):
-        node = json.loads(node)
-
-    queue = [(node, cut(path))]
-    while queue:
-        node, (name, rest) = queue.pop(0)
-        if name is None:
-            yield node
-            continue
-        elif name == '*':
-            keys = iterkeys(node)
-        elif type(node) not in (dict, list) or name not in node:
-            continue
-        else:
-            keys = [int(name) if type(node) is list else name]
-        for k in keys:
-            queue.append((node[k], cut(rest)))
+    return compile_path(path).iter(node)
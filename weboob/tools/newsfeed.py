@@ -18,6 +18,8 @@
 # along with weboob. If not, see <http://www.gnu.org/licenses/>.
 
 import datetime
+import time
+from threading import Lock
 
 try:
     import feedparser
@@ -31,7 +33,7 @@ if '5.1' > feedparser.__version__ >= '5.0':
     import re
     sgmllib.endbracket = re.compile('[<>]')
 
-__all__ = ['Entry', 'Newsfeed']
+__all__ = ['Entry', 'FeedCache', 'Newsfeed']
 
 
 class Entry(object):
@@ -86,16 +88,119 @@ class Entry(object):
             self.id = rssid_func(self)
 
 
+class CachedFeed(object):
+    """
+    Parsed feed stored in a :class:`FeedCache`.
+    """
+
+    def __init__(self, feed):
+        self.feed = feed
+        self.fetched = time.time()
+        self.indexes = {}
+
+    def get_index(self, rssid_func=None):
+        """
+        Get entries built with this id function, as a list and as a dict by
+        id (where the first entry with an id wins).
+        """
+        # A bound method is a new object at each access.
+        key = getattr(rssid_func, '__func__', rssid_func)
+        index = self.indexes.get(key)
+        if index is None:
+            entries = [Entry(entry, rssid_func) for entry in self.feed['entries']]
+            by_id = {}
+            for entry in entries:
+                by_id.setdefault(entry.id, entry)
+            index = self.indexes[key] = (entries, by_id)
+        return index
+
+
+class FeedCache(object):
+    """
+    Cache of parsed feeds, by URL.
+
+    A feed is downloaded and parsed again only when it is older than *ttl*
+    seconds, with a conditional request (If-None-Match/If-Modified-Since)
+    if the server gave an ETag or a Last-Modified header. When the feed is
+    not modified, or can't be downloaded, the cached one is kept.
+
+    :param ttl: time during which a feed is used without any request, in seconds
+    :type ttl: int
+    """
+
+    TTL = 300
+
+    def __init__(self, ttl=None):
+        self.ttl = self.TTL if ttl is None else ttl
+        self.feeds = {}
+        self.lock = Lock()
+        self.url_locks = {}
+
+    def get(self, url, ttl=None):
+        """
+        Get the parsed feed of an URL.
+
+        :param ttl: override the TTL of the cache
+        :rtype: :class:`CachedFeed`
+        """
+        if ttl is None:
+            ttl = self.ttl
+
+        with self.lock:
+            url_lock = self.url_locks.setdefault(url, Lock())
+
+        # Only one thread fetches a given feed at a time.
+        with url_lock:
+            cached = self.feeds.get(url)
+            if cached is not None and time.time() - cached.fetched < ttl:
+                return cached
+
+            kwargs = {}
+            if cached is not None:
+                kwargs['etag'] = cached.feed.get('etag')
+                kwargs['modified'] = cached.feed.get('modified')
+            feed = feedparser.parse(url, **kwargs)
+
+            if cached is not None and (feed.get('status') == 304 or
+                                       (feed.get('bozo') and not feed['entries'])):
+                cached.fetched = time.time()
+                return cached
+
+            cached = CachedFeed(feed)
+            if not feed.get('bozo') or feed['entries']:
+                self.feeds[url] = cached
+            return cached
+
+    def clear(self):
+        with self.lock:
+            self.feeds.clear()
+
+
+# Cache shared by every Newsfeed object.
+FEED_CACHE = FeedCache()
+
+
 class Newsfeed(object):
-    def __init__(self, url, rssid_func=None):
-        self.feed = feedparser.parse(url)
+    """
+    Entries of a RSS or Atom feed.
+
+    Feeds are taken from :data:`FEED_CACHE`, so building several Newsfeed
+    objects for the same URL does not download and parse it each time.
+
+    :param url: URL of the feed
+    :param rssid_func: function which computes the id of an :class:`Entry`
+    :param ttl: override the TTL of the cache, in seconds
+    :param cache: cache to use instead of :data:`FEED_CACHE`
+    :type cache: :class:`FeedCache`
+    """
+
+    def __init__(self, url, rssid_func=None, ttl=None, cache=None):
+        self.cached = (cache or FEED_CACHE).get(url, ttl)
+        self.feed = self.cached.feed
         self.rssid_func = rssid_func
 
     def iter_entries(self):
-        for entry in self.feed['entries']:
-            yield Entry(entry, self.rssid_func)
+        return iter(self.cached.get_index(self.rssid_func)[0])
 
     def get_entry(self, id):
-        for entry in self.iter_entries():
-            if entry.id == id:
-                return entry
+        return self.cached.get_index(self.rssid_func)[1].get(id)
@@ -18,7 +18,15 @@
 # along with weboob. If not, see <http://www.gnu.org/licenses/>.
 
 
+import os
+import sqlite3
+from contextlib import contextmanager
 from copy import deepcopy
+from threading import RLock
+try:
+    import cPickle as pickle
+except ImportError:
+    import pickle
 
 from .config.yamlconfig import YamlConfig
 
@@ -81,3 +89,201 @@ class StandardStorage(IStorage):
 
     def get(self, what, name, *args, **kwargs):
         return self.config.get(what, name, *args, **kwargs)
+
+
+class SqliteStorage(IStorage):
+    """
+    Storage in a sqlite database.
+
+    Each top-level key of a backend storage is stored in its own row, and
+    :meth:`save` only writes keys which have changed since the last
+    :meth:`load` or :meth:`save`, in a transaction which locks the database
+    against other processes. Use :meth:`batch` to commit several saves at
+    once.
+
+    The database is *path* + ``.sqlite``. If it does not exist yet but *path*
+    is a storage file written by :class:`StandardStorage`, its content is
+    imported.
+    """
+
+    TIMEOUT = 30
+    """
+    Time to wait for the lock of an other process, in seconds.
+    """
+
+    def __init__(self, path):
+        # In-memory tree, with the same semantic as StandardStorage.
+        self.config = YamlConfig(path)
+        self.dbpath = path + '.sqlite'
+        self.lock = RLock()
+        self.batch_level = 0
+        # Serialized values as they are in database, by (what, name).
+        self.written = {}
+
+        migrate = not os.path.exists(self.dbpath) and os.path.exists(path)
+        self.db = sqlite3.connect(self.dbpath, timeout=self.TIMEOUT, check_same_thread=False, isolation_level=None)
+        self.db.execute('CREATE TABLE IF NOT EXISTS storage (what TEXT, name TEXT, key TEXT, value BLOB, '
+                        'PRIMARY KEY (what, name, key))')
+        if migrate:
+            self.import_yaml(path)
+
+    def import_yaml(self, path):
+        """
+        Import the content of a :class:`StandardStorage` file.
+        """
+        legacy = YamlConfig(path)
+        legacy.load()
+        with self.batch():
+            for what, names in legacy.values.iteritems():
+                for name, tree in names.iteritems():
+                    for key, value in tree.iteritems():
+                        self._write(what, name, key, pickle.dumps(value, 2))
+
+    @contextmanager
+    def batch(self):
+        """
+        Context manager to commit every :meth:`save` done inside at once.
+
+        Other processes can't write in the storage until the end of the
+        batch. If an exception is raised inside, nothing written in the
+        batch is kept (a nested batch is rolled back alone).
+        """
+        with self.lock:
+            self.batch_level += 1
+            savepoint = 'batch%d' % self.batch_level
+            # What is in database if the batch is rolled back.
+            written = dict((key, dict(values)) for key, values in self.written.iteritems())
+            if self.batch_level == 1:
+                self.db.execute('BEGIN IMMEDIATE')
+            else:
+                self.db.execute('SAVEPOINT %s' % savepoint)
+        try:
+            yield
+        except:
+            with self.lock:
+                self.batch_level -= 1
+                if self.batch_level == 0:
+                    self.db.execute('ROLLBACK')
+                else:
+                    self.db.execute('ROLLBACK TO %s' % savepoint)
+                    self.db.execute('RELEASE %s' % savepoint)
+                self.written = written
+            raise
+        else:
+            with self.lock:
+                self.batch_level -= 1
+                if self.batch_level == 0:
+                    self.db.execute('COMMIT')
+                else:
+                    self.db.execute('RELEASE %s' % savepoint)
+
+    def _write(self, what, name, key, data):
+        self.db.execute('INSERT OR REPLACE INTO storage (what, name, key, value) VALUES (?, ?, ?, ?)',
+                        (what, name, key, sqlite3.Binary(data)))
+
+    def load(self, what, name, default={}):
+        with self.lock:
+            rows = self.db.execute('SELECT key, value FROM storage WHERE what = ? AND name = ?', (what, name)).fetchall()
+
+            written = self.written[(what, name)] = {}
+            tree = deepcopy(default)
+            for key, data in rows:
+                written[key] = bytes(data)
+                tree[key] = pickle.loads(bytes(data))
+
+            self.config.values.setdefault(what, {})[name] = tree
+
+    def save(self, what, name):
+        with self.lock:
+            tree = self.config.values.get(what, {}).get(name, {})
+            written = self.written.setdefault((what, name), {})
+            with self.batch():
+                for key, value in tree.iteritems():
+                    data = pickle.dumps(value, 2)
+                    if written.get(key) != data:
+                        self._write(what, name, key, data)
+                        written[key] = data
+
+                for key in set(written) - set(tree):
+                    self.db.execute('DELETE FROM storage WHERE what = ? AND name = ? AND key = ?', (what, name, key))
+                    del written[key]
+
+    def set(self, what, name, *args):
+        with self.lock:
+            self.config.set(what, name, *args)
+
+    def delete(self, what, name, *args):
+        with self.lock:
+            self.config.delete(what, name, *args)
+
+    def get(self, what, name, *args, **kwargs):
+        with self.lock:
+            return self.config.get(what, name, *args, **kwargs)
+
+
+def test_sqlite_storage():
+    import shutil
+    from tempfile import mkdtemp
+
+    def rows(storage):
+        db = sqlite3.connect(storage.dbpath)
+        try:
+            return dict((key, pickle.loads(bytes(value)))
+                        for key, value in db.execute('SELECT key, value FROM storage'))
+        finally:
+            db.close()
+
+    path = mkdtemp()
+    try:
+        yaml = YamlConfig(os.path.join(path, 'storage'))
+        yaml.values = {'backends': {'foo': {'seen': [1, 2]}}}
+        yaml.save()
+        storage = SqliteStorage(os.path.join(path, 'storage'))
+        storage.load('backends', 'foo')
+        assert storage.get('backends', 'foo', 'seen') == [1, 2]
+
+        storage.set('backends', 'foo', 'seen', [1, 2, 3])
+        storage.set('backends', 'foo', 'date', 42)
+        storage.save('backends', 'foo')
+        assert rows(storage) == {'seen': [1, 2, 3], 'date': 42}
+
+        storage.delete('backends', 'foo', 'date')
+        storage.save('backends', 'foo')
+        assert rows(storage) == {'seen': [1, 2, 3]}
+
+        with storage.batch():
+            storage.set('backends', 'foo', 'date', 1)
+            storage.save('backends', 'foo')
+            assert rows(storage) == {'seen': [1, 2, 3]}
+        assert rows(storage) == {'seen': [1, 2, 3], 'date': 1}
+
+        # A failed batch is not applied, and values are written again later.
+        try:
+            with storage.batch():
+                storage.set('backends', 'foo', 'date', 2)
+                storage.save('backends', 'foo')
+                raise ValueError()
+        except ValueError:
+            pass
+        assert rows(storage) == {'seen': [1, 2, 3], 'date': 1}
+
+        with storage.batch():
+            storage.set('backends', 'foo', 'seen', [])
+            storage.save('backends', 'foo')
+            try:
+                with storage.batch():
+                    storage.set('backends', 'foo', 'other', 3)
+                    storage.save('backends', 'foo')
+                    raise ValueError()
+            except ValueError:
+                pass
+        assert rows(storage) == {'seen': [], 'date': 2}
+
+        storage.save('backends', 'foo')
+        assert rows(storage) == {'seen': [], 'date': 2, 'other': 3}
+
+        other = SqliteStorage(os.path.join(path, 'storage'))
+        other.load('backends', 'foo', {'default': True})
+        assert other.get('backends', 'foo') == {'seen': [], 'date': 2, 'other': 3, 'default': True}
+    finally:
+        shutil.rmtree(path)